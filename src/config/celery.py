@@ -31,4 +31,16 @@ celery_app.conf.beat_schedule = {
         "task": "core.tasks.ingest_dbt_sectors",
         "schedule": crontab(hour=6, minute=20),
     },
+    "send_profile_change_notifications": {
+        "task": "peoplefinder.tasks.send_profile_change_notifications",
+        "schedule": crontab(minute="*"),
+    },
+    "update_profile_completions": {
+        "task": "peoplefinder.tasks.update_profile_completions",
+        "schedule": crontab(hour=3, minute=30),
+    },
+    "refresh_homepage": {
+        "task": "home.tasks.refresh_homepage",
+        "schedule": crontab(minute="*/5"),
+    },
 }
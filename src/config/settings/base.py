@@ -604,13 +604,16 @@ TASKS = {
 AUTHBROKER_ANONYMOUS_PATHS = (
     "/ical/all/",
     "/pingdom/ping.xml",
+    "/search/metrics/",
     "/peoplefinder/api/activity-stream/",
     "/peoplefinder/api/person-api/",
 )
 AUTHBROKER_ANONYMOUS_URL_NAMES = (
     "person-api-people-list",
     "person-api-people-detail",
+    "person-api-people-export",
     "team-api-teams-list",
+    "change-feed-list",
     "profile-get-card",
 )
 
@@ -719,7 +722,6 @@ LEAVING_SERVICE_URL = env("LEAVING_SERVICE_URL", default=None)
 # django-waffle
 # https://waffle.readthedocs.io/en/stable/starting/configuring.html
 WAFFLE_FLAG_MODEL = "core.FeatureFlag"
-CACHE_FLAGS_IN_SESSION = True
 
 
 # Search
@@ -743,6 +745,43 @@ SEARCH_SHOW_INACTIVE_PROFILES_WITHIN_DAYS = env.int(
 # Enable the caching of the generated search query DSLs
 SEARCH_ENABLE_QUERY_CACHE = env.bool("SEARCH_ENABLE_QUERY_CACHE", True)
 
+# Enable the in-process caching of the compiled search query DSL templates
+SEARCH_ENABLE_COMPILED_QUERY_CACHE = env.bool(
+    "SEARCH_ENABLE_COMPILED_QUERY_CACHE", True
+)
+SEARCH_COMPILED_QUERY_CACHE_SIZE = env.int("SEARCH_COMPILED_QUERY_CACHE_SIZE", 128)
+
+# How often (in seconds) each process checks whether the search settings have
+# been changed by another process
+SEARCH_SETTINGS_GENERATION_CHECK_INTERVAL = env.int(
+    "SEARCH_SETTINGS_GENERATION_CHECK_INTERVAL", 5
+)
+
+# How often (in seconds) each process checks whether the team tree has been
+# changed by another process
+TEAM_HIERARCHY_VERSION_CHECK_INTERVAL = env.int(
+    "TEAM_HIERARCHY_VERSION_CHECK_INTERVAL", 5
+)
+
+# Find pinned pages, and leave pinned and excluded pages out of the search
+# results, using the phrases stored in the index rather than database queries.
+# Only turn this on once the index has been rebuilt with the phrases.
+SEARCH_FILTER_PHRASES_IN_INDEX = env.bool("SEARCH_FILTER_PHRASES_IN_INDEX", False)
+
+# Cache the page results of popular search queries, shared between users and
+# invalidated when pages, pins, exclusions or search settings change
+SEARCH_ENABLE_RESULTS_CACHE = env.bool("SEARCH_ENABLE_RESULTS_CACHE", True)
+SEARCH_RESULTS_CACHE_TIMEOUT = env.int("SEARCH_RESULTS_CACHE_TIMEOUT", 60 * 10)
+
+# Run the autocomplete queries for each search vector concurrently, giving up
+# on any that take longer than the timeout (in seconds)
+SEARCH_AUTOCOMPLETE_FAN_OUT = env.bool("SEARCH_AUTOCOMPLETE_FAN_OUT", True)
+SEARCH_AUTOCOMPLETE_TIMEOUT = env.float("SEARCH_AUTOCOMPLETE_TIMEOUT", 1.0)
+
+# Bearer token required to read the search phase timings from /search/metrics/,
+# the endpoint is disabled when it isn't set
+SEARCH_METRICS_TOKEN = env("SEARCH_METRICS_TOKEN", default=None)
+
 # Content Security Policy header settings
 CSP_DEFAULT_SRC = ("'none'",)
 CSP_SCRIPT_SRC = ("'none'",)
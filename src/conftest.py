@@ -1,4 +1,5 @@
 import pytest
+from django.core.cache import cache
 from django.core.management import call_command
 
 
@@ -7,3 +8,36 @@ def django_db_setup(django_db_setup, django_db_blocker):
     with django_db_blocker.unblock():
         call_command("create_section_homepages")
         call_command("loaddata", "countries.json")
+
+
+@pytest.fixture(autouse=True)
+def reset_team_hierarchy():
+    # The team tree is rolled back between tests, but the cached snapshot isn't.
+    from peoplefinder.services.team_hierarchy import (
+        TEAM_HIERARCHY_VERSION_CACHE_KEY,
+        forget_team_hierarchy_version,
+    )
+
+    cache.delete(TEAM_HIERARCHY_VERSION_CACHE_KEY)
+    forget_team_hierarchy_version()
+
+
+@pytest.fixture(autouse=True)
+def reset_feature_flags():
+    # Flags are rolled back between tests, but the compiled definitions aren't.
+    from core.services.feature_flags import FEATURE_FLAGS_VERSION_CACHE_KEY
+
+    cache.delete(FEATURE_FLAGS_VERSION_CACHE_KEY)
+
+
+@pytest.fixture(autouse=True)
+def reset_fragment_cache():
+    # Sidebar fragments can outlive the data they were rendered from.
+    from core.services import fragment_cache
+
+    for dependency in (
+        fragment_cache.SITE_ALERT,
+        fragment_cache.QUICK_LINKS,
+        fragment_cache.PAGE_TREE,
+    ):
+        cache.delete(fragment_cache.get_dependency_version_cache_key(dependency))
@@ -1,5 +1,22 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save
+from wagtail.signals import post_page_move
+
+
+def clear_restricted_pages_cache(sender, **kwargs):
+    from content.models import clear_restricted_page_paths_cache
+
+    clear_restricted_page_paths_cache()
 
 
 class ContentConfig(AppConfig):
     name = "content"
+
+    def ready(self):
+        post_save.connect(
+            clear_restricted_pages_cache, sender="wagtailcore.PageViewRestriction"
+        )
+        post_delete.connect(
+            clear_restricted_pages_cache, sender="wagtailcore.PageViewRestriction"
+        )
+        post_page_move.connect(clear_restricted_pages_cache)
@@ -6,6 +6,7 @@ from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
 from django.db import models
 from django.db.models import F, Func, OuterRef, Q, Subquery
@@ -30,6 +31,7 @@ import dw_design_system.dwds.components as dwds_blocks
 from content import blocks as content_blocks
 from content.forms import BasePageForm
 from content.utils import (
+    get_keywords_or_phrases,
     get_search_content_for_block,
     manage_excluded,
     manage_pinned,
@@ -73,9 +75,32 @@ class Theme(models.Model):
         ordering = ["-title"]
 
 
+RESTRICTED_PAGE_PATHS_CACHE_KEY = "content__restricted_page_paths"
+
+
+def get_restricted_page_paths() -> list[tuple[str, str]]:
+    """
+    Return the `(restriction_type, path)` of every page with a view
+    restriction, cached until a restriction changes or a page is moved.
+    """
+    from wagtail.models import PageViewRestriction
+
+    restricted_paths = cache.get(RESTRICTED_PAGE_PATHS_CACHE_KEY)
+    if restricted_paths is None:
+        restricted_paths = list(
+            PageViewRestriction.objects.values_list("restriction_type", "page__path")
+        )
+        cache.set(RESTRICTED_PAGE_PATHS_CACHE_KEY, restricted_paths, timeout=None)
+    return restricted_paths
+
+
+def clear_restricted_page_paths_cache():
+    cache.delete(RESTRICTED_PAGE_PATHS_CACHE_KEY)
+
+
 class BasePageQuerySet(PageQuerySet):
     def restricted_q(self, restriction_type):
-        from wagtail.models import BaseViewRestriction, PageViewRestriction
+        from wagtail.models import BaseViewRestriction
 
         if isinstance(restriction_type, str):
             restriction_type = [
@@ -85,13 +110,21 @@ class BasePageQuerySet(PageQuerySet):
         RESTRICTION_CHOICES = BaseViewRestriction.RESTRICTION_CHOICES
         types = [t for t, _ in RESTRICTION_CHOICES if t in restriction_type]
 
+        restricted_paths = sorted(
+            path
+            for restriction, path in get_restricted_page_paths()
+            if restriction in types
+        )
+
+        # A restriction covers the page and all of its descendants, so any
+        # path under one we already have adds nothing to the filter
         q = Q()
-        for restriction in (
-            PageViewRestriction.objects.filter(restriction_type__in=types)
-            .select_related("page")
-            .all()
-        ):
-            q |= self.descendant_of_q(restriction.page, inclusive=True)
+        last_path = None
+        for path in restricted_paths:
+            if last_path and path.startswith(last_path):
+                continue
+            q |= Q(path__startswith=path)
+            last_path = path
 
         return q if q else Q(pk__in=[])
 
@@ -271,6 +304,19 @@ class BasePage(Page, Indexed):
         ("publishing_panels", "Publishing"),
     ]
 
+    # The pinned and excluded phrases are indexed so search can leave the
+    # pages out of the results without a database subquery
+    indexed_fields = [
+        IndexedField("search_pinned_phrases", filter=True),
+        IndexedField("search_excluded_phrases", filter=True),
+    ]
+
+    def search_pinned_phrases(self) -> list[str]:
+        return get_keywords_or_phrases(getattr(self, "pinned_phrases", None))
+
+    def search_excluded_phrases(self) -> list[str]:
+        return get_keywords_or_phrases(getattr(self, "excluded_phrases", None))
+
     def fill_page_author_name(self) -> None:
         author = self.get_author()
 
@@ -357,6 +403,10 @@ class BasePage(Page, Indexed):
 
     def get_first_publisher(self) -> Optional[UserModel]:
         """Return the first publisher of the page or None."""
+        if hasattr(self, "_first_publisher"):
+            # Loaded in bulk, see `search.utils.prefetch_first_publishers`
+            return self._first_publisher
+
         if first_revision_with_user := (
             self.revisions.exclude(user=None).order_by("created_at", "id").first()
         ):
@@ -0,0 +1,25 @@
+from django.db.models import Q
+
+from content.models import BasePage
+
+
+def test_restricted_q_skips_descendants_of_restricted_pages(mocker):
+    mocker.patch(
+        "content.models.get_restricted_page_paths",
+        return_value=[
+            ("password", "000100020003"),
+            ("groups", "00010002"),
+            ("login", "00010004"),
+            ("groups", "00010005"),
+        ],
+    )
+
+    q = BasePage.objects.restricted_q(["password", "groups"])
+
+    assert q == Q(path__startswith="00010002") | Q(path__startswith="00010005")
+
+
+def test_restricted_q_matches_nothing_without_restrictions(mocker):
+    mocker.patch("content.models.get_restricted_page_paths", return_value=[])
+
+    assert BasePage.objects.restricted_q("login") == Q(pk__in=[])
@@ -0,0 +1,11 @@
+from content.utils import get_keywords_or_phrases
+
+
+def test_get_keywords_or_phrases():
+    assert get_keywords_or_phrases(None) == []
+    assert get_keywords_or_phrases("") == []
+    assert get_keywords_or_phrases("Pay, 'annual leave',, \"Expenses\" ,pay") == [
+        "pay",
+        "annual leave",
+        "expenses",
+    ]
@@ -29,6 +29,24 @@ def remove_orphan_keyword_and_phrases():
     ).delete()
 
 
+def get_keywords_or_phrases(phrases_string: str | None) -> list[str]:
+    """
+    Split a comma separated string of pinned or excluded phrases into the
+    normalised keywords and phrases they are matched against.
+    """
+    if not phrases_string:
+        return []
+
+    keywords_or_phrases = []
+    for key_word_or_phrase in phrases_string.split(","):
+        key_word_or_phrase = (
+            key_word_or_phrase.lower().replace("'", "").replace('"', "").strip()
+        )
+        if key_word_or_phrase and key_word_or_phrase not in keywords_or_phrases:
+            keywords_or_phrases.append(key_word_or_phrase)
+    return keywords_or_phrases
+
+
 def manage_pinned(obj, pinned_phrases_string):
     from content.models import SearchKeywordOrPhrase, SearchPinPageLookUp
 
@@ -41,16 +59,7 @@ def manage_pinned(obj, pinned_phrases_string):
     if not pinned_phrases_string:
         return
 
-    pinned_phrases = pinned_phrases_string.split(",")
-
-    for key_word_or_phrase_obj in pinned_phrases:
-        key_word_or_phrase = (
-            key_word_or_phrase_obj.lower().replace("'", "").replace('"', "").strip()
-        )
-
-        if key_word_or_phrase == "":
-            continue
-
+    for key_word_or_phrase in get_keywords_or_phrases(pinned_phrases_string):
         search_keyword_or_phrase = SearchKeywordOrPhrase.objects.filter(
             keyword_or_phrase=key_word_or_phrase,
         ).first()
@@ -89,16 +98,7 @@ def manage_excluded(obj, excluded_phrases_string):
         content_type=ContentType.objects.get_for_model(obj),
     ).delete()
 
-    excluded_phrases = excluded_phrases_string.split(",")
-
-    for key_word_or_phrase_obj in excluded_phrases:
-        key_word_or_phrase = (
-            key_word_or_phrase_obj.lower().replace("'", "").replace('"', "").strip()
-        )
-
-        if key_word_or_phrase == "":
-            continue
-
+    for key_word_or_phrase in get_keywords_or_phrases(excluded_phrases_string):
         search_keyword_or_phrase = SearchKeywordOrPhrase.objects.filter(
             keyword_or_phrase=key_word_or_phrase,
         ).first()
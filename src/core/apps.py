@@ -1,6 +1,7 @@
 from django.apps import AppConfig
 from django.core.cache import cache
-from django.db.models.signals import post_save
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from wagtail.signals import page_published, page_unpublished, post_page_move
 
 
 def clear_external_link_settings_cache(sender, **kwargs):
@@ -10,6 +11,32 @@ def clear_external_link_settings_cache(sender, **kwargs):
     cache.delete(EXTENDED_LINKS_SETTINGS_CACHE["keys"]["domain_mapping"])
 
 
+def clear_flag_definitions_cache(sender, **kwargs):
+    from core.services.feature_flags import (
+        clear_flag_definitions_cache as _clear_flag_definitions_cache,
+    )
+
+    _clear_flag_definitions_cache()
+
+
+def invalidate_site_alert_fragments(sender, **kwargs):
+    from core.services import fragment_cache
+
+    fragment_cache.invalidate(fragment_cache.SITE_ALERT)
+
+
+def invalidate_quick_links_fragments(sender, **kwargs):
+    from core.services import fragment_cache
+
+    fragment_cache.invalidate(fragment_cache.QUICK_LINKS)
+
+
+def invalidate_page_tree_fragments(sender, **kwargs):
+    from core.services import fragment_cache
+
+    fragment_cache.invalidate(fragment_cache.PAGE_TREE)
+
+
 class CoreConfig(AppConfig):
     name = "core"
 
@@ -17,3 +44,27 @@ class CoreConfig(AppConfig):
         post_save.connect(
             clear_external_link_settings_cache, sender="core.ExternalLinkSetting"
         )
+
+        from core.models import FeatureFlag
+
+        post_save.connect(clear_flag_definitions_cache, sender=FeatureFlag)
+        post_delete.connect(clear_flag_definitions_cache, sender=FeatureFlag)
+        m2m_changed.connect(
+            clear_flag_definitions_cache, sender=FeatureFlag.users.through
+        )
+        m2m_changed.connect(
+            clear_flag_definitions_cache, sender=FeatureFlag.groups.through
+        )
+
+        post_save.connect(
+            invalidate_site_alert_fragments, sender="core.SiteAlertBanner"
+        )
+        post_delete.connect(
+            invalidate_site_alert_fragments, sender="core.SiteAlertBanner"
+        )
+        post_save.connect(invalidate_quick_links_fragments, sender="home.QuickLink")
+        post_delete.connect(invalidate_quick_links_fragments, sender="home.QuickLink")
+        page_published.connect(invalidate_page_tree_fragments)
+        page_unpublished.connect(invalidate_page_tree_fragments)
+        post_page_move.connect(invalidate_page_tree_fragments)
+        post_delete.connect(invalidate_page_tree_fragments, sender="wagtailcore.Page")
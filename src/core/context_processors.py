@@ -1,6 +1,11 @@
+from functools import partial
+
+from django.utils.functional import SimpleLazyObject
+
 from core.forms import PageProblemFoundForm
 from core.models.settings import PageProblemFormSettings
 from core.utils import get_all_feature_flags, get_external_link_settings
+from peoplefinder.services.person import get_request_profile
 
 
 def global_context(request):
@@ -14,4 +19,6 @@ def global_context(request):
         ),
         "FEATURE_FLAGS": get_all_feature_flags(request),
         "EXTERNAL_LINKS_SETTINGS": get_external_link_settings(request),
+        # Only looked up if a template uses it.
+        "peoplefinder_profile": SimpleLazyObject(partial(get_request_profile, request)),
     }
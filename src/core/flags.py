@@ -3,6 +3,7 @@ SHARE_TEAMS = "share_teams"
 NEW_NEWS_AUTHOR = "new_news_author"
 EXTERNAL_LINKS = "external_links"
 PF_DISCOVER = "pf_discover"
+PF_KEYSET_PAGINATION = "pf_keyset_pagination"
 TAG_INDEX = "tag_index"
 TAG_FOLLOWING = "tag_subscribing"
 PERSON_FOLLOWING = "person_subscribing"
@@ -3,7 +3,7 @@ from django.shortcuts import redirect
 from django.urls import resolve
 from django.utils import timezone
 
-from peoplefinder.models import Person
+from peoplefinder.services.person import get_request_profile
 
 
 class GetPeoplefinderProfileMiddleware:
@@ -17,9 +17,10 @@ class GetPeoplefinderProfileMiddleware:
         self.get_response = get_response
 
     def __call__(self, request):
+        profile = get_request_profile(request)
         if (
-            hasattr(request.user, "profile")
-            and not request.user.profile.is_active
+            profile
+            and not profile.is_active
             and resolve(request.path).url_name != "deactivated"
         ):
             return redirect("deactivated")
@@ -33,12 +34,7 @@ class GetPeoplefinderProfileMiddleware:
             return response
 
         if request.user.is_authenticated:
-            try:
-                profile = Person.objects.get(user=request.user)
-            except Person.DoesNotExist:
-                profile = None
-
-            response.context_data["peoplefinder_profile"] = profile
+            response.context_data["peoplefinder_profile"] = get_request_profile(request)
 
         return response
 
@@ -0,0 +1,127 @@
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from typing import Any, Optional, Sequence
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F, Q, QuerySet
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    data = json.dumps(list(values), cls=DjangoJSONEncoder).encode()
+    return base64.urlsafe_b64encode(data).decode()
+
+
+def decode_cursor(cursor: str) -> list[Any]:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (binascii.Error, UnicodeError, ValueError) as e:
+        raise InvalidCursor("Cursor could not be decoded") from e
+
+    if not isinstance(values, list):
+        raise InvalidCursor("Cursor could not be decoded")
+    return values
+
+
+@dataclass
+class KeysetPage:
+    object_list: list
+    next_cursor: Optional[str]
+    is_first_page: bool
+
+    def __len__(self) -> int:
+        return len(self.object_list)
+
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    def has_previous(self) -> bool:
+        return not self.is_first_page
+
+    def has_other_pages(self) -> bool:
+        return self.has_previous() or self.has_next()
+
+
+class KeysetPaginator:
+    """Paginate a queryset by the values of its ordering instead of an offset.
+
+    Each page is fetched by filtering for the rows that sort after the last row
+    of the previous page, so deep pages are as cheap as the first one and no
+    `COUNT(*)` is needed. The trade off is that pages can only be followed
+    forwards from a cursor, rather than jumped to by number.
+
+    The primary key is appended to the ordering so that it is total. Nulls
+    sort last in both directions.
+    """
+
+    def __init__(self, queryset: QuerySet, ordering: Sequence[str], per_page: int):
+        self.queryset = queryset
+        self.ordering = [*ordering, "pk"]
+        self.per_page = per_page
+
+        # (annotation name, field path, descending)
+        self.keys = [
+            (f"keyset_{i}", field.lstrip("-"), field.startswith("-"))
+            for i, field in enumerate(self.ordering)
+        ]
+
+    def get_ordered_queryset(self) -> QuerySet:
+        return self.queryset.annotate(
+            **{name: F(field) for name, field, _ in self.keys}
+        ).order_by(
+            *(
+                (
+                    F(name).desc(nulls_last=True)
+                    if descending
+                    else F(name).asc(nulls_last=True)
+                )
+                for name, _, descending in self.keys
+            )
+        )
+
+    def get_after_filter(self, values: list[Any]) -> Q:
+        """Return a filter for the rows that sort after the given key values."""
+        if len(values) != len(self.keys):
+            raise InvalidCursor("Cursor doesn't match the ordering")
+
+        after = Q(pk__in=[])
+        equal = Q()
+        for (name, _, descending), value in zip(self.keys, values, strict=True):
+            if value is None:
+                # Nulls sort last, so only other nulls can tie with this row.
+                equal &= Q(**{f"{name}__isnull": True})
+                continue
+
+            lookup = "lt" if descending else "gt"
+            after |= equal & (
+                Q(**{f"{name}__{lookup}": value}) | Q(**{f"{name}__isnull": True})
+            )
+            equal &= Q(**{name: value})
+
+        return after
+
+    def page(self, cursor: Optional[str] = None) -> KeysetPage:
+        queryset = self.get_ordered_queryset()
+        if cursor:
+            queryset = queryset.filter(self.get_after_filter(decode_cursor(cursor)))
+
+        object_list = list(queryset[: self.per_page + 1])
+
+        next_cursor = None
+        if len(object_list) > self.per_page:
+            object_list = object_list[: self.per_page]
+            last_object = object_list[-1]
+            next_cursor = encode_cursor(
+                [getattr(last_object, name) for name, _, _ in self.keys]
+            )
+
+        return KeysetPage(
+            object_list=object_list,
+            next_cursor=next_cursor,
+            is_first_page=not cursor,
+        )
@@ -0,0 +1,219 @@
+"""Evaluate every feature flag for a request without touching the database.
+
+The flag definitions are compiled once per version and kept in process memory
+and in Redis. Saving or deleting a `FeatureFlag`, or changing its users or
+groups, bumps the version so changes apply straight away everywhere.
+
+Evaluation follows `waffle.models.AbstractUserFlag.is_active`.
+"""
+
+import random
+import time
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Optional
+
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpRequest
+from waffle.utils import get_setting
+
+from core.models import FeatureFlag
+
+
+FEATURE_FLAGS_VERSION_CACHE_KEY = "feature_flags__version"
+FEATURE_FLAGS_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+@dataclass(frozen=True)
+class CompiledFlag:
+    name: str
+    everyone: Optional[bool]
+    percent: Optional[Decimal]
+    testing: bool
+    superusers: bool
+    staff: bool
+    authenticated: bool
+    languages: frozenset[str]
+    rollout: bool
+    user_ids: frozenset[int]
+    group_ids: frozenset[int]
+
+
+@dataclass(frozen=True)
+class FlagDefinitions:
+    version: Optional[int]
+    flags: tuple[CompiledFlag, ...]
+
+    @classmethod
+    def build(cls, version: Optional[int] = None) -> "FlagDefinitions":
+        """Compile the flags, and their users and groups, in three queries."""
+        user_ids: dict[int, set[int]] = {}
+        for flag_id, user_id in FeatureFlag.users.through.objects.values_list(
+            "featureflag_id", "user_id"
+        ):
+            user_ids.setdefault(flag_id, set()).add(user_id)
+
+        group_ids: dict[int, set[int]] = {}
+        for flag_id, group_id in FeatureFlag.groups.through.objects.values_list(
+            "featureflag_id", "group_id"
+        ):
+            group_ids.setdefault(flag_id, set()).add(group_id)
+
+        flags = tuple(
+            CompiledFlag(
+                name=flag.name,
+                everyone=flag.everyone,
+                percent=flag.percent,
+                testing=flag.testing,
+                superusers=flag.superusers,
+                staff=flag.staff,
+                authenticated=flag.authenticated,
+                languages=frozenset(
+                    language.strip()
+                    for language in (flag.languages or "").split(",")
+                    if language.strip()
+                ),
+                rollout=flag.rollout,
+                user_ids=frozenset(user_ids.get(flag.pk, ())),
+                group_ids=frozenset(group_ids.get(flag.pk, ())),
+            )
+            for flag in FeatureFlag.objects.order_by("name")
+        )
+        return cls(version=version, flags=flags)
+
+
+_local_definitions: Optional[FlagDefinitions] = None
+
+
+def get_flag_definitions_cache_key(version: int) -> str:
+    return f"feature_flags__{version}"
+
+
+def get_flag_definitions_version() -> Optional[int]:
+    # Seed with the time so a lost key can't bring back an old version
+    cache.add(FEATURE_FLAGS_VERSION_CACHE_KEY, time.time_ns(), timeout=None)
+    return cache.get(FEATURE_FLAGS_VERSION_CACHE_KEY)
+
+
+def get_flag_definitions() -> FlagDefinitions:
+    global _local_definitions
+
+    version = get_flag_definitions_version()
+    if version is None:
+        return FlagDefinitions.build()
+
+    local_definitions = _local_definitions
+    if local_definitions is not None and local_definitions.version == version:
+        return local_definitions
+
+    cache_key = get_flag_definitions_cache_key(version)
+    definitions = cache.get(cache_key)
+    if definitions is None:
+        definitions = FlagDefinitions.build(version)
+        cache.set(cache_key, definitions, timeout=FEATURE_FLAGS_CACHE_TIMEOUT)
+
+    _local_definitions = definitions
+    return definitions
+
+
+def _bump_flag_definitions_version() -> None:
+    try:
+        cache.incr(FEATURE_FLAGS_VERSION_CACHE_KEY)
+    except ValueError:
+        get_flag_definitions_version()
+
+
+def clear_flag_definitions_cache(*args, **kwargs) -> None:
+    """Invalidate the compiled flags, usable as a signal receiver."""
+    _bump_flag_definitions_version()
+    transaction.on_commit(_bump_flag_definitions_version)
+
+
+class _UserGroupIds:
+    """The request user's group ids, only queried if a flag needs them."""
+
+    def __init__(self, user):
+        self.user = user
+        self._group_ids: Optional[frozenset[int]] = None
+
+    def get(self) -> frozenset[int]:
+        if self._group_ids is None:
+            self._group_ids = frozenset(self.user.groups.values_list("pk", flat=True))
+        return self._group_ids
+
+
+def _is_active_for_user(flag: CompiledFlag, user, user_group_ids) -> bool:
+    if user is None:
+        return False
+    if flag.authenticated and user.is_authenticated:
+        return True
+    if flag.staff and user.is_staff:
+        return True
+    if flag.superusers and user.is_superuser:
+        return True
+    if user.pk is not None and user.pk in flag.user_ids:
+        return True
+    if flag.group_ids and user.is_authenticated:
+        return not flag.group_ids.isdisjoint(user_group_ids.get())
+    return False
+
+
+def _is_active(flag: CompiledFlag, request: HttpRequest, user, user_group_ids) -> bool:
+    if get_setting("OVERRIDE") and flag.name in request.GET:
+        return request.GET[flag.name] == "1"
+
+    if flag.everyone is not None:
+        return flag.everyone
+
+    if flag.testing:
+        test_cookie = get_setting("TEST_COOKIE") % flag.name
+        if test_cookie in request.GET:
+            active = request.GET[test_cookie] == "1"
+            if not hasattr(request, "waffle_tests"):
+                request.waffle_tests = {}
+            request.waffle_tests[flag.name] = active
+            return active
+        if test_cookie in request.COOKIES:
+            return request.COOKIES[test_cookie] == "True"
+
+    if flag.languages and getattr(request, "LANGUAGE_CODE", None) in flag.languages:
+        return True
+
+    if _is_active_for_user(flag, user, user_group_ids):
+        return True
+
+    if flag.percent and flag.percent > 0:
+        # `request.waffles` is read by `WaffleMiddleware` to set the cookies.
+        if not hasattr(request, "waffles"):
+            request.waffles = {}
+        elif flag.name in request.waffles:
+            return request.waffles[flag.name][0]
+
+        cookie = get_setting("COOKIE") % flag.name
+        if cookie in request.COOKIES:
+            active = request.COOKIES[cookie] == "True"
+        else:
+            # A rollout bucket, not a security decision
+            active = Decimal(str(random.uniform(0, 100))) <= flag.percent  # noqa: S311
+        request.waffles[flag.name] = [active, flag.rollout]
+        return active
+
+    return False
+
+
+def get_active_flags(request: HttpRequest) -> dict[str, bool]:
+    """Evaluate every feature flag for the request in one pass.
+
+    The result is kept on the request, so later calls cost nothing.
+    """
+    if (active_flags := getattr(request, "_feature_flags", None)) is not None:
+        return active_flags
+
+    user = getattr(request, "user", None)
+    user_group_ids = _UserGroupIds(user)
+    request._feature_flags = {
+        flag.name: _is_active(flag, request, user, user_group_ids)
+        for flag in get_flag_definitions().flags
+    }
+    return request._feature_flags
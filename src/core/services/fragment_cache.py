@@ -0,0 +1,93 @@
+"""Cache rendered fragments against versioned dependency tags.
+
+Each tag, e.g. "quick_links", has a version in the cache and a fragment's key
+includes the versions of the tags it depends on. Invalidating a tag bumps its
+version, so every fragment that depends on it misses from then on and the old
+entries simply expire.
+"""
+
+import time
+from typing import Any, Callable, Optional, Sequence
+
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
+from django.db import transaction
+
+
+FRAGMENT_CACHE_TIMEOUT = 60 * 60
+
+# Dependency tags
+SITE_ALERT = "site_alert"
+QUICK_LINKS = "quick_links"
+# Any page being published, unpublished, moved or deleted
+PAGE_TREE = "page_tree"
+
+
+def get_bookmarks_dependency(user_pk: int) -> str:
+    return f"bookmarks__{user_pk}"
+
+
+def get_dependency_version_cache_key(dependency: str) -> str:
+    return f"fragment_cache__{dependency}__version"
+
+
+def get_dependency_versions(dependencies: Sequence[str]) -> Optional[list[int]]:
+    """Return the current version of each tag, or `None` if one is unknown."""
+    keys = [get_dependency_version_cache_key(d) for d in dependencies]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            # Seed with the time so a lost key can't bring back an old version
+            cache.add(key, time.time_ns(), timeout=None)
+            versions[key] = cache.get(key)
+
+    if any(versions[key] is None for key in keys):
+        return None
+    return [versions[key] for key in keys]
+
+
+def get_or_set(
+    name: str,
+    vary_on: Sequence[Any],
+    dependencies: Sequence[str],
+    default: Callable[[], Any],
+) -> Any:
+    """Return the cached value of a fragment, calling `default` on a miss.
+
+    Args:
+        name: The fragment's name.
+        vary_on: Anything else the value depends on, e.g. the page id.
+        dependencies: The tags that invalidate the value.
+        default: Builds the value, which must be picklable.
+    """
+    versions = get_dependency_versions(dependencies)
+    if versions is None:
+        return default()
+
+    cache_key = make_template_fragment_key(
+        f"fragment_cache__{name}", [*vary_on, *dependencies, *versions]
+    )
+    # Wrapped so that falsy values can be cached too
+    if (cached := cache.get(cache_key)) is not None:
+        return cached[0]
+
+    value = default()
+    cache.set(cache_key, (value,), timeout=FRAGMENT_CACHE_TIMEOUT)
+    return value
+
+
+def _bump_dependency_versions(dependencies: Sequence[str]) -> None:
+    for dependency in dependencies:
+        key = get_dependency_version_cache_key(dependency)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, time.time_ns(), timeout=None)
+
+
+def invalidate(*dependencies: str) -> None:
+    """Invalidate every fragment depending on any of the given tags."""
+    _bump_dependency_versions(dependencies)
+    # Again once committed, in case a fragment was rebuilt from the old data
+    # in the meantime
+    transaction.on_commit(lambda: _bump_dependency_versions(dependencies))
@@ -5,6 +5,7 @@ from django.utils.html import mark_safe
 from wagtail.models import Page
 
 from interactions.services import page_reactions as page_reactions_service
+from peoplefinder.services.person import get_request_profile
 
 
 register = template.Library()
@@ -59,27 +60,28 @@ def get_initial_page_data(context) -> str:
             initial_page_data["page_reactions"] = page_reactions
 
     # User Data
-    initial_page_data["user_profile_slug"] = str(request.user.profile.slug)
+    profile = get_request_profile(request)
+    initial_page_data["user_profile_slug"] = str(profile.slug)
 
-    for i, role in enumerate(request.user.profile.roles.all()):
+    for i, role in enumerate(profile.roles.all()):
         initial_page_data[f"user_team_slug_{i+1}"] = role.team.name.lower()
         initial_page_data[f"user_job_title_{i+1}"] = role.job_title
 
-    if user_professions := request.user.profile.professions.all():
+    if user_professions := profile.professions.all():
         initial_page_data["user_professions"] = " ".join(
             profession.code for profession in user_professions
         )
 
-    if user_grade := request.user.profile.grade:
+    if user_grade := profile.grade:
         initial_page_data["user_grade"] = user_grade.code
 
-    initial_page_data["user_is_line_manager"] = request.user.profile.is_line_manager
+    initial_page_data["user_is_line_manager"] = profile.is_line_manager
 
-    if location := request.user.profile.get_office_location_display():
+    if location := profile.get_office_location_display():
         initial_page_data["user_working_location"] = location
 
     initial_page_data["user_account_age_in_days"] = (
-        request.user.profile.days_since_account_creation()
+        profile.days_since_account_creation()
     )
 
     return mark_safe(json.dumps(initial_page_data))  # noqa S308
@@ -17,3 +17,16 @@ def get_pagination_url(context, page):
     query_params["page"] = page
 
     return "?" + query_params.urlencode()
+
+
+@register.simple_tag(takes_context=True)
+def get_keyset_pagination_url(context, cursor=None):
+    request = context["request"]
+
+    query_params = request.GET.copy()
+    query_params.pop("page", None)
+    query_params.pop("after", None)
+    if cursor:
+        query_params["after"] = cursor
+
+    return "?" + query_params.urlencode()
@@ -1,4 +1,5 @@
-from typing import Type
+from functools import cached_property
+from typing import Optional, Type
 
 from django import template
 from django.contrib.contenttypes.models import ContentType
@@ -10,6 +11,7 @@ from wagtail.models import Page
 from content.models import SectionPage
 from core import flags
 from core.models.models import SiteAlertBanner
+from core.services import fragment_cache
 from core.utils import flag_is_active, get_all_feature_flags
 from events.models import EventsHome
 from home.models import HomePage, QuickLink
@@ -25,6 +27,8 @@ class SidebarPart:
     template_name: str
     context: dict
     request: dict
+    # Tags that invalidate the cached output, see `fragment_cache`.
+    cache_dependencies: tuple[str, ...] = ()
 
     def __init__(self, context: dict) -> None:
         self.context = context
@@ -36,6 +40,39 @@ class SidebarPart:
         """
         return True
 
+    def get_cache_vary_on(self) -> Optional[list]:
+        """
+        Return what the output depends on, other than `cache_dependencies`.
+
+        Parts that query the database override this so their output is
+        cached, `None` means the output isn't cached.
+        """
+        return None
+
+    def get_cache_dependencies(self) -> tuple[str, ...]:
+        return self.cache_dependencies
+
+    def build_output(self) -> tuple[bool, SafeString]:
+        if not self.is_visible():
+            return False, SafeString()
+        return True, self.render()
+
+    def get_output(self) -> tuple[bool, SafeString]:
+        """
+        Return whether the part is visible and its rendered HTML.
+        """
+        vary_on = self.get_cache_vary_on()
+        # Previews render unpublished changes, which must not be cached.
+        if vary_on is None or getattr(self.request, "is_preview", False):
+            return self.build_output()
+
+        return fragment_cache.get_or_set(
+            name=f"sidebar__{type(self).__name__}",
+            vary_on=vary_on,
+            dependencies=self.get_cache_dependencies(),
+            default=self.build_output,
+        )
+
     def get_part_context(self) -> dict:
         """
         Build the context to pass into the template.
@@ -71,18 +108,22 @@ class SidebarSection:
         if template_name:
             self.template_name = template_name
 
+    @cached_property
+    def part_outputs(self) -> list[tuple[bool, SafeString]]:
+        return [part.get_output() for part in self.parts]
+
     def is_visible(self) -> bool:
         """
         Decide if this section should be visible on the current page.
         """
-        return any(part.is_visible() for part in self.parts)
+        return any(visible for visible, _ in self.part_outputs)
 
-    def get_section_context(self) -> dict[str, list[SidebarPart]]:
+    def get_section_context(self) -> dict[str, list[SafeString]]:
         """
         Build the context to pass into the template.
         """
         return {
-            "parts": [part for part in self.parts if part.is_visible()],
+            "parts": [output for visible, output in self.part_outputs if visible],
         }
 
     def render(self) -> SafeString:
@@ -94,10 +135,16 @@ class SidebarSection:
 
 class SiteAlert(SidebarPart):
     template_name = "tags/sidebar/parts/site_alert.html"
+    cache_dependencies = (fragment_cache.SITE_ALERT,)
 
-    def __init__(self, context: dict) -> None:
-        super().__init__(context)
-        self.current_alert = SiteAlertBanner.objects.filter(activated=True).first()
+    @cached_property
+    def current_alert(self) -> Optional[SiteAlertBanner]:
+        return SiteAlertBanner.objects.filter(activated=True).first()
+
+    def get_cache_vary_on(self) -> Optional[list]:
+        if isinstance(self.context.get("self"), HomePage):
+            return []
+        return None
 
     def is_visible(self, *args, **kwargs) -> bool:
         page = self.context.get("self")
@@ -144,6 +191,17 @@ class YourBookmarks(SidebarPart):
             return True
         return False
 
+    def get_cache_vary_on(self) -> Optional[list]:
+        if self.is_visible():
+            return [self.context["user"].pk]
+        return None
+
+    def get_cache_dependencies(self) -> tuple[str, ...]:
+        return (
+            fragment_cache.get_bookmarks_dependency(self.context["user"].pk),
+            fragment_cache.PAGE_TREE,
+        )
+
     def get_part_context(self) -> dict:
         context = super().get_part_context()
         context.update(
@@ -167,7 +225,14 @@ class Bookmark(SidebarPart):
 
         user = self.context.get("user")
         page = self.context.get("self")
-        is_bookmarked = bookmarks_service.is_page_bookmarked(user, page)
+        # The rendered button includes the CSRF token, so only the bookmark
+        # state is cached.
+        is_bookmarked = fragment_cache.get_or_set(
+            name="sidebar__is_page_bookmarked",
+            vary_on=[user.pk, page.pk],
+            dependencies=[fragment_cache.get_bookmarks_dependency(user.pk)],
+            default=lambda: bookmarks_service.is_page_bookmarked(user, page),
+        )
         post_url = reverse("interactions:bookmark")
         context.update(
             post_url=post_url,
@@ -201,6 +266,7 @@ class Comment(SidebarPart):
 
 class Share(SidebarPart):
     template_name = "tags/sidebar/parts/share.html"
+    cache_dependencies = (fragment_cache.PAGE_TREE,)
 
     def is_visible(self) -> bool:
         page = self.context.get("self")
@@ -210,6 +276,15 @@ class Share(SidebarPart):
 
         return not isinstance(page, HomePage)
 
+    def get_cache_vary_on(self) -> Optional[list]:
+        if not self.is_visible():
+            return None
+        return [
+            self.context["self"].pk,
+            self.request.get_host(),
+            get_all_feature_flags(self.request).get(flags.SHARE_TEAMS, False),
+        ]
+
     def get_part_context(self) -> dict:
         context = super().get_part_context()
         page = self.context.get("self")
@@ -224,6 +299,7 @@ class Share(SidebarPart):
 
 class QuickLinks(SidebarPart):
     template_name = "tags/sidebar/parts/quick_links.html"
+    cache_dependencies = (fragment_cache.QUICK_LINKS, fragment_cache.PAGE_TREE)
 
     def is_visible(self) -> bool:
         page = self.context.get("self")
@@ -231,6 +307,11 @@ class QuickLinks(SidebarPart):
             return True
         return False
 
+    def get_cache_vary_on(self) -> Optional[list]:
+        if self.is_visible():
+            return []
+        return None
+
     def get_part_context(self) -> dict:
         context = super().get_part_context()
         quick_links = [
@@ -249,14 +330,18 @@ class QuickLinks(SidebarPart):
 class UsefulLinks(SidebarPart):
     template_name = "tags/sidebar/parts/useful_links.html"
     title = "Useful links"
+    cache_dependencies = (fragment_cache.PAGE_TREE,)
 
     def __init__(self, context: dict) -> None:
         super().__init__(context)
         self.page = self.context.get("self")
         self.useful_links = getattr(self.page, "useful_links", [])
-        self.child_pages = []
+
+    @cached_property
+    def child_pages(self) -> list[Page]:
+        child_pages = []
         if isinstance(self.page, (Network, NetworksHome, SectionPage)):
-            self.child_pages = (
+            child_pages = list(
                 self.page.get_children()
                 .live()
                 .public()
@@ -268,6 +353,7 @@ class UsefulLinks(SidebarPart):
                     ]
                 )
             )
+        return child_pages
 
     def is_visible(self) -> bool:
         page = self.context.get("self")
@@ -276,6 +362,11 @@ class UsefulLinks(SidebarPart):
 
         return bool(self.useful_links or self.child_pages)
 
+    def get_cache_vary_on(self) -> Optional[list]:
+        if isinstance(self.page, Page):
+            return [self.page.pk]
+        return None
+
     def get_part_context(self) -> dict:
         context = super().get_part_context()
 
@@ -305,6 +396,13 @@ class UsefulLinks(SidebarPart):
 
 class SpotlightPage(SidebarPart):
     template_name = "tags/sidebar/parts/spotlight.html"
+    cache_dependencies = (fragment_cache.PAGE_TREE,)
+
+    def get_cache_vary_on(self) -> Optional[list]:
+        page = self.context.get("self")
+        if isinstance(page, Page):
+            return [page.pk]
+        return None
 
     def is_visible(self) -> bool:
         page = self.context.get("self")
@@ -3,7 +3,7 @@ from django.urls import reverse
 from wagtail.models import Page
 
 from peoplefinder.models import Person, Team
-from peoplefinder.services.team import TeamService
+from peoplefinder.services.team_hierarchy import get_team_ancestry
 
 
 register = template.Library()
@@ -17,10 +17,9 @@ def build_home_breadcrumbs(request) -> list[tuple[str, str]]:
 def build_team_breadcrumbs(request, team: Team) -> list[tuple[str, str]]:
     breadcrumbs = build_home_breadcrumbs(request)
 
-    parent_teams = TeamService().get_all_parent_teams(team)
     breadcrumbs += [
-        (reverse("team-view", args=[parent_team.slug]), parent_team.short_name)
-        for parent_team in parent_teams
+        (reverse("team-view", args=[parent_team["slug"]]), parent_team["short_name"])
+        for parent_team in get_team_ancestry(team.pk)
     ]
     breadcrumbs += [(reverse("team-view", args=[team.slug]), team.short_name)]
 
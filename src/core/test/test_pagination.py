@@ -0,0 +1,74 @@
+import pytest
+
+from core.pagination import (
+    InvalidCursor,
+    KeysetPaginator,
+    decode_cursor,
+    encode_cursor,
+)
+from user.models import User
+from user.test.factories import UserFactory
+
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor(["foo", None, 1])) == ["foo", None, 1]
+
+
+@pytest.mark.parametrize("cursor", ["--placeholder--", "e30=", "bm90IGpzb24="])
+def test_invalid_cursor(cursor):
+    with pytest.raises(InvalidCursor):
+        decode_cursor(cursor)
+
+
+@pytest.mark.django_db
+def test_keyset_paginator_follows_ordering():
+    for first_name in ["Bob", "Alice", "Bob", "Carol", "Alice"]:
+        UserFactory(first_name=first_name)
+
+    users = User.objects.filter(first_name__in=["Alice", "Bob", "Carol"])
+    expected = list(users.order_by("first_name", "-last_name", "pk"))
+
+    paginator = KeysetPaginator(
+        users, ordering=("first_name", "-last_name"), per_page=2
+    )
+
+    seen = []
+    cursor = None
+    while True:
+        page = paginator.page(cursor)
+        assert page.has_previous() == (cursor is not None)
+        seen += page.object_list
+        if not page.has_next():
+            break
+        cursor = page.next_cursor
+
+    assert seen == expected
+
+
+@pytest.mark.django_db
+def test_keyset_paginator_nulls_last():
+    users = [UserFactory(), UserFactory(), UserFactory()]
+    User.objects.filter(pk=users[0].pk).update(last_login=None)
+    User.objects.filter(pk__in=[users[1].pk, users[2].pk]).update(
+        last_login="2024-01-01T00:00:00Z"
+    )
+
+    paginator = KeysetPaginator(
+        User.objects.filter(pk__in=[u.pk for u in users]),
+        ordering=("last_login",),
+        per_page=1,
+    )
+
+    first_page = paginator.page()
+    second_page = paginator.page(first_page.next_cursor)
+    third_page = paginator.page(second_page.next_cursor)
+
+    assert [
+        first_page.object_list[0],
+        second_page.object_list[0],
+        third_page.object_list[0],
+    ] == [users[1], users[2], users[0]]
+    assert not third_page.has_next()
+
+    with pytest.raises(InvalidCursor):
+        paginator.page(encode_cursor([None]))
@@ -0,0 +1,35 @@
+import pytest
+from django.test import RequestFactory
+
+from core.models import SiteAlertBanner
+from core.templatetags.sidebar import SiteAlert
+from home.models import HomePage
+from user.test.factories import UserFactory
+
+
+pytestmark = pytest.mark.django_db
+
+
+def test_site_alert_is_cached_until_a_banner_is_saved(django_assert_num_queries):
+    request = RequestFactory().get("/")
+    request.user = UserFactory()
+    context = {
+        "request": request,
+        "user": request.user,
+        "self": HomePage.objects.first(),
+    }
+    banner = SiteAlertBanner.objects.create(
+        banner_text="--placeholder--", activated=True
+    )
+
+    visible, output = SiteAlert(context).get_output()
+    assert visible
+    assert "--placeholder--" in output
+
+    with django_assert_num_queries(0):
+        assert SiteAlert(context).get_output() == (True, output)
+
+    banner.activated = False
+    banner.save()
+
+    assert SiteAlert(context).get_output() == (False, "")
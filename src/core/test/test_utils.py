@@ -1,64 +1,78 @@
 import pytest
 
-from django.test import override_settings, RequestFactory
+from django.contrib.auth.models import Group
+from django.test import RequestFactory
 from django.contrib.sessions.middleware import SessionMiddleware
 from waffle.testutils import override_flag
 
+from core.models import FeatureFlag
 from core.utils import get_all_feature_flags
+from user.test.factories import UserFactory
 
 
 pytestmark = pytest.mark.django_db
 
 
-@override_settings(CACHE_FLAGS_IN_SESSION=True)
-def test_get_all_feature_flags_session_cache():
-    # setup client request
+def get_request_with_session():
     request = RequestFactory().get("/")
     middleware = SessionMiddleware(lambda x: None)
     middleware.process_request(request)
     request.session.save()
-    # verify session value is empty
-    assert len(request.session.items()) == 0
-    # setup a flag
-    with override_flag("dummy_new_flag", active=True):
-        # hit get_all_feature_flags to retrieve
-        flags = get_all_feature_flags(request)
-        # verify session value is not empty
-        assert len(request.session.items()) > 0
-        assert request.session["all_feature_flags"] == flags
-        assert flags["dummy_new_flag"] is True
-
-    # change a flag
-    with override_flag("dummy_new_flag", active=False):
-        new_flags = get_all_feature_flags(request)
-        assert new_flags == flags
-        # verify session value is not empty
-        assert len(request.session.items()) > 0
-        assert request.session["all_feature_flags"] == flags
-        assert new_flags["dummy_new_flag"] is True
+    return request
 
 
-@override_settings(CACHE_FLAGS_IN_SESSION=False)
-def test_get_all_feature_flags_session_cache_disabled():
+def test_get_all_feature_flags_not_cached_in_session():
     # setup client request
-    request = RequestFactory().get("/")
-    middleware = SessionMiddleware(lambda x: None)
-    middleware.process_request(request)
-    request.session.save()
+    request = get_request_with_session()
     # verify session value is empty
     assert len(request.session.items()) == 0
     # setup a flag
     with override_flag("dummy_new_flag", active=True):
         # hit get_all_feature_flags to retrieve
         flags = get_all_feature_flags(request)
-        # verify session value is not empty
+        # verify session value is still empty
         assert len(request.session.items()) == 0
         assert flags["dummy_new_flag"] is True
 
-    # change a flag
+    # change a flag, which applies straight away to the next request
+    request = get_request_with_session()
     with override_flag("dummy_new_flag", active=False):
         new_flags = get_all_feature_flags(request)
         assert new_flags != flags
-        # verify session value is not empty
         assert len(request.session.items()) == 0
         assert new_flags["dummy_new_flag"] is False
+
+
+def test_get_all_feature_flags_for_user(django_assert_num_queries):
+    user = UserFactory()
+    group = Group.objects.create(name="--placeholder--")
+    user_flag = FeatureFlag.objects.create(name="user_flag")
+    user_flag.users.add(user)
+    group_flag = FeatureFlag.objects.create(name="group_flag")
+    group_flag.groups.add(group)
+    FeatureFlag.objects.create(name="superuser_flag", superusers=True)
+
+    def get_request():
+        request = RequestFactory().get("/")
+        request.user = user
+        return request
+
+    get_all_feature_flags(get_request())
+
+    # Only the user's groups are looked up once the flags are compiled.
+    request = get_request()
+    with django_assert_num_queries(1):
+        flags = get_all_feature_flags(request)
+    assert flags["user_flag"] is True
+    assert flags["group_flag"] is False
+    assert flags["superuser_flag"] is False
+
+    # The flags are evaluated once per request.
+    with django_assert_num_queries(0):
+        assert get_all_feature_flags(request) is flags
+
+    user.groups.add(group)
+    assert get_all_feature_flags(get_request())["group_flag"] is True
+
+    user_flag.users.remove(user)
+    assert get_all_feature_flags(get_request())["user_flag"] is False
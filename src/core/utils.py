@@ -2,14 +2,13 @@ from datetime import time
 from functools import wraps
 from typing import Any
 
-from django.conf import settings
 from django.core.cache import cache
 from django.db import models
 from django.http import HttpRequest
-from waffle import flag_is_active as waffle_flag_is_active
 
 from core import flags
-from core.models import ExternalLinkSetting, FeatureFlag
+from core.models import ExternalLinkSetting
+from core.services.feature_flags import get_active_flags
 
 
 EXTENDED_LINKS_SETTINGS_CACHE = {
@@ -22,19 +21,7 @@ EXTENDED_LINKS_SETTINGS_CACHE = {
 
 
 def get_all_feature_flags(request) -> dict[str, bool]:
-    if all_flags := request.session.get("all_feature_flags", False):
-        # caching override for testing purposes
-        if settings.CACHE_FLAGS_IN_SESSION:
-            return all_flags
-
-    all_flags = {
-        flag.name: waffle_flag_is_active(request, flag.name)
-        for flag in FeatureFlag.objects.all()
-    }
-    # This small amount of DB-backed data is accessed multiple times per request, so session storage makes sense
-    if settings.CACHE_FLAGS_IN_SESSION:
-        request.session["all_feature_flags"] = all_flags
-    return all_flags
+    return get_active_flags(request)
 
 
 def flag_is_active(request, flag_name: str) -> bool | None:
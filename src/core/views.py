@@ -24,6 +24,7 @@ from core import flags
 from core.forms import PageProblemFoundForm
 from core.models import Tag
 from core.services import tags as tags_service
+from interactions.services import feed as feed_service
 from interactions.services import tag_subscriptions as tag_sub_service
 from user.models import User
 
@@ -297,8 +298,7 @@ def personal_feed(request: HttpRequest) -> HttpResponse:
         return HttpResponseForbidden()
 
     context: dict[str, str] = {"page_title": "Your feed"}
-    subscribed_tags = tag_sub_service.get_subscribed_tags(user=request.user)
     context.update(
-        grouped_content=tags_service.get_activity(tags=subscribed_tags),
+        grouped_content=feed_service.get_feed(user=request.user),
     )
     return TemplateResponse(request, "core/personal_feed.html", context)
@@ -1,10 +1,13 @@
+import json
 from typing import Optional, Union
 
+from django.conf import settings
 from wagtail.search.backends import get_search_backend
 from wagtail.search.backends.elasticsearch7 import (
     Elasticsearch7Mapping,
     Elasticsearch7SearchBackend,
     Elasticsearch7SearchQueryCompiler,
+    Elasticsearch7SearchResults,
     ElasticsearchAtomicIndexRebuilder,
     Field,
 )
@@ -13,9 +16,17 @@ from wagtail.search.management.commands.update_index import group_models_by_inde
 from wagtail.search.query import MATCH_NONE, Fuzzy, MatchAll, Not, Phrase, PlainText
 
 from extended_search import settings as search_settings
+from extended_search.cache import compiled_query_cache
 from extended_search.index import RelatedFields, get_indexed_models
-from extended_search.query import Filtered, FunctionScore, Nested, OnlyFields
-from extended_search.query_builder import build_queries
+from extended_search.metrics import timed
+from extended_search.query import (
+    Filtered,
+    FunctionScore,
+    Nested,
+    OnlyFields,
+    Templated,
+)
+from extended_search.query_builder import CustomQueryBuilder, build_queries
 
 
 class FilteredSearchMapping(Elasticsearch7Mapping):
@@ -266,6 +277,30 @@ class NestedSearchQueryCompiler(ExtendedSearchQueryCompiler):
 
 
 class FilteredSearchQueryCompiler(ExtendedSearchQueryCompiler):
+    def get_inner_query(self):
+        """
+        Apply the filters of a top level Filtered query once, around the whole
+        compiled subquery, rather than once per searched field
+        """
+        if not isinstance(self.query, Filtered):
+            return super().get_inner_query()
+
+        filtered = self.query
+        self.query = filtered.subquery
+        try:
+            # Start from the top of the MRO so the subquery is compiled as if
+            # it was the whole query, e.g. a Templated query
+            inner_query = self.get_inner_query()
+        finally:
+            self.query = filtered
+
+        return {
+            "bool": {
+                "must": inner_query,
+                "filter": [self._process_lookup(*f) for f in filtered.filters],
+            }
+        }
+
     def _compile_query(self, query, field, boost=1.0):
         if isinstance(query, Filtered):
             return self._compile_filtered_query(query, [field], boost)
@@ -296,6 +331,9 @@ class FilteredSearchQueryCompiler(ExtendedSearchQueryCompiler):
         if lookup == "contains":
             return {"match": {column_name: value}}
 
+        if lookup == "includes":
+            return {"terms": {column_name: value}}
+
         if lookup == "excludes":
             return {"bool": {"mustNot": {"terms": {column_name: value}}}}
 
@@ -379,12 +417,85 @@ class FunctionScoreSearchQueryCompiler(ExtendedSearchQueryCompiler):
         }
 
 
+class CompiledQuery:
+    """
+    The JSON of a compiled inner query with a placeholder where the query
+    string goes, so it can be reused for any query string.
+    """
+
+    def __init__(self, template: str, placeholder: str):
+        self.template = template
+        self.placeholder = placeholder
+
+    def render(self, query_string: str) -> dict:
+        return json.loads(
+            self.template.replace(
+                json.dumps(self.placeholder), json.dumps(query_string)
+            )
+        )
+
+
+class TemplatedSearchQueryCompiler(ExtendedSearchQueryCompiler):
+    """
+    Compiles Templated queries once per model, query shape and settings
+    version into a CompiledQuery held in the process-local LRU cache, so each
+    search only has to substitute its query string into the JSON.
+    """
+
+    PLACEHOLDER = "\x00search_query\x00"
+
+    def get_inner_query(self):
+        if not isinstance(self.query, Templated):
+            return super().get_inner_query()
+
+        if settings.SEARCH_ENABLE_QUERY_CACHE:
+            # Pick up settings changes made by other processes
+            search_settings.sync_settings_generation()
+
+        cache_key = self._get_compiled_query_cache_key()
+        compiled_query = compiled_query_cache.get(cache_key)
+        if compiled_query is None:
+            compiled_query = self._compile_templated_query()
+            compiled_query_cache.set(cache_key, compiled_query)
+
+        return compiled_query.render(self.query.query_string)
+
+    def _get_compiled_query_cache_key(self) -> tuple:
+        return (
+            self.queryset.model._meta.label,
+            self.query.model_class._meta.label,
+            self.query.is_multi_word,
+            tuple(self.to_field(f).field_name_with_boost for f in self.remapped_fields),
+            search_settings.settings_version,
+        )
+
+    def _compile_templated_query(self) -> CompiledQuery:
+        """
+        Build the model's query with a placeholder for the query string, with
+        the same number of words as the real query string, and compile it.
+        """
+        templated = self.query
+        placeholder = self.PLACEHOLDER
+        if templated.is_multi_word:
+            placeholder = f"{placeholder} {placeholder}"
+
+        built_query = CustomQueryBuilder.build_search_query(templated.model_class)
+        self.query = CustomQueryBuilder.swap_variables(built_query, placeholder)
+        try:
+            inner_query = super().get_inner_query()
+        finally:
+            self.query = templated
+
+        return CompiledQuery(json.dumps(inner_query), placeholder)
+
+
 class CustomSearchMapping(
     FilteredSearchMapping,
 ): ...
 
 
 class CustomSearchQueryCompiler(
+    TemplatedSearchQueryCompiler,
     FunctionScoreSearchQueryCompiler,
     BoostSearchQueryCompiler,
     FilteredSearchQueryCompiler,
@@ -393,10 +504,122 @@ class CustomSearchQueryCompiler(
 ):
     mapping_class = CustomSearchMapping
 
+    @timed("compile")
+    def get_query(self):
+        return super().get_query()
+
+
+class CustomSearchResults(Elasticsearch7SearchResults):
+    """
+    Adds support for running the search as one part of a multi search
+    (`_msearch`) request, so several result sets can share a round trip.
+    """
+
+    PAGE_SIZE = 100
+
+    def _backend_do_search(self, body, **kwargs):
+        with timed("opensearch"):
+            return super()._backend_do_search(body, **kwargs)
+
+    def _do_count(self):
+        with timed("opensearch"):
+            return super()._do_count()
+
+    def _get_results_from_hits(self, hits):
+        with timed("hydrate"):
+            return iter(list(super()._get_results_from_hits(hits)))
+
+    def get_msearch_request(self) -> tuple[dict, dict]:
+        """
+        Return the header and body lines for this result set's slice, asking
+        OpenSearch to track the total number of hits alongside the page.
+        """
+        if self.stop is not None:
+            size = self.stop - self.start
+        else:
+            size = self.PAGE_SIZE
+
+        body = self._get_es_body()
+        body.update(
+            {
+                "_source": False,
+                self.fields_param_name: "pk",
+                "from": self.start,
+                "size": size,
+                "track_total_hits": True,
+            }
+        )
+        header = {
+            "index": self.backend.get_index_for_model(
+                self.query_compiler.queryset.model
+            ).name,
+        }
+        return header, body
+
+    def set_msearch_response(self, response: dict) -> Optional[int]:
+        """
+        Populate the results and count caches from this result set's part of
+        a multi search response, returning the total number of hits for the
+        (unsliced) query, or None if OpenSearch returned an error.
+        """
+        if "error" in response:
+            return None
+
+        total = response["hits"]["total"]["value"]
+        self._results_cache = list(
+            self._get_results_from_hits(response["hits"]["hits"])
+        )
+
+        hit_count = total - self.start
+        if self.stop is not None:
+            hit_count = min(hit_count, self.stop - self.start)
+        self._count_cache = max(hit_count, 0)
+
+        return total
+
+    SCROLL_TIMEOUT = "2m"
+
+    def iter_chunks(self, chunk_size: int = PAGE_SIZE):
+        """
+        Yield lists of up to `chunk_size` results for the whole (unsliced)
+        result set, paging through OpenSearch with the scroll API so only one
+        chunk is held in memory at a time.
+        """
+        body = self._get_es_body()
+        body.update(
+            {
+                "_source": False,
+                self.fields_param_name: "pk",
+                "size": chunk_size,
+            }
+        )
+        response = self.backend.es.search(
+            index=self.backend.get_index_for_model(
+                self.query_compiler.queryset.model
+            ).name,
+            body=body,
+            scroll=self.SCROLL_TIMEOUT,
+        )
+        scroll_id = response.get("_scroll_id")
+
+        try:
+            while hits := response["hits"]["hits"]:
+                yield list(self._get_results_from_hits(hits))
+                response = self.backend.es.scroll(
+                    scroll_id=scroll_id, scroll=self.SCROLL_TIMEOUT
+                )
+                scroll_id = response.get("_scroll_id", scroll_id)
+        finally:
+            if scroll_id:
+                self.backend.es.clear_scroll(scroll_id=scroll_id)
+
 
 class CustomAtomicIndexRebuilder(ElasticsearchAtomicIndexRebuilder):
     def finish(self):
         super().finish()
+        # The rebuilt index may have new fields, so have every process rebuild
+        # its queries for it
+        search_settings.bump_settings_generation()
         models_grouped_by_index = group_models_by_index(
             get_search_backend(), get_indexed_models()
         )
@@ -413,7 +636,43 @@ class CustomAtomicIndexRebuilder(ElasticsearchAtomicIndexRebuilder):
 class CustomSearchBackend(Elasticsearch7SearchBackend):
     query_compiler_class = CustomSearchQueryCompiler
     mapping_class = CustomSearchMapping
+    results_class = CustomSearchResults
     atomic_rebuilder_class = CustomAtomicIndexRebuilder
 
+    def msearch(self, search_results: list[CustomSearchResults]) -> list[Optional[int]]:
+        """
+        Run several result sets in a single `_msearch` round trip, filling
+        each one's caches and returning the total hits for each in order.
+        """
+        if not search_results:
+            return []
+
+        body = []
+        for results in search_results:
+            body.extend(results.get_msearch_request())
+
+        with timed("opensearch"):
+            responses = self.es.msearch(body=body)["responses"]
+
+        return [
+            results.set_msearch_response(response)
+            for results, response in zip(search_results, responses, strict=True)
+        ]
+
+    def search_from_request(
+        self, header: dict, body: dict, timeout: Optional[float] = None
+    ) -> dict:
+        """
+        Run a single search built by `CustomSearchResults.get_msearch_request`.
+
+        This only talks to OpenSearch (the query is compiled beforehand and the
+        hits are hydrated afterwards), so it is safe to call from a worker
+        thread.
+        """
+        with timed("opensearch"):
+            return self.es.search(
+                index=header["index"], body=body, request_timeout=timeout
+            )
+
 
 SearchBackend = CustomSearchBackend
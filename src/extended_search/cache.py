@@ -0,0 +1,49 @@
+import threading
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Any
+
+from django.conf import settings
+
+
+class LRUCache:
+    """
+    A small, thread-safe, process-local cache that evicts the least recently
+    used entry once it holds more than `maxsize` entries.
+    """
+
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            if key not in self._data:
+                return default
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+# Compiled OpenSearch DSL templates, see `TemplatedSearchQueryCompiler`
+compiled_query_cache = LRUCache(maxsize=settings.SEARCH_COMPILED_QUERY_CACHE_SIZE)
+
+# Built query trees, see `CustomQueryBuilder.build_search_query`
+query_tree_cache = LRUCache(maxsize=64)
@@ -0,0 +1,118 @@
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+import sentry_sdk
+
+
+# The search category (tab) the current request is timing phases for
+search_category: contextvars.ContextVar[str] = contextvars.ContextVar(
+    "search_category", default="unknown"
+)
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """
+    A minimal, thread-safe Prometheus style histogram with labels.
+
+    Observations are held in process memory, so each worker process exposes
+    its own histograms.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: tuple[str, ...],
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = label_names
+        self.buckets = buckets
+        # labels -> [count per bucket..., sum, count]
+        self._values: dict[tuple[str, ...], list[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels: tuple[str, ...], value: float) -> None:
+        with self._lock:
+            values = self._values.setdefault(labels, [0] * (len(self.buckets) + 2))
+            for i, bucket in enumerate(self.buckets):
+                if value <= bucket:
+                    values[i] += 1
+            values[-2] += value
+            values[-1] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+    def expose(self) -> str:
+        """
+        Return the histogram in the Prometheus text exposition format.
+        """
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} histogram",
+        ]
+        with self._lock:
+            values_by_labels = {k: list(v) for k, v in sorted(self._values.items())}
+
+        for labels, values in values_by_labels.items():
+            label_str = ",".join(
+                f'{name}="{value}"'
+                for name, value in zip(self.label_names, labels, strict=True)
+            )
+            for bucket, bucket_count in zip(self.buckets, values[:-2], strict=True):
+                lines.append(
+                    f'{self.name}_bucket{{{label_str},le="{bucket}"}} {bucket_count}'
+                )
+            lines.append(f'{self.name}_bucket{{{label_str},le="+Inf"}} {values[-1]}')
+            lines.append(f"{self.name}_sum{{{label_str}}} {values[-2]}")
+            lines.append(f"{self.name}_count{{{label_str}}} {values[-1]}")
+
+        return "\n".join(lines) + "\n"
+
+
+search_phase_duration = Histogram(
+    "search_phase_duration_seconds",
+    "Time spent in each phase of a search. Phases can nest, e.g. render "
+    "includes the opensearch and hydrate phases of the searches it triggers.",
+    label_names=("phase", "category"),
+)
+
+
+@contextmanager
+def timed(phase: str, category: Optional[str] = None):
+    """
+    Time a phase of a search as a Sentry span and in the phase histogram,
+    labelled with the search category of the current request.
+    """
+    if category is None:
+        category = search_category.get()
+
+    with sentry_sdk.start_span(op=f"search.{phase}") as span:
+        span.set_tag("search.category", category)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            search_phase_duration.observe(
+                (phase, category), time.perf_counter() - start
+            )
+
+
+@contextmanager
+def category_context(category: str):
+    """
+    Label the phases timed within the block with the given search category.
+    """
+    token = search_category.set(category)
+    try:
+        yield
+    finally:
+        search_category.reset(token)
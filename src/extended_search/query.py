@@ -102,3 +102,30 @@ class FunctionScore(SearchQuery):
             self.function_params,
             self.field,
         )
+
+
+class Templated(SearchQuery):
+    """
+    Stands in for the full query `CustomQueryBuilder` builds for a model, so
+    the compiler can reuse a precompiled DSL template for it and only
+    substitute the query string in.
+    """
+
+    def __init__(self, model_class: models.Model, query_string: str):
+        if not isinstance(query_string, str):
+            raise TypeError("The `query_string` parameter must be a string")
+
+        self.model_class = model_class
+        self.query_string = query_string
+
+    @property
+    def is_multi_word(self) -> bool:
+        # Mirrors the check in `Variable.output`, which only adds a QUERY_AND
+        # part to the query when there is more than one word
+        return len(self.query_string.split()) > 1
+
+    def __repr__(self):
+        return "<Templated model_class='{}' query_string='{}'>".format(
+            self.model_class.__name__,
+            self.query_string,
+        )
@@ -1,3 +1,4 @@
+import copy
 import inspect
 import logging
 from typing import TYPE_CHECKING, Optional, Type
@@ -11,6 +12,7 @@ from wagtail.search.query import Boost, Fuzzy, Phrase, PlainText, SearchQuery
 
 from extended_search import query_builder
 from extended_search import settings as search_settings
+from extended_search.cache import query_tree_cache
 from extended_search.index import (
     BaseField,
     Indexed,
@@ -21,6 +23,7 @@ from extended_search.index import (
     get_indexed_field_name,
     get_indexed_models,
 )
+from extended_search.metrics import timed
 from extended_search.query import Filtered, FunctionScore, Nested, OnlyFields
 from extended_search.types import AnalysisType, SearchQueryType
 
@@ -300,27 +303,36 @@ class CustomQueryBuilder(QueryBuilder):
     ) -> Optional[SearchQuery]:
         """
         Iterate through the query and swap out variables for the search_query.
+
+        The given query is left untouched and a new tree is returned (sharing
+        any unchanged nodes), so built queries can be safely reused.
         """
 
         if isinstance(query, Variable):
             return query.output(search_query)
 
         if hasattr(query, "subqueries"):
-            query.subqueries = [
+            subqueries = [
                 cls.swap_variables(sq, search_query) for sq in query.subqueries
             ]
-            query.subqueries = [sq for sq in query.subqueries if sq]
+            subqueries = [sq for sq in subqueries if sq]
 
-            if not query.subqueries:
+            if not subqueries:
                 return None
-            elif len(query.subqueries) == 1:
-                return query.subqueries[0]
+            elif len(subqueries) == 1:
+                return subqueries[0]
+
+            query = copy.copy(query)
+            query.subqueries = subqueries
 
         if hasattr(query, "subquery"):
-            query.subquery = cls.swap_variables(query.subquery, search_query)
-            if not query.subquery:
+            subquery = cls.swap_variables(query.subquery, search_query)
+            if not subquery:
                 return None
 
+            query = copy.copy(query)
+            query.subquery = subquery
+
         return query
 
     @classmethod
@@ -329,24 +341,47 @@ class CustomQueryBuilder(QueryBuilder):
         return cls.swap_variables(built_query, query_str)
 
     @classmethod
+    @timed("query_build")
     def build_search_query(cls, model_class, ignore_cache=False):
         """
         Generates a full query for a model class, by running query builder
         against the given model as well as all models with the given as a
         parent; each has its own subquery using its own settings filtered by
         type, and all are joined together at the end.
+
+        When the query cache is enabled, built queries are kept in this
+        process (keyed on the index alias) and in Redis (keyed on the aliased
+        index), both alongside the settings generation so they are rebuilt
+        when the settings change in any process. Built queries must not be
+        mutated; use `swap_variables` to get a copy with the variables bound.
         """
         if settings.SEARCH_ENABLE_QUERY_CACHE:
+            search_settings.sync_settings_generation()
             search_backend: "CustomSearchBackend" = get_search_backend()
             model_index = search_backend.get_index_for_model(model_class)
+            local_cache_key = (
+                model_index.name,
+                model_class.__name__,
+                search_settings.settings_generation,
+            )
+            if not ignore_cache:
+                built_query = query_tree_cache.get(local_cache_key)
+                if built_query:
+                    return built_query
+
             if model_index.is_alias():
                 alias_indexes = model_index.aliased_indices()
                 if len(alias_indexes) == 1:
                     model_index = model_index.aliased_indices()[0]
-            cache_key = f"{model_index.name}__{model_class.__name__}"
+            cache_key = (
+                f"{model_index.name}__{model_class.__name__}"
+                f"__{search_settings.settings_generation}"
+            )
             if not ignore_cache:
-                built_query = cache.get(cache_key, None)
+                with timed("cache_lookup"):
+                    built_query = cache.get(cache_key, None)
                 if built_query:
+                    query_tree_cache.set(local_cache_key, built_query)
                     return built_query
 
         extended_models = cls.get_extended_models_with_unique_indexed_fields(
@@ -400,6 +435,7 @@ class CustomQueryBuilder(QueryBuilder):
 
         if settings.SEARCH_ENABLE_QUERY_CACHE:
             cache.set(cache_key, search_query)
+            query_tree_cache.set(local_cache_key, search_query)
 
         logger.debug(search_query)
         return search_query
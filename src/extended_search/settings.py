@@ -1,10 +1,12 @@
 import os
+import time
 from collections import ChainMap
 from collections.abc import Mapping
 from typing import Any, Optional
 
 import environ
 from django.conf import settings as django_settings
+from django.core.cache import cache
 from django.core.exceptions import ImproperlyConfigured
 from django.db.utils import ProgrammingError
 from psycopg2.errors import UndefinedTable
@@ -308,9 +310,68 @@ settings_singleton = SearchSettings()
 # this is because it can get re-exported after a value is updated
 extended_search_settings = settings_singleton.to_dict()
 
+# Bumped whenever the settings are reloaded, so anything derived from them
+# (e.g. compiled query templates) can tell when it is out of date
+settings_version = 0
+
+# Shared between processes in Redis and bumped whenever the settings change
+# anywhere, so each process knows to reload them
+SETTINGS_GENERATION_CACHE_KEY = "extended_search__settings_generation"
+settings_generation: Optional[int] = None
+settings_generation_checked_at = 0.0
+
 
 def get_settings_field_key(model_class, field) -> str:
     full_field_name = field.field_name
     if isinstance(field, BaseField):
         full_field_name = field.get_full_model_field_name()
     return f"{model_class._meta.app_label}.{model_class._meta.model_name}.{full_field_name}"
+
+
+def reload_settings():
+    global extended_search_settings, settings_version
+
+    settings_singleton.initialise_db_dict()
+    extended_search_settings = settings_singleton.to_dict()
+    settings_version += 1
+
+
+def get_settings_generation() -> int:
+    # Seed with the time so a lost key can't bring back an old generation
+    cache.add(SETTINGS_GENERATION_CACHE_KEY, int(time.time()), timeout=None)
+    return cache.get(SETTINGS_GENERATION_CACHE_KEY)
+
+
+def bump_settings_generation():
+    """
+    Tell every process the settings have changed; this process is assumed to
+    have already reloaded them.
+    """
+    global settings_generation
+
+    try:
+        settings_generation = cache.incr(SETTINGS_GENERATION_CACHE_KEY)
+    except ValueError:
+        settings_generation = get_settings_generation()
+
+
+def sync_settings_generation():
+    """
+    Reload the settings if another process has changed them since we last
+    looked, checking Redis at most once per
+    SEARCH_SETTINGS_GENERATION_CHECK_INTERVAL seconds.
+    """
+    global settings_generation, settings_generation_checked_at
+
+    now = time.monotonic()
+    if (
+        now - settings_generation_checked_at
+        < django_settings.SEARCH_SETTINGS_GENERATION_CHECK_INTERVAL
+    ):
+        return
+    settings_generation_checked_at = now
+
+    generation = get_settings_generation()
+    if settings_generation is not None and generation != settings_generation:
+        reload_settings()
+    settings_generation = generation
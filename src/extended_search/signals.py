@@ -1,12 +1,15 @@
 from django.db.models.signals import post_delete, post_save
 
 from extended_search import settings
+from extended_search.cache import compiled_query_cache, query_tree_cache
 from extended_search.models import Setting
 
 
 def update_searchsetting_queryset(sender, **kwargs):
-    settings.settings_singleton.initialise_db_dict()
-    settings.extended_search_settings = settings.settings_singleton.to_dict()
+    settings.reload_settings()
+    settings.bump_settings_generation()
+    compiled_query_cache.clear()
+    query_tree_cache.clear()
 
 
 post_save.connect(update_searchsetting_queryset, sender=Setting)
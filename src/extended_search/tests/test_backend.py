@@ -11,6 +11,7 @@ from wagtail.search.query import (
     Fuzzy,
     MatchAll,
     Not,
+    Or,
     Phrase,
     PlainText,
     SearchQuery,
@@ -19,17 +20,23 @@ from wagtail.search.query import (
 from content.models import ContentPage
 from extended_search.backends.backend import (
     BoostSearchQueryCompiler,
+    CompiledQuery,
     CustomSearchBackend,
     CustomSearchMapping,
     CustomSearchQueryCompiler,
+    CustomSearchResults,
     ExtendedSearchQueryCompiler,
     FilteredSearchMapping,
     FilteredSearchQueryCompiler,
     NestedSearchQueryCompiler,
     OnlyFieldSearchQueryCompiler,
     SearchBackend,
+    TemplatedSearchQueryCompiler,
 )
-from extended_search.query import Filtered, Nested, OnlyFields
+from extended_search.cache import compiled_query_cache
+from extended_search.query import Filtered, Nested, OnlyFields, Templated
+from extended_search.query_builder import Variable
+from extended_search.types import SearchQueryType
 from peoplefinder.models import Person, Team
 
 
@@ -482,6 +489,28 @@ class TestFilteredSearchQueryCompiler:
         result = compiler._compile_filtered_query(query, [field], boost=1.0)
         assert result["bool"]["filter"] == ["foobar", "foobar"]
 
+    def test_get_inner_query_wraps_top_level_filtered(self, mocker):
+        mocker.patch(
+            "extended_search.backends.backend.FilteredSearchQueryCompiler._process_lookup",
+            return_value="foobar",
+        )
+        query = Filtered(
+            Phrase("quid"),
+            filters=[("search_pinned_phrases", "excludes", ["quid"])],
+        )
+        compiler = FilteredSearchQueryCompiler(ContentPage.objects.all(), query)
+        parent_compiler = ExtendedSearchQueryCompiler(
+            ContentPage.objects.all(), Phrase("quid")
+        )
+        result = compiler.get_inner_query()
+        assert result == {
+            "bool": {
+                "must": parent_compiler.get_inner_query(),
+                "filter": ["foobar"],
+            }
+        }
+        assert compiler.query is query
+
     def test_process_lookup(self, mocker):
         mock_parent = mocker.patch(
             "extended_search.backends.backend.ExtendedSearchQueryCompiler._process_lookup"
@@ -497,6 +526,9 @@ class TestFilteredSearchQueryCompiler:
         result = compiler._process_lookup(field, "contains", 334)
         mock_parent.assert_not_called()
         assert result == {"match": {"foobar": 334}}
+        result = compiler._process_lookup(field, "includes", ["bar"])
+        mock_parent.assert_not_called()
+        assert result == {"terms": {"foobar": ["bar"]}}
         result = compiler._process_lookup(field, "excludes", "bar")
         mock_parent.assert_not_called()
         assert result == {"bool": {"mustNot": {"terms": {"foobar": "bar"}}}}
@@ -505,6 +537,93 @@ class TestFilteredSearchQueryCompiler:
         assert result == parent_compiler._process_lookup(field, "gte", "bar")
 
 
+class TestCompiledQuery:
+    def test_render(self):
+        compiled_query = CompiledQuery(
+            '{"match": {"title": {"query": "\\u0000sq\\u0000", "boost": 2.0}}}',
+            "\x00sq\x00",
+        )
+        assert compiled_query.render('a "quoted" query') == {
+            "match": {"title": {"query": 'a "quoted" query', "boost": 2.0}}
+        }
+
+
+class TestTemplatedSearchQueryCompiler:
+    def build_search_query(self, model_class):
+        return Or(
+            [
+                Variable("search_query", SearchQueryType.PHRASE),
+                Variable("search_query", SearchQueryType.QUERY_AND),
+            ]
+        )
+
+    def test_get_inner_query_ignores_other_queries(self, mocker):
+        mock_compile = mocker.patch(
+            "extended_search.backends.backend.TemplatedSearchQueryCompiler._compile_templated_query"
+        )
+        query = PlainText("quid")
+        compiler = TemplatedSearchQueryCompiler(ContentPage.objects.all(), query)
+        parent_compiler = ExtendedSearchQueryCompiler(ContentPage.objects.all(), query)
+        assert compiler.get_inner_query() == parent_compiler.get_inner_query()
+        mock_compile.assert_not_called()
+
+    def test_get_inner_query_matches_uncompiled_query(self, mocker):
+        compiled_query_cache.clear()
+        mocker.patch(
+            "extended_search.backends.backend.CustomQueryBuilder.build_search_query",
+            side_effect=self.build_search_query,
+        )
+
+        compiler = TemplatedSearchQueryCompiler(
+            ContentPage.objects.all(), Templated(ContentPage, "foo")
+        )
+        parent_compiler = ExtendedSearchQueryCompiler(
+            ContentPage.objects.all(), Phrase("foo")
+        )
+        assert compiler.get_inner_query() == parent_compiler.get_inner_query()
+
+        compiler = TemplatedSearchQueryCompiler(
+            ContentPage.objects.all(), Templated(ContentPage, "foo 'bar'")
+        )
+        parent_compiler = ExtendedSearchQueryCompiler(
+            ContentPage.objects.all(),
+            Or([Phrase("foo 'bar'"), PlainText("foo 'bar'", operator="and")]),
+        )
+        assert compiler.get_inner_query() == parent_compiler.get_inner_query()
+
+    def test_get_inner_query_compiles_once_per_shape(self, mocker):
+        compiled_query_cache.clear()
+        mock_build_search_query = mocker.patch(
+            "extended_search.backends.backend.CustomQueryBuilder.build_search_query",
+            side_effect=self.build_search_query,
+        )
+
+        for query_str in ["foo", "bar", "foo bar", "bar baz qux"]:
+            compiler = TemplatedSearchQueryCompiler(
+                ContentPage.objects.all(), Templated(ContentPage, query_str)
+            )
+            compiler.get_inner_query()
+
+        assert mock_build_search_query.call_count == 2
+        assert len(compiled_query_cache) == 2
+
+    def test_get_inner_query_recompiles_on_settings_version_change(self, mocker):
+        compiled_query_cache.clear()
+        mock_build_search_query = mocker.patch(
+            "extended_search.backends.backend.CustomQueryBuilder.build_search_query",
+            side_effect=self.build_search_query,
+        )
+        mocker.patch("extended_search.settings.settings_version", 1)
+        compiler = TemplatedSearchQueryCompiler(
+            ContentPage.objects.all(), Templated(ContentPage, "foo")
+        )
+        compiler.get_inner_query()
+        mocker.patch("extended_search.settings.settings_version", 2)
+        compiler.get_inner_query()
+
+        assert mock_build_search_query.call_count == 2
+
+
 class TestFilteredSearchMapping:
     def test_get_field_column_name(self, mocker):
         mock_parent = mocker.patch(
@@ -524,11 +643,98 @@ class TestFilteredSearchMapping:
         assert result == "content_type"
 
 
+class TestCustomSearchResults:
+    def _get_results(self, mocker):
+        backend = mocker.Mock()
+        backend.get_index_for_model.return_value.name = "--index--"
+        compiler = CustomSearchQueryCompiler(
+            ContentPage.objects.all(), PlainText("quid")
+        )
+        mocker.patch.object(
+            CustomSearchResults,
+            "_get_es_body",
+            return_value={"query": "--query--"},
+        )
+        return CustomSearchResults(backend, compiler)
+
+    def test_get_msearch_request(self, mocker):
+        results = self._get_results(mocker)[20:40]
+        header, body = results.get_msearch_request()
+        assert header == {"index": "--index--"}
+        assert body == {
+            "query": "--query--",
+            "_source": False,
+            "stored_fields": "pk",
+            "from": 20,
+            "size": 20,
+            "track_total_hits": True,
+        }
+
+        header, body = results[:0].get_msearch_request()
+        assert body["from"] == 20
+        assert body["size"] == 0
+
+    def test_set_msearch_response(self, mocker):
+        mocker.patch.object(
+            CustomSearchResults,
+            "_get_results_from_hits",
+            return_value=iter(["--result-1--", "--result-2--"]),
+        )
+        results = self._get_results(mocker)[:2]
+        total = results.set_msearch_response(
+            {"hits": {"total": {"value": 45, "relation": "eq"}, "hits": [{}, {}]}}
+        )
+        assert total == 45
+        assert results._results_cache == ["--result-1--", "--result-2--"]
+        assert results.count() == 2
+
+    def test_set_msearch_response_error(self, mocker):
+        results = self._get_results(mocker)
+        assert results.set_msearch_response({"error": "--error--"}) is None
+        assert results._results_cache is None
+        assert results._count_cache is None
+
+    def test_iter_chunks(self, mocker):
+        mocker.patch.object(
+            CustomSearchResults,
+            "_get_results_from_hits",
+            side_effect=lambda hits: iter(hits),
+        )
+        results = self._get_results(mocker)
+        es = results.backend.es
+        es.search.return_value = {
+            "_scroll_id": "--scroll-1--",
+            "hits": {"hits": ["--hit-1--", "--hit-2--"]},
+        }
+        es.scroll.side_effect = [
+            {"_scroll_id": "--scroll-2--", "hits": {"hits": ["--hit-3--"]}},
+            {"_scroll_id": "--scroll-2--", "hits": {"hits": []}},
+        ]
+
+        chunks = list(results.iter_chunks(chunk_size=2))
+
+        assert chunks == [["--hit-1--", "--hit-2--"], ["--hit-3--"]]
+        es.search.assert_called_once_with(
+            index="--index--",
+            body={
+                "query": "--query--",
+                "_source": False,
+                "stored_fields": "pk",
+                "size": 2,
+            },
+            scroll="2m",
+        )
+        es.scroll.assert_called_with(scroll_id="--scroll-2--", scroll="2m")
+        es.clear_scroll.assert_called_once_with(scroll_id="--scroll-2--")
+
+
 class TestCustomSearchBackend:
     def test_correct_mappings_and_backends_configured(self):
         assert CustomSearchBackend.query_compiler_class == CustomSearchQueryCompiler
         assert CustomSearchBackend.mapping_class == CustomSearchMapping
+        assert CustomSearchBackend.results_class == CustomSearchResults
         assert ExtendedSearchQueryCompiler in inspect.getmro(CustomSearchQueryCompiler)
+        assert TemplatedSearchQueryCompiler in inspect.getmro(CustomSearchQueryCompiler)
         assert BoostSearchQueryCompiler in inspect.getmro(CustomSearchQueryCompiler)
         assert FilteredSearchQueryCompiler in inspect.getmro(CustomSearchQueryCompiler)
         assert NestedSearchQueryCompiler in inspect.getmro(CustomSearchQueryCompiler)
@@ -537,3 +743,27 @@ class TestCustomSearchBackend:
 
     def test_custom_search_backend_used(self):
         assert SearchBackend == CustomSearchBackend
+
+    def test_msearch(self, mocker):
+        backend = mocker.Mock()
+        backend.es.msearch.return_value = {"responses": ["--resp-1--", "--resp-2--"]}
+        results_1 = mocker.Mock()
+        results_1.get_msearch_request.return_value = ("--header-1--", "--body-1--")
+        results_1.set_msearch_response.return_value = 12
+        results_2 = mocker.Mock()
+        results_2.get_msearch_request.return_value = ("--header-2--", "--body-2--")
+        results_2.set_msearch_response.return_value = None
+
+        totals = CustomSearchBackend.msearch(backend, [results_1, results_2])
+
+        backend.es.msearch.assert_called_once_with(
+            body=["--header-1--", "--body-1--", "--header-2--", "--body-2--"]
+        )
+        results_1.set_msearch_response.assert_called_once_with("--resp-1--")
+        results_2.set_msearch_response.assert_called_once_with("--resp-2--")
+        assert totals == [12, None]
+
+    def test_msearch_empty(self, mocker):
+        backend = mocker.Mock()
+        assert CustomSearchBackend.msearch(backend, []) == []
+        backend.es.msearch.assert_not_called()
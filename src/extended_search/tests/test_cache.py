@@ -0,0 +1,29 @@
+from extended_search.cache import LRUCache
+
+
+class TestLRUCache:
+    def test_get_and_set(self):
+        cache = LRUCache(maxsize=2)
+        assert cache.get("foo") is None
+        assert cache.get("foo", "--default--") == "--default--"
+        cache.set("foo", "bar")
+        assert cache.get("foo") == "bar"
+        assert "foo" in cache
+        assert len(cache) == 1
+
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(maxsize=2)
+        cache.set("foo", 1)
+        cache.set("bar", 2)
+        cache.get("foo")
+        cache.set("baz", 3)
+        assert "foo" in cache
+        assert "bar" not in cache
+        assert "baz" in cache
+        assert len(cache) == 2
+
+    def test_clear(self):
+        cache = LRUCache()
+        cache.set("foo", 1)
+        cache.clear()
+        assert len(cache) == 0
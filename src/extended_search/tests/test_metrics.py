@@ -0,0 +1,63 @@
+from extended_search.metrics import (
+    Histogram,
+    category_context,
+    search_category,
+    search_phase_duration,
+    timed,
+)
+
+
+class TestHistogram:
+    def test_observe_and_expose(self):
+        histogram = Histogram(
+            "foo_seconds", "Foo docs", label_names=("phase",), buckets=(0.1, 1.0)
+        )
+        histogram.observe(("bar",), 0.05)
+        histogram.observe(("bar",), 0.5)
+        histogram.observe(("bar",), 5)
+
+        assert histogram.expose().splitlines() == [
+            "# HELP foo_seconds Foo docs",
+            "# TYPE foo_seconds histogram",
+            'foo_seconds_bucket{phase="bar",le="0.1"} 1',
+            'foo_seconds_bucket{phase="bar",le="1.0"} 2',
+            'foo_seconds_bucket{phase="bar",le="+Inf"} 3',
+            'foo_seconds_sum{phase="bar"} 5.55',
+            'foo_seconds_count{phase="bar"} 3',
+        ]
+
+    def test_clear(self):
+        histogram = Histogram("foo_seconds", "Foo docs", label_names=("phase",))
+        histogram.observe(("bar",), 0.05)
+        histogram.clear()
+        assert "foo_seconds_count" not in histogram.expose()
+
+
+class TestTimed:
+    def test_observes_phase_with_category(self, mocker):
+        mock_observe = mocker.patch.object(search_phase_duration, "observe")
+        with category_context("people"):
+            with timed("opensearch"):
+                pass
+        mock_observe.assert_called_once()
+        assert mock_observe.call_args.args[0] == ("opensearch", "people")
+        assert search_category.get() == "unknown"
+
+    def test_observes_when_raising(self, mocker):
+        mock_observe = mocker.patch.object(search_phase_duration, "observe")
+        try:
+            with timed("compile", category="teams"):
+                raise ValueError
+        except ValueError:
+            pass
+        assert mock_observe.call_args.args[0] == ("compile", "teams")
+
+    def test_decorator(self, mocker):
+        mock_observe = mocker.patch.object(search_phase_duration, "observe")
+
+        @timed("hydrate")
+        def foo():
+            return "--placeholder--"
+
+        assert foo() == "--placeholder--"
+        assert mock_observe.call_args.args[0] == ("hydrate", "unknown")
@@ -1,7 +1,8 @@
 import pytest
 from wagtail.search.query import PlainText
 
-from extended_search.query import Filtered, Nested, OnlyFields
+from content.models import ContentPage
+from extended_search.query import Filtered, Nested, OnlyFields, Templated
 
 
 class TestOnlyFields:
@@ -151,3 +152,26 @@ class TestFiltered:
             )
             == f"<Filtered {repr(PlainText('foo'))} filters=[('bar', 'baz', 'foobar')]>"
         )
+
+
+class TestTemplated:
+    def test_init_sets_attributes(self):
+        with pytest.raises(
+            TypeError, match="The `query_string` parameter must be a string"
+        ):
+            Templated(ContentPage, PlainText("foo"))
+
+        templated = Templated(ContentPage, "foo")
+        assert templated.model_class == ContentPage
+        assert templated.query_string == "foo"
+
+    def test_is_multi_word(self):
+        assert not Templated(ContentPage, "foo").is_multi_word
+        assert not Templated(ContentPage, " foo ").is_multi_word
+        assert Templated(ContentPage, "foo bar").is_multi_word
+
+    def test_repr(self):
+        assert (
+            repr(Templated(ContentPage, "foo"))
+            == "<Templated model_class='ContentPage' query_string='foo'>"
+        )
@@ -153,6 +153,19 @@ class TestCustomQueryBuilder:
         result = CustomQueryBuilder.swap_variables(query, query_str)
         assert repr(result) == repr(Not(Phrase("foo")))
 
+    def test_swap_variables_leaves_query_untouched(self):
+        query = Or(
+            [
+                Boost(Variable("search_query", SearchQueryType.PHRASE), 2.0),
+                Variable("search_query", SearchQueryType.QUERY_AND),
+            ]
+        )
+        before = repr(query)
+        CustomQueryBuilder.swap_variables(query, "foo bar")
+        assert repr(query) == before
+        result = CustomQueryBuilder.swap_variables(query, "baz")
+        assert repr(result) == repr(Boost(Phrase("baz"), 2.0))
+
     def test_variable_output_use_and_if_single_word(self):
         variable = Variable("search_query", SearchQueryType.QUERY_AND)
         assert variable.output("searchquery") is None
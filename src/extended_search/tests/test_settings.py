@@ -5,6 +5,7 @@ from types import NoneType
 import pytest
 from wagtail.search import index
 
+from extended_search import settings as search_settings
 from extended_search.index import BaseField, SearchField
 from extended_search.models import Setting
 from extended_search.settings import (
@@ -488,3 +489,44 @@ class TestGetSettingsFieldKey:
             field_key_2
             == "--app-label-1--.--model-name-1--.--full-model-field-name-2--"
         )
+
+
+class TestSettingsGeneration:
+    @pytest.fixture(autouse=True)
+    def reset_generation(self, mocker):
+        mocker.patch("extended_search.settings.settings_generation", None)
+        mocker.patch("extended_search.settings.settings_generation_checked_at", 0.0)
+
+    def test_sync_reloads_settings_when_generation_changes(self, mocker):
+        mock_get_generation = mocker.patch(
+            "extended_search.settings.get_settings_generation", return_value=1
+        )
+        mock_reload = mocker.patch("extended_search.settings.reload_settings")
+
+        search_settings.sync_settings_generation()
+        mock_reload.assert_not_called()
+        assert search_settings.settings_generation == 1
+
+        search_settings.settings_generation_checked_at = 0.0
+        mock_get_generation.return_value = 2
+        search_settings.sync_settings_generation()
+        mock_reload.assert_called_once_with()
+        assert search_settings.settings_generation == 2
+
+    def test_sync_checks_redis_at_most_once_per_interval(self, mocker, settings):
+        settings.SEARCH_SETTINGS_GENERATION_CHECK_INTERVAL = 60
+        mock_get_generation = mocker.patch(
+            "extended_search.settings.get_settings_generation", return_value=1
+        )
+        search_settings.sync_settings_generation()
+        mock_get_generation.return_value = 2
+        search_settings.sync_settings_generation()
+        mock_get_generation.assert_called_once_with()
+        assert search_settings.settings_generation == 1
+
+    def test_reload_settings_bumps_version(self, mocker):
+        mocker.patch.object(settings_singleton, "initialise_db_dict")
+        mocker.patch("extended_search.settings.settings_version", 3)
+        search_settings.reload_settings()
+        settings_singleton.initialise_db_dict.assert_called_once_with()
+        assert search_settings.settings_version == 4
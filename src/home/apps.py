@@ -0,0 +1,20 @@
+from django.apps import AppConfig
+from django.db import transaction
+from wagtail.signals import page_published, page_unpublished
+
+
+def refresh_homepage_on_publish(sender, instance, **kwargs):
+    from content.models import ContentPage
+    from home.models import HomePage
+    from home.tasks import refresh_homepage
+
+    if isinstance(instance, (ContentPage, HomePage)):
+        transaction.on_commit(lambda: refresh_homepage.delay(include_govuk_news=False))
+
+
+class HomeConfig(AppConfig):
+    name = "home"
+
+    def ready(self):
+        page_published.connect(refresh_homepage_on_publish)
+        page_unpublished.connect(refresh_homepage_on_publish)
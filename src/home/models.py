@@ -1,13 +1,9 @@
 import re
 from collections.abc import Iterator
 
-import atoma
-import requests
 from django.conf import settings
-from django.core.cache import cache
 from django.core.exceptions import ValidationError
 from django.db import models
-from django.utils import timezone
 from modelcluster.fields import ParentalKey
 from modelcluster.models import ClusterableModel
 from wagtail.admin.panels import (
@@ -18,11 +14,12 @@ from wagtail.snippets.models import register_snippet
 from wagtail_adminsortable.models import AdminSortable
 from wagtailorderable.models import Orderable
 
-from content.models import BasePage, ContentPage
+from content.models import BasePage
 from core.models import fields
 from core.panels import FieldPanel, InlinePanel, PageSelectorPanel
 from events.models import EventPage
 from home.forms import HomePageForm
+from home.services import homepage as homepage_service
 from home.validators import validate_home_priority_pages
 from news.models import NewsPage
 
@@ -283,75 +280,24 @@ class HomePage(BasePage):
     def get_context(self, request, *args, **kwargs):
         context = super(HomePage, self).get_context(request, *args, **kwargs)
 
-        # News
-        news_items = (
-            NewsPage.objects.select_related("preview_image")
-            .live()
-            .public()
-            .annotate_with_comment_count()
-            .annotate_with_reaction_count()
-        )
-
-        priority_page_ribbon_text_mapping = {
-            pp["page_id"]: pp["ribbon_text"]
-            for pp in self.priority_pages.all().values("page_id", "ribbon_text")
-        }
-        priority_page_ids = list(priority_page_ribbon_text_mapping.keys())
-
-        # Load the priority pages, preserving the order.
-        priority_pages = [
-            p.specific
-            for p in ContentPage.objects.select_related("preview_image")
-            .filter(id__in=priority_page_ids)
-            .annotate_with_comment_count()
-            .annotate_with_reaction_count()
-            .annotate(ribbon_text=models.F("priority_page__ribbon_text"))
-            .order_by("priority_page__sort_order")
-        ]
-
-        news_items = news_items.exclude(id__in=priority_page_ids).order_by(
-            "-pinned_on_home",
-            "-first_published_at",
-        )
-
-        events = (
-            EventPage.objects.select_related("preview_image")
-            .live()
-            .public()
-            .filter(event_end__gte=timezone.now())
-            .exclude(id__in=priority_page_ids)
-            .order_by("event_start")
-        )
+        # The shared parts are precomputed, see `homepage_service`. Previews
+        # show unpublished priority pages, so they are built each time.
+        if getattr(request, "is_preview", False):
+            base = homepage_service.build_homepage_base(self)
+        else:
+            base = homepage_service.get_homepage_base(self)
 
+        priority_pages = base["priority_pages"]
         context.update(
             priority_pages=priority_pages,
-            events=events[:6],
+            events=base["events"][: homepage_service.HOMEPAGE_EVENTS_COUNT],
             pages_by_news_layout=self.pages_by_news_layout(priority_pages),
             is_empty=priority_pages == [],
-            news_items=news_items[:5],
+            news_items=base["news_items"],
+            govuk_feed=homepage_service.get_govuk_news(),
+            hide_news=settings.HIDE_NEWS,
         )
 
-        # GOVUK news
-        if not cache.get("homepage_govuk_news"):
-            govuk_news_feed_url = "https://www.gov.uk/search/news-and-communications.atom?organisations%5B%5D=department-for-international-trade&organisations%5B%5D=department-for-business-and-trade"
-
-            response = requests.get(
-                govuk_news_feed_url,
-                timeout=5,
-            )
-            feed = atoma.parse_atom_bytes(response.content)
-
-            cache.set(
-                "homepage_govuk_news",
-                feed.entries[:6],
-                3000,
-            )
-        govuk_feed = cache.get("homepage_govuk_news")
-        context["govuk_feed"] = [
-            {"url": obj.links[0].href, "text": obj.title.value} for obj in govuk_feed
-        ]
-        context["hide_news"] = settings.HIDE_NEWS
-
         return context
 
     def pages_by_news_layout(self, pages) -> Iterator[list[int]]:
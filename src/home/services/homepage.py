@@ -0,0 +1,151 @@
+"""The shared parts of the homepage, precomputed outside of requests.
+
+Everything on the homepage that is the same for every user (priority pages,
+news, events and the GOV.UK feed) is built by the `refresh_homepage` task and
+cached. The task runs periodically, to pick up comment and reaction counts and
+the GOV.UK feed, and whenever a page is published or unpublished.
+
+Requests only read the cache, so they never wait on the GOV.UK feed. If the
+base context is missing, e.g. after the cache is cleared, it is built in the
+request.
+"""
+
+import logging
+from typing import Optional
+
+import atoma
+import requests
+from django.core.cache import cache
+from django.db import models
+from django.utils import timezone
+
+from content.models import ContentPage
+from events.models import EventPage
+from news.models import NewsPage
+
+
+logger = logging.getLogger(__name__)
+
+HOMEPAGE_BASE_CACHE_TIMEOUT = 60 * 60 * 24
+HOMEPAGE_NEWS_COUNT = 5
+HOMEPAGE_EVENTS_COUNT = 6
+# Extra events are cached so that there are still enough to show once some
+# have ended, before the next refresh.
+HOMEPAGE_EVENTS_CACHE_COUNT = HOMEPAGE_EVENTS_COUNT * 2
+
+GOVUK_NEWS_CACHE_KEY = "homepage__govuk_news"
+GOVUK_NEWS_COUNT = 6
+GOVUK_NEWS_FEED_URL = "https://www.gov.uk/search/news-and-communications.atom?organisations%5B%5D=department-for-international-trade&organisations%5B%5D=department-for-business-and-trade"
+
+
+def get_homepage_base_cache_key(home_page_pk: int) -> str:
+    return f"homepage__base__{home_page_pk}"
+
+
+def build_homepage_base(home_page) -> dict:
+    """Build the parts of the homepage context that don't depend on the user."""
+    priority_page_ids = list(home_page.priority_pages.values_list("page_id", flat=True))
+
+    # Load the priority pages, preserving the order.
+    priority_pages = [
+        p.specific
+        for p in ContentPage.objects.select_related("preview_image")
+        .filter(id__in=priority_page_ids)
+        .annotate_with_comment_count()
+        .annotate_with_reaction_count()
+        .annotate(ribbon_text=models.F("priority_page__ribbon_text"))
+        .order_by("priority_page__sort_order")
+    ]
+
+    news_items = (
+        NewsPage.objects.select_related("preview_image")
+        .live()
+        .public()
+        .annotate_with_comment_count()
+        .annotate_with_reaction_count()
+        .exclude(id__in=priority_page_ids)
+        .order_by(
+            "-pinned_on_home",
+            "-first_published_at",
+        )
+    )
+
+    events = (
+        EventPage.objects.select_related("preview_image")
+        .live()
+        .public()
+        .filter(event_end__gte=timezone.now())
+        .exclude(id__in=priority_page_ids)
+        .order_by("event_start")
+    )
+
+    return {
+        "priority_pages": priority_pages,
+        "news_items": list(news_items[:HOMEPAGE_NEWS_COUNT]),
+        "events": list(events[:HOMEPAGE_EVENTS_CACHE_COUNT]),
+    }
+
+
+def refresh_homepage_base(home_page) -> dict:
+    base = build_homepage_base(home_page)
+    cache.set(
+        get_homepage_base_cache_key(home_page.pk),
+        base,
+        timeout=HOMEPAGE_BASE_CACHE_TIMEOUT,
+    )
+    return base
+
+
+def get_homepage_base(home_page) -> dict:
+    base = cache.get(get_homepage_base_cache_key(home_page.pk))
+    if base is None:
+        base = refresh_homepage_base(home_page)
+
+    # Drop any events that have ended since the base was built.
+    now = timezone.now()
+    return {
+        **base,
+        "events": [e for e in base["events"] if e.event_end >= now][
+            :HOMEPAGE_EVENTS_COUNT
+        ],
+    }
+
+
+def fetch_govuk_news() -> list[dict[str, str]]:
+    response = requests.get(GOVUK_NEWS_FEED_URL, timeout=5)
+    response.raise_for_status()
+    feed = atoma.parse_atom_bytes(response.content)
+
+    return [
+        {"url": entry.links[0].href, "text": entry.title.value}
+        for entry in feed.entries[:GOVUK_NEWS_COUNT]
+    ]
+
+
+def refresh_govuk_news() -> Optional[list[dict[str, str]]]:
+    """Fetch and cache the GOV.UK news feed.
+
+    The last good feed is kept if it can't be fetched.
+    """
+    try:
+        govuk_news = fetch_govuk_news()
+    except (requests.RequestException, atoma.FeedParseError):
+        logger.exception("Failed to fetch the GOV.UK news feed")
+        return None
+
+    cache.set(GOVUK_NEWS_CACHE_KEY, govuk_news, timeout=None)
+    return govuk_news
+
+
+def get_govuk_news() -> list[dict[str, str]]:
+    return cache.get(GOVUK_NEWS_CACHE_KEY, [])
+
+
+def refresh_homepage(*, include_govuk_news: bool = True) -> None:
+    from home.models import HomePage
+
+    for home_page in HomePage.objects.live():
+        refresh_homepage_base(home_page)
+
+    if include_govuk_news:
+        refresh_govuk_news()
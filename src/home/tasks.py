@@ -0,0 +1,8 @@
+from config.celery import celery_app
+
+
+@celery_app.task(bind=True)
+def refresh_homepage(self, include_govuk_news=True):
+    from home.services import homepage as homepage_service
+
+    homepage_service.refresh_homepage(include_govuk_news=include_govuk_news)
@@ -0,0 +1,32 @@
+import pytest
+import requests
+from django.core.cache import cache
+
+from home.models import HomePage
+from home.services import homepage as homepage_service
+
+
+pytestmark = pytest.mark.django_db
+
+
+def test_get_homepage_base_is_cached(django_assert_num_queries):
+    home_page = HomePage.objects.first()
+    cache.delete(homepage_service.get_homepage_base_cache_key(home_page.pk))
+
+    base = homepage_service.get_homepage_base(home_page)
+
+    with django_assert_num_queries(0):
+        assert homepage_service.get_homepage_base(home_page) == base
+
+
+def test_refresh_govuk_news_keeps_the_last_feed(mocker):
+    govuk_news = [{"url": "--placeholder--", "text": "--placeholder--"}]
+    cache.set(homepage_service.GOVUK_NEWS_CACHE_KEY, govuk_news)
+
+    mocker.patch(
+        "home.services.homepage.requests.get", side_effect=requests.ConnectionError
+    )
+
+    assert homepage_service.refresh_govuk_news() is None
+
+    assert homepage_service.get_govuk_news() == govuk_news
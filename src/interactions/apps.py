@@ -1,6 +1,36 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save
+from wagtail.signals import page_published, page_unpublished
+
+
+def fan_out_published_page(sender, instance, **kwargs):
+    from content.models import ContentPage
+    from interactions.services.feed import fan_out_page
+
+    if isinstance(instance, ContentPage):
+        fan_out_page(page=instance)
+
+
+def remove_unpublished_page(sender, instance, **kwargs):
+    from interactions.services.feed import remove_page
+
+    remove_page(page=instance)
+
+
+def invalidate_bookmark_fragments(sender, instance, **kwargs):
+    from core.services import fragment_cache
+
+    fragment_cache.invalidate(fragment_cache.get_bookmarks_dependency(instance.user_id))
 
 
 class InteractionsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "interactions"
+
+    def ready(self):
+        page_published.connect(fan_out_published_page)
+        page_unpublished.connect(remove_unpublished_page)
+        post_save.connect(invalidate_bookmark_fragments, sender="interactions.Bookmark")
+        post_delete.connect(
+            invalidate_bookmark_fragments, sender="interactions.Bookmark"
+        )
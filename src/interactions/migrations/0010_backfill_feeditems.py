@@ -0,0 +1,72 @@
+from django.db import migrations
+from django.db.models import Q
+
+
+# The number of pages shown on a personal feed, see `interactions.services.feed`
+FEED_LENGTH = 50
+
+
+def backfill_feeds(apps, schema_editor):
+    ContentPage = apps.get_model("content", "ContentPage")
+    TaggedPage = apps.get_model("core", "TaggedPage")
+    FeedItem = apps.get_model("interactions", "FeedItem")
+    TagSubscription = apps.get_model("interactions", "TagSubscription")
+    TeamSubscription = apps.get_model("interactions", "TeamSubscription")
+    NetworkSubscription = apps.get_model("interactions", "NetworkSubscription")
+    PersonSubscription = apps.get_model("interactions", "PersonSubscription")
+
+    user_ids = set()
+    for subscription_model in (
+        TagSubscription,
+        TeamSubscription,
+        NetworkSubscription,
+        PersonSubscription,
+    ):
+        user_ids.update(subscription_model.objects.values_list("user_id", flat=True))
+
+    for user_id in user_ids:
+        people = PersonSubscription.objects.filter(user_id=user_id).values("person")
+        pages = (
+            ContentPage.objects.filter(live=True, last_published_at__isnull=False)
+            .filter(
+                Q(
+                    pk__in=TaggedPage.objects.filter(
+                        tag__in=TagSubscription.objects.filter(user_id=user_id).values(
+                            "tag"
+                        )
+                    ).values("content_object")
+                )
+                | Q(
+                    on_behalf_of_team__in=TeamSubscription.objects.filter(
+                        user_id=user_id
+                    ).values("team")
+                )
+                | Q(
+                    on_behalf_of_network__in=NetworkSubscription.objects.filter(
+                        user_id=user_id
+                    ).values("network")
+                )
+                | Q(page_author__in=people)
+                | Q(on_behalf_of_person__in=people)
+            )
+            .order_by("-last_published_at")
+            .values_list("pk", "last_published_at")[:FEED_LENGTH]
+        )
+        FeedItem.objects.bulk_create(
+            [
+                FeedItem(user_id=user_id, page_id=page_id, published_at=published_at)
+                for page_id, published_at in pages
+            ],
+            ignore_conflicts=True,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("content", "0061_sectionpage_delete_sectorpage"),
+        ("core", "0010_campaign_alter_taggedpage_tag_taggedperson_and_more"),
+        ("interactions", "0009_feeditem"),
+    ]
+
+    operations = [migrations.RunPython(backfill_feeds, migrations.RunPython.noop)]
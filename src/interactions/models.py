@@ -166,3 +166,16 @@ class NetworkSubscription(UserNetwork):
 
 class PersonSubscription(UserPerson):
     pass
+
+
+class FeedItem(UserPage):
+    """A page on a user's personal feed, written when the page is published."""
+
+    class Meta(UserPage.Meta):
+        indexes = [
+            models.Index(
+                fields=["user", "-published_at"], name="feeditem_user_published_idx"
+            )
+        ]
+
+    published_at = models.DateTimeField()
@@ -0,0 +1,175 @@
+from collections import defaultdict
+from datetime import date
+
+from django.db import transaction
+from django.db.models import F, Q, QuerySet, Window
+from django.db.models.functions import RowNumber
+from wagtail.models import Page
+
+from content.models import ContentPage
+from core.models.tags import TaggedPage
+from interactions.models import (
+    FeedItem,
+    NetworkSubscription,
+    PersonSubscription,
+    TagSubscription,
+    TeamSubscription,
+)
+from user.models import User
+
+
+# The number of pages shown on a personal feed
+FEED_LENGTH = 50
+
+
+def get_subscriber_ids(*, page: ContentPage) -> set[int]:
+    """Return the ids of the users subscribed to anything the page is about."""
+    subscribers = (
+        TagSubscription.objects.filter(
+            tag__in=TaggedPage.objects.filter(content_object=page).values("tag")
+        )
+        .order_by()
+        .values_list("user_id", flat=True)
+    )
+
+    if page.on_behalf_of_team_id:
+        subscribers = subscribers.union(
+            TeamSubscription.objects.filter(team_id=page.on_behalf_of_team_id)
+            .order_by()
+            .values_list("user_id", flat=True)
+        )
+    if page.on_behalf_of_network_id:
+        subscribers = subscribers.union(
+            NetworkSubscription.objects.filter(network_id=page.on_behalf_of_network_id)
+            .order_by()
+            .values_list("user_id", flat=True)
+        )
+    if person_ids := {page.page_author_id, page.on_behalf_of_person_id} - {None}:
+        subscribers = subscribers.union(
+            PersonSubscription.objects.filter(person_id__in=person_ids)
+            .order_by()
+            .values_list("user_id", flat=True)
+        )
+
+    return set(subscribers)
+
+
+def fan_out_page(*, page: ContentPage) -> None:
+    """Add a published page to the feed of each of its subscribers.
+
+    Subscribers who no longer match the page, e.g. because a tag was removed,
+    have it taken off their feed.
+    """
+    subscriber_ids = get_subscriber_ids(page=page)
+
+    with transaction.atomic():
+        FeedItem.objects.filter(page=page).exclude(user_id__in=subscriber_ids).delete()
+        FeedItem.objects.bulk_create(
+            [
+                FeedItem(
+                    user_id=user_id, page=page, published_at=page.last_published_at
+                )
+                for user_id in subscriber_ids
+            ],
+            update_conflicts=True,
+            unique_fields=["user", "page"],
+            update_fields=["published_at", "updated_at"],
+        )
+        prune_feeds(user_ids=subscriber_ids)
+
+
+def prune_feeds(*, user_ids: set[int]) -> None:
+    """Remove everything but the latest `FEED_LENGTH` pages from the feeds."""
+    if not user_ids:
+        return
+
+    pruned_ids = list(
+        FeedItem.objects.filter(user_id__in=user_ids)
+        .annotate(
+            position=Window(
+                RowNumber(),
+                partition_by=F("user_id"),
+                order_by=F("published_at").desc(),
+            )
+        )
+        .filter(position__gt=FEED_LENGTH)
+        .values_list("pk", flat=True)
+    )
+    if pruned_ids:
+        FeedItem.objects.filter(pk__in=pruned_ids).delete()
+
+
+def remove_page(*, page: Page) -> None:
+    FeedItem.objects.filter(page=page).delete()
+
+
+def get_subscribed_pages(*, user: User) -> QuerySet[ContentPage]:
+    """Return the live pages about anything the user is subscribed to."""
+    return ContentPage.objects.live().filter(
+        Q(
+            pk__in=TaggedPage.objects.filter(
+                tag__in=TagSubscription.objects.filter(user=user).values("tag")
+            ).values("content_object")
+        )
+        | Q(
+            on_behalf_of_team__in=TeamSubscription.objects.filter(user=user).values(
+                "team"
+            )
+        )
+        | Q(
+            on_behalf_of_network__in=NetworkSubscription.objects.filter(
+                user=user
+            ).values("network")
+        )
+        | Q(
+            page_author__in=PersonSubscription.objects.filter(user=user).values(
+                "person"
+            )
+        )
+        | Q(
+            on_behalf_of_person__in=PersonSubscription.objects.filter(user=user).values(
+                "person"
+            )
+        )
+    )
+
+
+def rebuild_feed(*, user: User) -> None:
+    """Rebuild a user's feed from their subscriptions.
+
+    Call this when the user's subscriptions change, as fan out only happens
+    when a page is published.
+    """
+    pages = list(
+        get_subscribed_pages(user=user)
+        .filter(last_published_at__isnull=False)
+        .order_by("-last_published_at")
+        .values_list("pk", "last_published_at")[:FEED_LENGTH]
+    )
+
+    with transaction.atomic():
+        FeedItem.objects.filter(user=user).delete()
+        FeedItem.objects.bulk_create(
+            [
+                FeedItem(user=user, page_id=page_id, published_at=published_at)
+                for page_id, published_at in pages
+            ]
+        )
+
+
+def get_feed(*, user: User) -> dict[date, list[ContentPage]]:
+    """Return the latest pages on the user's feed, grouped by publish date."""
+    pages = (
+        ContentPage.objects.live()
+        .filter(interactions_feeditems__user=user)
+        .annotate(feed_published_at=F("interactions_feeditems__published_at"))
+        .annotate_with_comment_count()
+        .annotate_with_reaction_count()
+        .order_by("-feed_published_at")
+        .specific()[:FEED_LENGTH]
+    )
+
+    grouped_content: dict[date, list[ContentPage]] = defaultdict(list)
+    for page in pages:
+        grouped_content[page.feed_published_at.date()].append(page)
+    return dict(grouped_content)
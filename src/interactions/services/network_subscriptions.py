@@ -1,6 +1,7 @@
 from django.db.models.query import QuerySet
 
 from interactions.models import NetworkSubscription
+from interactions.services.feed import rebuild_feed
 from networks.models import Network
 from user.models import User
 
@@ -9,11 +10,13 @@ def subscribe(*, network: Network, user: User) -> NetworkSubscription:
     network_subscription, _ = NetworkSubscription.objects.get_or_create(
         user=user, network=network
     )
+    rebuild_feed(user=user)
     return network_subscription
 
 
 def unsubscribe(*, network: Network, user: User) -> None:
     NetworkSubscription.objects.filter(user=user, network=network).delete()
+    rebuild_feed(user=user)
 
 
 def is_subscribed(*, network: Network, user: User) -> bool:
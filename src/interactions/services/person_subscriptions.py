@@ -1,6 +1,7 @@
 from django.db.models.query import QuerySet
 
 from interactions.models import PersonSubscription
+from interactions.services.feed import rebuild_feed
 from peoplefinder.models import Person
 from user.models import User
 
@@ -9,11 +10,13 @@ def subscribe(*, person: Person, user: User) -> PersonSubscription:
     team_subscription, _ = PersonSubscription.objects.get_or_create(
         user=user, person=person
     )
+    rebuild_feed(user=user)
     return team_subscription
 
 
 def unsubscribe(*, person: Person, user: User) -> None:
     PersonSubscription.objects.filter(user=user, person=person).delete()
+    rebuild_feed(user=user)
 
 
 def is_subscribed(*, person: Person, user: User) -> bool:
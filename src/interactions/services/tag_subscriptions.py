@@ -2,16 +2,19 @@ from django.db.models.query import QuerySet
 
 from core.models.tags import Tag
 from interactions.models import TagSubscription
+from interactions.services.feed import rebuild_feed
 from user.models import User
 
 
 def subscribe(*, tag: Tag, user: User) -> TagSubscription:
     tag_subscription, _ = TagSubscription.objects.get_or_create(user=user, tag=tag)
+    rebuild_feed(user=user)
     return tag_subscription
 
 
 def unsubscribe(*, tag: Tag, user: User) -> None:
     TagSubscription.objects.filter(user=user, tag=tag).delete()
+    rebuild_feed(user=user)
 
 
 def is_subscribed(*, tag: Tag, user: User) -> bool:
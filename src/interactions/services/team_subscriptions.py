@@ -1,17 +1,20 @@
 from django.db.models.query import QuerySet
 
 from interactions.models import TeamSubscription
+from interactions.services.feed import rebuild_feed
 from peoplefinder.models import Team
 from user.models import User
 
 
 def subscribe(*, team: Team, user: User) -> TeamSubscription:
     team_subscription, _ = TeamSubscription.objects.get_or_create(user=user, team=team)
+    rebuild_feed(user=user)
     return team_subscription
 
 
 def unsubscribe(*, team: Team, user: User) -> None:
     TeamSubscription.objects.filter(user=user, team=team).delete()
+    rebuild_feed(user=user)
 
 
 def is_subscribed(*, team: Team, user: User) -> bool:
@@ -0,0 +1,74 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+from wagtail.models import Page
+
+from core.factories import TagFactory
+from core.models.tags import TaggedPage
+from interactions.models import FeedItem
+from interactions.services import feed, tag_subscriptions, team_subscriptions
+from peoplefinder.models import Team
+
+
+@pytest.fixture
+def tagged_news_page(news_page):
+    tag = TagFactory()
+    TaggedPage.objects.create(tag=tag, content_object=news_page)
+    return tag, news_page
+
+
+@pytest.mark.django_db
+def test_publish_fans_out_to_subscribers(user, tagged_news_page):
+    tag, news_page = tagged_news_page
+    tag_subscriptions.subscribe(tag=tag, user=user)
+
+    news_page.save_revision().publish()
+
+    assert FeedItem.objects.filter(user=user, page=news_page).exists()
+    grouped_content = feed.get_feed(user=user)
+    pages = [page for pages in grouped_content.values() for page in pages]
+    assert pages == [news_page]
+    assert list(grouped_content) == [news_page.last_published_at.date()]
+
+
+@pytest.mark.django_db
+def test_subscribe_rebuilds_feed(user, news_page):
+    team = Team.objects.create(name="--placeholder--", slug="placeholder")
+    news_page.on_behalf_of_team = team
+    news_page.save_revision().publish()
+    assert not FeedItem.objects.filter(user=user).exists()
+
+    team_subscriptions.subscribe(team=team, user=user)
+    assert FeedItem.objects.filter(user=user, page=news_page).exists()
+
+    team_subscriptions.unsubscribe(team=team, user=user)
+    assert not FeedItem.objects.filter(user=user).exists()
+
+
+@pytest.mark.django_db
+def test_unpublish_removes_page(user, tagged_news_page):
+    tag, news_page = tagged_news_page
+    tag_subscriptions.subscribe(tag=tag, user=user)
+    news_page.save_revision().publish()
+
+    news_page.unpublish()
+
+    assert not FeedItem.objects.filter(page=news_page).exists()
+    assert feed.get_feed(user=user) == {}
+
+
+@pytest.mark.django_db
+def test_prune_feeds(user, news_page, monkeypatch):
+    monkeypatch.setattr(feed, "FEED_LENGTH", 1)
+    now = timezone.now()
+    FeedItem.objects.create(
+        user=user, page=Page.objects.get(depth=1), published_at=now - timedelta(1)
+    )
+    FeedItem.objects.create(user=user, page=news_page, published_at=now)
+
+    feed.prune_feeds(user_ids={user.pk})
+
+    assert list(FeedItem.objects.filter(user=user).values_list("page", flat=True)) == [
+        news_page.pk
+    ]
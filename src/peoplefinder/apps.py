@@ -1,5 +1,30 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save
+
+
+def clear_team_hierarchy_cache(sender, **kwargs):
+    from peoplefinder.services.team_hierarchy import (
+        clear_team_hierarchy_cache as _clear_team_hierarchy_cache,
+    )
+
+    _clear_team_hierarchy_cache()
+
+
+def clear_request_profile_cache(sender, instance, **kwargs):
+    from peoplefinder.services.person import (
+        clear_request_profile_cache as _clear_request_profile_cache,
+    )
+
+    _clear_request_profile_cache(instance.user_id)
 
 
 class PeoplefinderConfig(AppConfig):
     name = "peoplefinder"
+
+    def ready(self):
+        # Deleting a team cascades to its `TeamTree` rows.
+        post_delete.connect(clear_team_hierarchy_cache, sender="peoplefinder.Team")
+        # The cached ancestry holds team slugs and names.
+        post_save.connect(clear_team_hierarchy_cache, sender="peoplefinder.Team")
+        post_save.connect(clear_request_profile_cache, sender="peoplefinder.Person")
+        post_delete.connect(clear_request_profile_cache, sender="peoplefinder.Person")
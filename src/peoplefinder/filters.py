@@ -15,20 +15,26 @@ from peoplefinder.services.reference import (
 )
 
 
+# `keyset_ordering` is the same ordering in terms of concrete fields, for use
+# with the `KeysetPaginator`.
 ORDER_CHOICES = {
     "grade": {
         "label": "Grade",
         "ordering": ("grade", "last_name", "first_name"),
+        "keyset_ordering": ("grade__ordering", "last_name", "first_name"),
     },
     "first_name": {
         "label": "First name",
         "ordering": ("first_name", "last_name"),
+        "keyset_ordering": ("first_name", "last_name"),
     },
     "last_name": {
         "label": "Last name",
         "ordering": ("last_name", "first_name"),
+        "keyset_ordering": ("last_name", "first_name"),
     },
 }
+DEFAULT_ORDER_CHOICE = "grade"
 
 
 class DiscoverFilters(FilterSet):
@@ -1,6 +1,6 @@
 from django.core.management.base import BaseCommand
 
-from peoplefinder.services.person import PersonService
+from peoplefinder.services.person import PersonService, defer_profile_completion
 from user.models import User
 
 
@@ -13,10 +13,11 @@ class Command(BaseCommand):
         person_service = PersonService()
         users_without_profile = User.objects.filter(profile=None)
 
-        for user in users_without_profile:
-            profile = person_service.create_user_profile(user)
-            self.stdout.write(f"Profile created for {profile.full_name}")
-            self.created += 1
+        with defer_profile_completion():
+            for user in users_without_profile:
+                profile = person_service.create_user_profile(user)
+                self.stdout.write(f"Profile created for {profile.full_name}")
+                self.created += 1
 
         self.stdout.write(
             self.style.SUCCESS(
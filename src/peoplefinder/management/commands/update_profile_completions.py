@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from peoplefinder.services.person import PROFILE_COMPLETION_BATCH_SIZE, PersonService
+
+
+class Command(BaseCommand):
+    help = "Recalculate the profile completion of every person, in batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=PROFILE_COMPLETION_BATCH_SIZE,
+            help="The number of people to score at a time",
+        )
+
+    def handle(self, *args, **options):
+        updated = PersonService().update_profile_completions(
+            batch_size=options["batch_size"]
+        )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Job completed successfully\n{updated} profile completions updated"
+            )
+        )
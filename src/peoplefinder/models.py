@@ -10,8 +10,8 @@ from django.contrib.contenttypes.models import ContentType
 from django.contrib.postgres.aggregates import ArrayAgg, StringAgg
 from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
-from django.db.models import Case, F, Func, JSONField, Q, Value, When
-from django.db.models.functions import Concat
+from django.db.models import Case, F, Q, Value, When
+from django.db.models.functions import Coalesce, Concat
 from django.template.loader import render_to_string
 from django.urls import reverse
 from django.utils import timezone
@@ -297,6 +297,39 @@ class PersonQuerySet(SearchableQuerySetMixin, models.QuerySet):
             ),
         )
 
+    def with_search_projection(self):
+        """Annotate the values behind the `Person.search_*` properties.
+
+        This lets a batch of people be indexed with one query, rather than a
+        few queries per person.
+        """
+        return self.select_related("grade", "uk_office_location").annotate(
+            projected_team_names=ArrayAgg(
+                Coalesce("roles__team__name", Value("")),
+                filter=Q(roles__isnull=False),
+                distinct=True,
+                default=Value([]),
+            ),
+            projected_team_abbreviations=ArrayAgg(
+                Coalesce("roles__team__abbreviation", Value("")),
+                filter=Q(roles__isnull=False),
+                distinct=True,
+                default=Value([]),
+            ),
+            projected_job_titles=ArrayAgg(
+                "roles__job_title",
+                filter=Q(roles__isnull=False),
+                distinct=True,
+                default=Value([]),
+            ),
+            projected_buildings=ArrayAgg(
+                "buildings__name",
+                filter=Q(buildings__isnull=False),
+                distinct=True,
+                default=Value([]),
+            ),
+        )
+
 
 def person_photo_path(instance, filename):
     return f"peoplefinder/person/{instance.slug}/photo/{filename}"
@@ -874,10 +907,14 @@ class Person(ClusterableModel, Indexed, models.Model):
         """
         Indexable string of team names and abbreviations
         """
-        teams = self.roles.all()
-        names = teams.values_list("team__name", flat=True)
+        if hasattr(self, "projected_team_names"):
+            names = self.projected_team_names
+            abbrs = self.projected_team_abbreviations
+        else:
+            teams = self.roles.all()
+            names = teams.values_list("team__name", flat=True)
+            abbrs = teams.values_list("team__abbreviation", flat=True)
         names_str = " ".join(list([n or "" for n in names]))
-        abbrs = teams.values_list("team__abbreviation", flat=True)
         abbrs_str = " ".join(list([a or "" for a in abbrs]))
         return f"{names_str} {abbrs_str}"
 
@@ -886,11 +923,16 @@ class Person(ClusterableModel, Indexed, models.Model):
         """
         Indexable string of job titles
         """
-        job_titles = self.roles.all().values_list("job_title", flat=True)
+        if hasattr(self, "projected_job_titles"):
+            job_titles = self.projected_job_titles
+        else:
+            job_titles = self.roles.all().values_list("job_title", flat=True)
         return " ".join(job_titles)
 
     @property
     def search_buildings(self):
+        if hasattr(self, "projected_buildings"):
+            return ", ".join(self.projected_buildings)
         return ", ".join(self.buildings.all().values_list("name", flat=True))
 
     @property
@@ -905,11 +947,31 @@ class Person(ClusterableModel, Indexed, models.Model):
     def search_grade(self):
         return self.get_grade_display()
 
+    @classmethod
+    def get_indexed_objects(cls):
+        # Compute the `search_*` values for each batch in bulk.
+        return super().get_indexed_objects().with_search_projection()
+
     def save(self, *args, **kwargs):
-        from peoplefinder.services.person import PersonService
+        from peoplefinder.services.person import (
+            PersonService,
+            get_deferred_profile_completion_pks,
+        )
+
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "profile_completion" not in update_fields:
+            return super().save(*args, **kwargs)
+
+        deferred_pks = get_deferred_profile_completion_pks()
+        if deferred_pks is None:
+            self.profile_completion = PersonService().get_profile_completion(
+                person=self
+            )
+            return super().save(*args, **kwargs)
 
-        self.profile_completion = PersonService().get_profile_completion(person=self)
-        return super().save(*args, **kwargs)
+        # Recalculated in bulk at the end of `defer_profile_completion`.
+        super().save(*args, **kwargs)
+        deferred_pks.add(self.pk)
 
     def get_first_name_display(self) -> str:
         if self.preferred_first_name:
@@ -1034,30 +1096,6 @@ class Person(ClusterableModel, Indexed, models.Model):
 
 
 class TeamQuerySet(SearchableQuerySetMixin, models.QuerySet):
-    def with_all_parents(self):
-        return self.annotate(
-            all_parents=ArrayAgg(
-                Func(
-                    Value("slug"),
-                    "children__parent__slug",
-                    Value("short_name"),
-                    # Replicate `Team.short_name` behaviour.
-                    Case(
-                        When(
-                            children__parent__abbreviation__isnull=False,
-                            then=F("children__parent__abbreviation"),
-                        ),
-                        default=F("children__parent__name"),
-                    ),
-                    function="jsonb_build_object",
-                    output_field=JSONField(),
-                ),
-                # Filter out the last team (deepest).
-                filter=~Q(children__parent=F("pk")),
-                ordering="-children__depth",
-            ),
-        )
-
     def with_parents(self, parent_field: str = "pk"):
         """Annotate the queryset with an array of parent values.
 
@@ -1172,6 +1210,13 @@ class Team(ClusterableModel, Indexed, models.Model):
     def get_absolute_url(self) -> str:
         return reverse("team-view", kwargs={"slug": self.slug})
 
+    @property
+    def all_parents(self) -> list[dict[str, str]]:
+        """Return the slug and short name of the team's ancestors, root first."""
+        from peoplefinder.services.team_hierarchy import get_team_ancestry
+
+        return get_team_ancestry(self.pk)
+
     @property
     def short_name(self) -> str:
         """Return a short name for the team.
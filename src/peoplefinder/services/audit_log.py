@@ -1,9 +1,11 @@
 from abc import ABC, abstractmethod
-from typing import Literal, Optional, Type, TypedDict, Union
+from datetime import timedelta
+from typing import Iterable, Literal, Optional, Type, TypedDict, Union
 
 from django.contrib.contenttypes.models import ContentType
 from django.db import models
 from django.db.models.query import QuerySet
+from django.utils import timezone
 
 from peoplefinder.models import AuditLog
 from user.models import User
@@ -14,6 +16,9 @@ ObjectReprKey = str
 ObjectReprValue = Union[None, bool, str, int, float, list]
 ObjectRepr = dict[ObjectReprKey, ObjectReprValue]
 
+# How old an audit log must be before it is included in the change feed.
+CHANGE_FEED_SETTLE_SECONDS = 5
+
 # It's best to never change these values. If you do ever change them, then all previous
 # audit log diffs will need to be updated.
 DiffAction = Literal["add", "change", "remove"]
@@ -117,6 +122,41 @@ class AuditLogService:
             diff=diff,
         )
 
+    @staticmethod
+    def get_changes(
+        *, after: int, limit: int, model_classes: Iterable[Type[models.Model]]
+    ) -> list[AuditLog]:
+        """Return the audit logs of the given models recorded after a watermark.
+
+        The watermark is the id of the last audit log the consumer has seen, ids
+        only increase so the next call can pass the id of the last log returned.
+
+        Logs from the last few seconds are held back, as ids are assigned before
+        the transaction that creates them commits. Holding them back stops a
+        consumer from moving past a log that commits out of order.
+
+        Args:
+            after: The watermark, 0 to start from the beginning.
+            limit: The maximum number of logs to return.
+            model_classes: The models to return changes for.
+
+        Returns:
+            The audit logs, oldest first.
+        """
+        settled_before = timezone.now() - timedelta(seconds=CHANGE_FEED_SETTLE_SECONDS)
+
+        return list(
+            AuditLog.objects.filter(
+                pk__gt=after,
+                timestamp__lt=settled_before,
+                content_type__in=list(
+                    ContentType.objects.get_for_models(*model_classes).values()
+                ),
+            )
+            .select_related("content_type", "actor")
+            .order_by("pk")[:limit]
+        )
+
     @staticmethod
     def get_audit_log(instance: models.Model) -> QuerySet:
         return AuditLog.objects.filter(
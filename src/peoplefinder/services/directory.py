@@ -1,7 +1,12 @@
+import hashlib
+import json
+
 from django.conf import settings
-from django.db.models import QuerySet
+from django.core.cache import cache
+from django.db.models import Count, QuerySet
 
-from peoplefinder.filters import DiscoverFilters
+from core.pagination import KeysetPage, KeysetPaginator
+from peoplefinder.filters import DEFAULT_ORDER_CHOICE, ORDER_CHOICES, DiscoverFilters
 from peoplefinder.models import Person
 from user.models import User
 
@@ -41,3 +46,125 @@ def get_people_with_filters(
 ) -> DiscoverFilters:
 
     return DiscoverFilters(data=filter_options, queryset=get_people(user=user))
+
+
+def get_keyset_page(
+    *, discover_filters: DiscoverFilters, cursor: str | None, per_page: int
+) -> KeysetPage:
+    """
+    Returns a page of the filtered people, ordered by the selected `sort_by`
+    option and paginated with a keyset cursor rather than an offset
+    """
+    sort_by = discover_filters.form.data.get("sort_by")
+    order_choice = ORDER_CHOICES.get(sort_by, ORDER_CHOICES[DEFAULT_ORDER_CHOICE])
+
+    paginator = KeysetPaginator(
+        discover_filters.qs,
+        ordering=order_choice["keyset_ordering"],
+        per_page=per_page,
+    )
+    return paginator.page(cursor)
+
+
+# Filter name -> the field the matching people are grouped by
+FACETS = {
+    "city": "uk_office_location__city",
+    "grade": "grade__name",
+    "professions": "professions__name",
+    "key_skills": "key_skills__name",
+    # People are counted for their teams and every parent team
+    "teams": "roles__team__children__parent_id",
+}
+FACET_COUNTS_CACHE_TIMEOUT = 60 * 5
+# Query parameters that don't change which people match
+NON_FILTER_OPTIONS = ["page", "after", "sort_by"]
+
+
+def get_filter_options_hash(*, filter_options: dict, user: User) -> str:
+    """Return a hash of the filters, the same for any that match the same people."""
+    try:
+        options = dict(filter_options.lists())
+    except AttributeError:
+        options = {key: [value] for key, value in filter_options.items()}
+
+    options = {
+        key: sorted(values)
+        for key, values in options.items()
+        if key not in NON_FILTER_OPTIONS and values not in [[], [""]]
+    }
+    # The inactive profiles a user can see depends on their permissions
+    options["_can_view_inactive"] = user.has_perm(
+        "peoplefinder.can_view_inactive_profiles"
+    )
+
+    return hashlib.md5(
+        json.dumps(options, sort_keys=True).encode(), usedforsecurity=False
+    ).hexdigest()
+
+
+def get_facet_counts_cache_key(*, filter_options: dict, user: User) -> str:
+    options_hash = get_filter_options_hash(filter_options=filter_options, user=user)
+    return f"discover__facet_counts__{options_hash}"
+
+
+def get_people_count_cache_key(*, filter_options: dict, user: User) -> str:
+    options_hash = get_filter_options_hash(filter_options=filter_options, user=user)
+    return f"discover__people_count__{options_hash}"
+
+
+def get_people_count(
+    *, filter_options: dict, user: User, discover_filters: DiscoverFilters | None = None
+) -> int:
+    """
+    Returns how many people match the given filters, cached per filter
+    combination for a few minutes like the facet counts.
+    """
+    cache_key = get_people_count_cache_key(filter_options=filter_options, user=user)
+    if (people_count := cache.get(cache_key)) is not None:
+        return people_count
+
+    if discover_filters is None:
+        discover_filters = get_people_with_filters(
+            filter_options=filter_options, user=user
+        )
+    people_count = discover_filters.qs.count()
+
+    cache.set(cache_key, people_count, FACET_COUNTS_CACHE_TIMEOUT)
+    return people_count
+
+
+def get_facet_counts(*, filter_options: dict, user: User) -> dict:
+    """
+    Returns how many of the people matching the given filters match each
+    option of the city, grade, profession, key skill and team filters, with
+    one grouped query per facet.
+
+    The counts are cached per filter combination for a few minutes.
+
+    Returns:
+        {"total": int, "facets": {filter name: {option value: count}}}
+    """
+    cache_key = get_facet_counts_cache_key(filter_options=filter_options, user=user)
+    if facet_counts := cache.get(cache_key):
+        return facet_counts
+
+    discover_filters = get_people_with_filters(filter_options=filter_options, user=user)
+    people = Person.objects.filter(pk__in=discover_filters.qs.order_by().values("pk"))
+
+    facet_counts = {
+        "total": people.count(),
+        "facets": {
+            facet: {
+                # Match the "null" option value of the filters
+                ("null" if value is None else str(value)): count
+                for value, count in people.order_by()
+                .values(field)
+                .annotate(count=Count("pk", distinct=True))
+                .values_list(field, "count")
+            }
+            for facet, field in FACETS.items()
+        },
+    }
+
+    cache.set(cache_key, facet_counts, FACET_COUNTS_CACHE_TIMEOUT)
+    return facet_counts
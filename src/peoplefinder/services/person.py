@@ -1,13 +1,28 @@
 import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
 from datetime import timedelta
-from typing import Any, Dict, List, Optional, Tuple, TypedDict
+from typing import Any, Dict, Iterator, List, Optional, Tuple, TypedDict
 from urllib.parse import urlparse, urlunparse
 
 import requests
 from django.conf import settings
 from django.contrib.auth.models import Group
 from django.contrib.postgres.aggregates import ArrayAgg
-from django.db.models import Case, F, Q, Value, When
+from django.core.cache import cache
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+from django.db.models import (
+    Case,
+    Exists,
+    ExpressionWrapper,
+    F,
+    OuterRef,
+    Q,
+    Value,
+    When,
+)
 from django.db.models.functions import Concat
 from django.db.models.query import QuerySet
 from django.http import HttpRequest
@@ -15,26 +30,41 @@ from django.shortcuts import reverse
 from django.utils import timezone
 from django.utils.html import escape, strip_tags
 from django.utils.safestring import mark_safe
+from notifications_python_client.errors import APIError
 from notifications_python_client.notifications import NotificationsAPIClient
 
 from peoplefinder.management.commands.create_people_finder_groups import (
     PERSON_ADMIN_GROUP_NAME,
     TEAM_ADMIN_GROUP_NAME,
 )
-from peoplefinder.models import AuditLog, Person
+from peoplefinder.models import AuditLog, Person, TeamMember
 from peoplefinder.services.audit_log import (
     AuditLogSerializer,
     AuditLogService,
     ObjectRepr,
 )
+from peoplefinder.services.profile_change_notifications import (
+    PROFILE_CHANGE_NOTIFICATION_DELAY,
+    acknowledge_profile_changes,
+    get_due_profile_changes,
+    merge_personalisations,
+    queue_profile_change,
+)
 from peoplefinder.services.team import TeamService
-from peoplefinder.tasks import notify_user_about_profile_changes
 from peoplefinder.types import EditSections, ProfileSections
 from user.models import User
 
 
 logger = logging.getLogger(__name__)
 
+# The number of people scored at a time when recalculating profile completion.
+PROFILE_COMPLETION_BATCH_SIZE = 1000
+
+# The pks of people saved within `defer_profile_completion`, `None` outside it.
+_deferred_profile_completion_pks: ContextVar[Optional[set[int]]] = ContextVar(
+    "deferred_profile_completion_pks", default=None
+)
+
 LEFT_DIT_LOG_MESSAGE = """People Finder deletion request: {profile_name}
 
 Profile deletion request
@@ -59,6 +89,75 @@ You can update any profile on Digital Workspace. Find out more at: https://works
 """
 
 
+@contextmanager
+def defer_profile_completion() -> Iterator[None]:
+    """Recalculate the profile completion of people saved within the block once,
+    in bulk, at the end of it rather than on each save.
+
+    Use this around bulk imports and other code saving many profiles.
+    """
+    if _deferred_profile_completion_pks.get() is not None:
+        # Already deferred by an outer block.
+        yield
+        return
+
+    pks: set[int] = set()
+    token = _deferred_profile_completion_pks.set(pks)
+    try:
+        yield
+    finally:
+        _deferred_profile_completion_pks.reset(token)
+
+    if pks:
+        PersonService().update_profile_completions(Person.objects.filter(pk__in=pks))
+
+
+def get_deferred_profile_completion_pks() -> Optional[set[int]]:
+    """Return the set to add saved people to if profile completion is deferred."""
+    return _deferred_profile_completion_pks.get()
+
+
+# How long a user's own profile is cached for page chrome, saves clear it sooner.
+REQUEST_PROFILE_CACHE_TIMEOUT = 60
+
+_no_cached_profile = object()
+
+
+def get_request_profile_cache_key(user_pk: int) -> str:
+    return f"user_{user_pk}__profile"
+
+
+def clear_request_profile_cache(user_pk: Optional[int]) -> None:
+    if user_pk is not None:
+        cache.delete(get_request_profile_cache_key(user_pk))
+
+
+def get_request_profile(request: HttpRequest) -> Optional[Person]:
+    """Return the current user's profile, loaded at most once per request.
+
+    The profile is shared by the middleware, context processors and template
+    tags that show it on every page, and is cached briefly between requests.
+
+    A cached copy may be slightly out of date, so use it for display only and
+    `request.user.profile` for anything that changes the profile.
+    """
+    if hasattr(request, "_peoplefinder_profile"):
+        return request._peoplefinder_profile
+
+    profile = None
+    if request.user.is_authenticated:
+        cache_key = get_request_profile_cache_key(request.user.pk)
+        profile = cache.get(cache_key, _no_cached_profile)
+        if profile is _no_cached_profile:
+            profile = Person.objects.filter(user=request.user).first()
+            cache.set(cache_key, profile, timeout=REQUEST_PROFILE_CACHE_TIMEOUT)
+            # It's fresh, so `request.user.profile` can use it too.
+            Person.user.field.remote_field.set_cached_value(request.user, profile)
+
+    request._peoplefinder_profile = profile
+    return profile
+
+
 class ProfileCompletionField(TypedDict, total=False):
     weight: int
     edit_section: Any  # EditSections
@@ -298,8 +397,9 @@ class PersonService:
 
             self.trigger_profile_change_notification(request, person)
 
-        for team_id in person.roles.all().values_list("team__pk", flat=True).distinct():
-            TeamService().clear_profile_completion_cache(team_id)
+        TeamService().clear_profile_completion_caches(
+            person.roles.all().values_list("team__pk", flat=True).distinct()
+        )
 
     def profile_deletion_initiated(
         self, request: Optional[HttpRequest], person: Person, initiated_by: User
@@ -356,24 +456,69 @@ class PersonService:
 
             return
 
-        countdown = 300  # 5 minutes.
-        notify_user_about_profile_changes.apply_async(
-            args=(
-                person.pk,
-                personalisation,
-                countdown,
-            ),
-            countdown=countdown,
+        # Sent by `send_profile_change_notifications` once the edits stop.
+        queue_profile_change(person.pk, personalisation)
+
+    def send_profile_change_notifications(self) -> int:
+        """Send one notification to each person whose queued edits are due.
+
+        People who have edited or confirmed their own profile since are not
+        notified, as they have already seen the changes. Changes that fail to
+        send stay queued and are retried on the next run.
+
+        Returns:
+            int: The number of notifications sent.
+        """
+        sent = 0
+        failed = 0
+        notification_client = NotificationsAPIClient(settings.GOVUK_NOTIFY_API_KEY)
+        now = time.time()
+        recently_edited_at = timezone.now() - timedelta(
+            seconds=PROFILE_CHANGE_NOTIFICATION_DELAY
         )
 
+        while changes := get_due_profile_changes(now=now, offset=failed):
+            people = {
+                pk: (email, edited_or_confirmed_at)
+                for pk, email, edited_or_confirmed_at in Person.objects.filter(
+                    pk__in=changes
+                ).values_list("pk", "email", "edited_or_confirmed_at")
+            }
+            for person_pk, personalisations in changes.items():
+                email, edited_or_confirmed_at = people.get(person_pk, (None, None))
+
+                if (
+                    personalisations
+                    and email
+                    and edited_or_confirmed_at <= recently_edited_at
+                ):
+                    try:
+                        notification_client.send_email_notification(
+                            email_address=email,
+                            template_id=settings.PROFILE_EDITED_EMAIL_TEMPLATE_ID,
+                            personalisation=merge_personalisations(personalisations),
+                        )
+                    except APIError:
+                        logger.exception(
+                            "Failed to send a profile change notification",
+                            extra={"person_pk": person_pk},
+                        )
+                        failed += 1
+                        continue
+                    sent += 1
+
+                acknowledge_profile_changes(person_pk, len(personalisations))
+
+        return sent
+
     def notify_about_changes_debounce(
         self, person_pk, personalisation, countdown
     ) -> None:
         """
         Don't call this method directly, use `trigger_profile_change_notification`.
 
-        See `peoplefinder.tasks.notify_user_about_profile_changes` for more
-        details.
+        Only used by `peoplefinder.tasks.notify_user_about_profile_changes` tasks
+        that were queued before notifications were batched.
         """
         person = Person.objects.get(pk=person_pk)
 
@@ -509,6 +654,113 @@ class PersonService:
             statuses[profile_completion_field] = False
         return statuses
 
+    def get_profile_completion_field_condition(self, field_name: str) -> Q:
+        """Return a filter matching people who have completed the given field.
+
+        This mirrors `profile_completion_field_statuses` so that completion can
+        be worked out for many people in one query.
+        """
+        pcf_dict = self.PROFILE_COMPLETION_FIELDS[field_name]
+        conditions = []
+
+        if field_name == "roles":
+            conditions.append(
+                Exists(TeamMember.objects.filter(person_id=OuterRef("pk")))
+            )
+
+        for or_field in pcf_dict.get("or_fields", []):
+            conditions.append(self._get_truthy_field_condition(or_field))
+
+        try:
+            Person._meta.get_field(field_name)
+        except FieldDoesNotExist:
+            pass
+        else:
+            if field_name != "roles":
+                conditions.append(self._get_truthy_field_condition(field_name))
+
+        condition = Q(pk__in=[])
+        for c in conditions:
+            condition |= c
+        return condition
+
+    def _get_truthy_field_condition(self, field_name: str) -> Q:
+        field = Person._meta.get_field(field_name)
+        if isinstance(field, models.BooleanField):
+            return Q(**{field_name: True})
+        if isinstance(field, (models.CharField, models.TextField)):
+            return Q(**{f"{field_name}__isnull": False}) & ~Q(**{field_name: ""})
+        return Q(**{f"{field_name}__isnull": False})
+
+    def with_profile_completion(self, queryset: QuerySet[Person]) -> QuerySet[Person]:
+        """Annotate the queryset with `computed_profile_completion`.
+
+        This gives the same result as `get_profile_completion`, but for every
+        person in the queryset at once.
+        """
+        total_field_weights = sum(
+            [f["weight"] for f in self.PROFILE_COMPLETION_FIELDS.values()]
+        )
+        complete_fields = sum(
+            Case(
+                When(
+                    self.get_profile_completion_field_condition(field_name),
+                    then=Value(pcf_dict["weight"]),
+                ),
+                default=Value(0),
+            )
+            for field_name, pcf_dict in self.PROFILE_COMPLETION_FIELDS.items()
+            if pcf_dict["weight"]
+        )
+        return queryset.annotate(
+            computed_profile_completion=ExpressionWrapper(
+                complete_fields * 100 / total_field_weights,
+                output_field=models.IntegerField(),
+            )
+        )
+
+    def update_profile_completions(
+        self,
+        queryset: Optional[QuerySet[Person]] = None,
+        batch_size: int = PROFILE_COMPLETION_BATCH_SIZE,
+    ) -> int:
+        """Recalculate the stored profile completion of people in bulk.
+
+        People are scored `batch_size` at a time and only those whose score has
+        changed are written back.
+
+        Returns:
+            int: The number of people whose profile completion changed.
+        """
+        if queryset is None:
+            queryset = Person.objects.all()
+
+        pks = list(queryset.order_by("pk").values_list("pk", flat=True))
+        updated = 0
+        for i in range(0, len(pks), batch_size):
+            people = self.with_profile_completion(
+                Person.objects.filter(pk__in=pks[i : i + batch_size])
+            ).only("pk", "profile_completion")
+
+            changed_people = []
+            for person in people:
+                if person.profile_completion != person.computed_profile_completion:
+                    person.profile_completion = person.computed_profile_completion
+                    changed_people.append(person)
+
+            if not changed_people:
+                continue
+
+            Person.objects.bulk_update(changed_people, ["profile_completion"])
+            TeamService().clear_profile_completion_caches(
+                TeamMember.objects.filter(person__in=changed_people)
+                .values_list("team__pk", flat=True)
+                .distinct()
+            )
+            updated += len(changed_people)
+
+        return updated
+
     def get_profile_completion_field(self, field_name: str) -> ProfileCompletionField:
         return self.PROFILE_COMPLETION_FIELDS[field_name]
 
@@ -0,0 +1,136 @@
+"""A Redis backed buffer of profile changes waiting to be notified.
+
+Each edit appends its personalisation to a per-person list and records the
+time of the latest edit in a sorted set of pending people. A periodic task then
+reads everyone who hasn't been edited for `PROFILE_CHANGE_NOTIFICATION_DELAY`
+seconds, so each person gets one notification for a burst of edits. A person's
+changes are only removed from the buffer once they have been notified.
+"""
+
+import json
+import time
+from typing import Optional
+
+import redis
+from django.core.cache import cache
+
+
+PROFILE_CHANGE_NOTIFICATION_DELAY = 300  # 5 minutes.
+# Buffers of people that are never notified are dropped after this.
+PROFILE_CHANGE_BUFFER_TIMEOUT = 60 * 60 * 24 * 7
+
+PROFILE_CHANGES_KEY_PREFIX = "profile_changes"
+
+# Remove the changes that were notified, and the person from the pending set
+# unless they have been edited again since.
+ACKNOWLEDGE_PROFILE_CHANGES_SCRIPT = """
+redis.call("LTRIM", KEYS[1], ARGV[1], -1)
+if redis.call("LLEN", KEYS[1]) == 0 then
+    redis.call("ZREM", KEYS[2], ARGV[2])
+end
+"""
+
+
+def get_pending_profile_changes_key() -> str:
+    return cache.make_key(f"{PROFILE_CHANGES_KEY_PREFIX}__pending")
+
+
+def get_profile_changes_key(person_pk: int) -> str:
+    return cache.make_key(f"{PROFILE_CHANGES_KEY_PREFIX}__{person_pk}")
+
+
+def get_redis_client() -> redis.Redis:
+    # Share the default cache's connection pool rather than opening another.
+    return cache._cache.get_client(write=True)
+
+
+def queue_profile_change(
+    person_pk: int, personalisation: dict, now: Optional[float] = None
+) -> None:
+    """Add a change to the person's buffer and (re)start their delay."""
+    if now is None:
+        now = time.time()
+
+    key = get_profile_changes_key(person_pk)
+    with get_redis_client().pipeline(transaction=True) as pipe:
+        pipe.rpush(key, json.dumps(personalisation))
+        pipe.expire(key, PROFILE_CHANGE_BUFFER_TIMEOUT)
+        pipe.zadd(get_pending_profile_changes_key(), {person_pk: now})
+        pipe.execute()
+
+
+def get_due_profile_changes(
+    now: Optional[float] = None, offset: int = 0, limit: int = 500
+) -> dict[int, list[dict]]:
+    """Return the buffered changes of people whose delay is over.
+
+    The changes stay buffered until `acknowledge_profile_changes` is called.
+
+    Args:
+        offset: The number of due people to skip, e.g. those that failed.
+
+    Returns:
+        dict: Person pk -> personalisations, oldest first.
+    """
+    if now is None:
+        now = time.time()
+
+    client = get_redis_client()
+    person_pks = [
+        int(pk)
+        for pk in client.zrangebyscore(
+            get_pending_profile_changes_key(),
+            "-inf",
+            now - PROFILE_CHANGE_NOTIFICATION_DELAY,
+            start=offset,
+            num=limit,
+        )
+    ]
+    if not person_pks:
+        return {}
+
+    with client.pipeline(transaction=False) as pipe:
+        for pk in person_pks:
+            pipe.lrange(get_profile_changes_key(pk), 0, -1)
+        results = pipe.execute()
+
+    return {
+        pk: [json.loads(p) for p in buffered]
+        for pk, buffered in zip(person_pks, results, strict=True)
+    }
+
+
+def acknowledge_profile_changes(person_pk: int, count: int) -> None:
+    """Remove the first `count` changes of a person from their buffer.
+
+    Changes queued since they were read are kept, and keep the person pending.
+    """
+    get_redis_client().eval(
+        ACKNOWLEDGE_PROFILE_CHANGES_SCRIPT,
+        2,
+        get_profile_changes_key(person_pk),
+        get_pending_profile_changes_key(),
+        count,
+        person_pk,
+    )
+
+
+def join_names(names: list[str]) -> str:
+    """
+    >>> join_names(["Jane"])
+    'Jane'
+    >>> join_names(["Jane", "John", "Jim"])
+    'Jane, John and Jim'
+    """
+    if len(names) <= 1:
+        return "".join(names)
+    return f"{', '.join(names[:-1])} and {names[-1]}"
+
+
+def merge_personalisations(personalisations: list[dict]) -> dict:
+    """Merge the personalisations of several edits into one notification.
+
+    The latest edit wins, apart from the editor names which are all listed.
+    """
+    editor_names = list(dict.fromkeys(p["editor_name"] for p in personalisations))
+    return {**personalisations[-1], "editor_name": join_names(editor_names)}
@@ -6,9 +6,9 @@ from peoplefinder.models import (
     LearningInterest,
     Network,
     Profession,
-    TeamTree,
     UkStaffLocation,
 )
+from peoplefinder.services.team import TeamService
 
 
 @cache_for(hours=1)
@@ -58,25 +58,12 @@ def get_additional_roles() -> list[tuple[str, str]]:
 @cache_for(hours=1)
 def get_teams() -> list[tuple[str, str]]:
     """
-    Starting with TeamTree for hierarchical ordering, we then recurse down to ensure children are under their parent item
+    Teams ordered depth first from the team hierarchy, so that children are
+    under their parent item
     """
-
-    def get_children_of(team, qs):
-        return [r.child for r in qs.filter(parent__pk=team.pk)]
-
-    def add_to_dict(qs, data_dict, team):
-        data_dict[team.pk] = (team.pk, team.name)
-        for child in get_children_of(team, qs):
-            add_to_dict(qs, data_dict, child)
-
-    qs = (
-        TeamTree.objects.prefetch_related("parent", "child")
-        .order_by("parent", "child")
-        .filter(depth=1)
+    return add_null_option(
+        choices=[
+            (team["team_id"], team["team_name"])
+            for team in TeamService().get_team_select_data()
+        ]
     )
-    data: dict = {}
-    for relation in qs:
-        if relation.parent.pk not in data.keys():
-            add_to_dict(qs, data, relation.parent)
-
-    return add_null_option(choices=list(data.values()))
@@ -1,4 +1,4 @@
-from typing import Iterator, Optional, TypedDict
+from typing import Iterable, Iterator, Optional, TypedDict
 
 from django.contrib.postgres.aggregates import ArrayAgg
 from django.core.cache import cache
@@ -6,8 +6,8 @@ from django.db import connection, transaction
 from django.db.models import (
     Case,
     CharField,
+    Count,
     F,
-    OuterRef,
     Q,
     QuerySet,
     Subquery,
@@ -17,12 +17,16 @@ from django.db.models import (
 from django.db.models.functions import Concat
 from django.utils.text import slugify
 
-from peoplefinder.models import AuditLog, Person, Team, TeamMember, TeamTree
+from peoplefinder.models import AuditLog, Team, TeamMember, TeamTree
 from peoplefinder.services.audit_log import (
     AuditLogSerializer,
     AuditLogService,
     ObjectRepr,
 )
+from peoplefinder.services.team_hierarchy import (
+    clear_team_hierarchy_cache,
+    get_team_hierarchy,
+)
 from user.models import User
 
 
@@ -56,6 +60,7 @@ class TeamService:
                 ),
             ]
         )
+        clear_team_hierarchy_cache()
 
     def validate_team_parent_update(self, team: Team, parent: Team) -> None:
         """Validate that the new parent is valid for the given team.
@@ -70,10 +75,12 @@ class TeamService:
         if parent == team:
             raise TeamServiceError("A team's parent cannot be the team itself")
 
-        if parent in self.get_all_child_teams(team):
+        hierarchy = get_team_hierarchy()
+
+        if parent and hierarchy.is_descendant(parent.pk, team.pk):
             raise TeamServiceError("A team's parent cannot be a team's child")
 
-        if parent and (team == self.get_root_team()):
+        if parent and (team.pk in hierarchy.root_ids):
             raise TeamServiceError("Cannot update the parent of the root team")
 
     @transaction.atomic
@@ -112,6 +119,8 @@ class TeamService:
                 [team.id, parent.id],
             )
 
+        clear_team_hierarchy_cache()
+
     def get_all_child_teams(self, parent: Team) -> QuerySet[Team]:
         """Return all child teams of the given parent team.
 
@@ -121,8 +130,8 @@ class TeamService:
         Returns:
             QuerySet: A queryset of teams.
         """
-        return Team.objects.filter(children__parent=parent).exclude(
-            children__child=parent
+        return Team.objects.filter(
+            pk__in=get_team_hierarchy().get_descendant_ids(parent.pk)
         )
 
     def get_immediate_child_teams(self, parent: Team) -> QuerySet:
@@ -134,7 +143,7 @@ class TeamService:
         Returns:
             QuerySet: A queryset of teams.
         """
-        return Team.objects.filter(children__parent=parent, children__depth=1)
+        return Team.objects.filter(pk__in=get_team_hierarchy().get_child_ids(parent.pk))
 
     def get_all_parent_teams(self, child: Team) -> QuerySet:
         """Return all parent teams for the given child team.
@@ -145,10 +154,17 @@ class TeamService:
         Returns:
             QuerySet: A query of teams.
         """
+        ancestor_ids = get_team_hierarchy().get_ancestor_ids(child.pk)
+
         return (
-            Team.objects.filter(parents__child=child).exclude(parents__parent=child)
+            Team.objects.filter(pk__in=ancestor_ids)
             # TODO: Not sure if we should order here or at the call sites.
-            .order_by("-parents__depth")
+            .order_by(
+                Case(
+                    *(When(pk=pk, then=Value(i)) for i, pk in enumerate(ancestor_ids)),
+                    default=Value(len(ancestor_ids)),
+                )
+            )
         )
 
     def get_immediate_parent_team(self, child: Team) -> Optional[Team]:
@@ -160,65 +176,43 @@ class TeamService:
         Returns:
             Team: The immediate parent team.
         """
-        try:
-            return Team.objects.filter(parents__child=child, parents__depth=1).get()
-        except Team.DoesNotExist:
+        parent_id = get_team_hierarchy().get_parent_id(child.pk)
+        if parent_id is None:
             return None
 
+        return Team.objects.filter(pk=parent_id).first()
+
     def get_root_team(self) -> Team:
         """Return the root team.
 
         Returns:
             Team: The root team.
         """
-        teams_with_parents = TeamTree.objects.filter(depth__gt=0)
-
-        return Team.objects.exclude(
-            id__in=Subquery(teams_with_parents.values("child"))
-        ).get()
+        return Team.objects.filter(pk__in=get_team_hierarchy().root_ids).get()
 
     def get_team_select_data(self) -> Iterator[TeamSelectDatum]:
         """Return the teams data for the team-select web component.
 
+        Teams are ordered depth first with sibling teams ordered by name, so a
+        team always comes after its parent.
+
         Yields:
             dict of team select data
         """
-        root_team = self.get_root_team()
-
-        team_tree_depth_1 = TeamTree.objects.select_related("child", "parent").filter(
-            depth=1
-        )
-
-        children_subquery = Subquery(
-            team_tree_depth_1.filter(depth=1, parent__pk=OuterRef("child__pk")).values(
-                "child"
-            )[:1],
+        hierarchy = get_team_hierarchy()
+        team_names = dict(
+            Team.objects.filter(pk__in=hierarchy.order).values_list("pk", "name")
         )
 
-        full_team_tree = team_tree_depth_1.annotate(
-            children_subquery=children_subquery,
-            has_children=Case(
-                When(
-                    Q(children_subquery__isnull=False),
-                    then=Value(True),
-                ),
-                default=Value(False),
-            ),
-        ).order_by("-has_children", "parent__name", "child__name")
-
-        yield {
-            "team_id": root_team.id,
-            "team_name": root_team.name,
-            "parent_id": None,
-            "parent_name": None,
-        }
-
-        for team_node in full_team_tree:
+        for team_id in hierarchy.get_sorted_ids(
+            key=lambda pk: (team_names.get(pk, ""), pk)
+        ):
+            parent_id = hierarchy.get_parent_id(team_id)
             yield {
-                "team_id": team_node.child.id,
-                "team_name": team_node.child.name,
-                "parent_id": team_node.parent.id,
-                "parent_name": team_node.parent.name,
+                "team_id": team_id,
+                "team_name": team_names.get(team_id, ""),
+                "parent_id": parent_id,
+                "parent_name": team_names.get(parent_id) if parent_id else None,
             }
 
     def generate_team_slug(self, team: Team) -> str:
@@ -308,46 +302,112 @@ class TeamService:
         AuditLogService.log(AuditLog.Action.DELETE, deleted_by, team)
 
     def get_team_members(self, team: Team) -> QuerySet[TeamMember]:
-        sub_teams = self.get_all_child_teams(team)
+        sub_team_ids = get_team_hierarchy().get_descendant_ids(team.pk)
 
-        return TeamMember.active.filter(Q(team=team) | Q(team__in=sub_teams))
+        return TeamMember.active.filter(team_id__in=[team.pk, *sub_team_ids])
 
     def get_profile_completion_cache_key(self, team_pk: int) -> str:
-        return f"team_{team_pk}__profile_completion"
+        return f"team_{team_pk}__profile_completion_counts"
 
     def clear_profile_completion_cache(self, team_pk: int):
-        cache.delete(self.get_profile_completion_cache_key(team_pk))
+        self.clear_profile_completion_caches([team_pk])
 
-    def profile_completion(self, team: Team) -> float | None:
+    def clear_profile_completion_caches(self, team_pks: Iterable[int]):
+        """Clear the cached profile completion of the given teams and all of
+        their parent teams, which include the same people.
         """
-        Calculate the percentage of users in the team with 100% profile
-        completion.
+        hierarchy = get_team_hierarchy()
+        affected_team_pks = set()
+        for team_pk in team_pks:
+            affected_team_pks.add(team_pk)
+            affected_team_pks.update(hierarchy.get_ancestor_ids(team_pk))
+
+        cache.delete_many(
+            [self.get_profile_completion_cache_key(pk) for pk in affected_team_pks]
+        )
+
+    def get_profile_completion_counts(
+        self, team_pks: Iterable[int]
+    ) -> dict[int, tuple[int, int]]:
+        """Count the completed profiles of the members of the given teams.
+
+        Members of sub-teams are included and each person is only counted once
+        per team. The counts for all the teams come from a single query over
+        the `TeamTree` closure table.
 
         Returns:
-            float: A percentage
+            dict: Team pk -> (completed profiles, total members)
         """
-        cache_key = self.get_profile_completion_cache_key(team.pk)
-        if cached_value := cache.get(cache_key, None):
-            return cached_value
+        team_pks = list(team_pks)
+        counts = {team_pk: (0, 0) for team_pk in team_pks}
 
-        # Get all people from all teams
-        people = Person.objects.filter(
-            id__in=Subquery(self.get_team_members(team).values("person_id"))
+        rows = (
+            TeamMember.active.filter(team__children__parent_id__in=team_pks)
+            .values("team__children__parent_id")
+            .annotate(
+                completed=Count(
+                    "person_id",
+                    distinct=True,
+                    filter=Q(person__profile_completion__gte=100),
+                ),
+                total=Count("person_id", distinct=True),
+            )
+            .values_list("team__children__parent_id", "completed", "total")
+            .order_by()
         )
-        completed_profiles = people.filter(profile_completion__gte=100)
+        for team_pk, completed, total in rows:
+            counts[team_pk] = (completed, total)
 
-        total_members = len(people)
-        total_completed_profiles = len(completed_profiles)
+        return counts
 
-        if total_members == 0:
-            return None
+    def get_profile_completions(self, teams: Iterable[Team]) -> dict[int, float | None]:
+        """Return the percentage of people with 100% profile completion for
+        each of the given teams.
+
+        Cached counts are fetched together and the rest are counted with a
+        single query, so this doesn't grow with the number of teams.
+
+        Returns:
+            dict: Team pk -> a percentage, or `None` if the team has no members
+        """
+        cache_keys = {
+            team.pk: self.get_profile_completion_cache_key(team.pk) for team in teams
+        }
+        cached_counts = cache.get_many(list(cache_keys.values()))
+
+        counts = {
+            team_pk: cached_counts[cache_key]
+            for team_pk, cache_key in cache_keys.items()
+            if cache_key in cached_counts
+        }
+        if missing_team_pks := [pk for pk in cache_keys if pk not in counts]:
+            missing_counts = self.get_profile_completion_counts(missing_team_pks)
+            counts.update(missing_counts)
+
+            # Cache the counts for an hour.
+            timeout = 60 * 60
+            cache.set_many(
+                {
+                    cache_keys[team_pk]: team_counts
+                    for team_pk, team_counts in missing_counts.items()
+                },
+                timeout,
+            )
 
-        completed_profile_percent = total_completed_profiles / total_members
+        return {
+            team_pk: (completed / total if total else None)
+            for team_pk, (completed, total) in counts.items()
+        }
 
-        # Cache the result for an hour.
-        timeout = 60 * 60
-        cache.set(cache_key, completed_profile_percent, timeout)
-        return completed_profile_percent
+    def profile_completion(self, team: Team) -> float | None:
+        """
+        Calculate the percentage of users in the team with 100% profile
+        completion.
+
+        Returns:
+            float: A percentage
+        """
+        return self.get_profile_completions([team])[team.pk]
 
 
 class TeamAuditLogSerializer(AuditLogSerializer):
@@ -0,0 +1,310 @@
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from peoplefinder.models import Team, TeamTree
+
+
+# Bumped whenever the team tree or a team's slug or name changes, the snapshot
+# and ancestry map for a version are cached in Redis under keys containing it
+TEAM_HIERARCHY_VERSION_CACHE_KEY = "team_hierarchy__version"
+TEAM_HIERARCHY_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+@dataclass(frozen=True)
+class TeamHierarchy:
+    """An immutable snapshot of the team tree.
+
+    Teams are stored in pre-order (an Euler tour of the tree), so the
+    descendants of a team are the contiguous run of teams between its position
+    and its subtree end. This makes descendant checks O(1) and subtree lookups
+    a slice.
+    """
+
+    version: Optional[int]
+    # Team pks in pre-order.
+    order: tuple[int, ...]
+    # Team pk -> position in `order`.
+    positions: dict[int, int]
+    # Position -> position of the parent team, -1 for root teams.
+    parents: tuple[int, ...]
+    # Position -> positions of the immediate child teams.
+    children: tuple[tuple[int, ...], ...]
+    # Position -> position after the last descendant.
+    subtree_ends: tuple[int, ...]
+    root_ids: tuple[int, ...]
+
+    @classmethod
+    def build(cls, version: Optional[int] = None) -> "TeamHierarchy":
+        """Build a snapshot from the `TeamTree` closure table."""
+        team_ids = TeamTree.objects.filter(depth=0).values_list("child_id", flat=True)
+        edges = TeamTree.objects.filter(depth=1).values_list("parent_id", "child_id")
+
+        child_ids_by_parent: dict[int, list[int]] = defaultdict(list)
+        parent_ids: dict[int, int] = {}
+        for parent_id, child_id in edges:
+            child_ids_by_parent[parent_id].append(child_id)
+            parent_ids[child_id] = parent_id
+
+        root_ids = sorted(pk for pk in team_ids if pk not in parent_ids)
+
+        order: list[int] = []
+        positions: dict[int, int] = {}
+        parents: list[int] = []
+        subtree_ends: list[int] = []
+
+        # Iterative depth first walk, a `None` marks the end of a subtree.
+        stack: list[Optional[int]] = list(reversed(root_ids))
+        open_positions: list[int] = []
+        while stack:
+            pk = stack.pop()
+            if pk is None:
+                subtree_ends[open_positions.pop()] = len(order)
+                continue
+
+            position = len(order)
+            order.append(pk)
+            positions[pk] = position
+            parents.append(open_positions[-1] if open_positions else -1)
+            subtree_ends.append(position + 1)
+            open_positions.append(position)
+
+            stack.append(None)
+            stack.extend(sorted(child_ids_by_parent[pk], reverse=True))
+
+        children: list[list[int]] = [[] for _ in order]
+        for position, parent_position in enumerate(parents):
+            if parent_position != -1:
+                children[parent_position].append(position)
+
+        return cls(
+            version=version,
+            order=tuple(order),
+            positions=positions,
+            parents=tuple(parents),
+            children=tuple(tuple(c) for c in children),
+            subtree_ends=tuple(subtree_ends),
+            root_ids=tuple(root_ids),
+        )
+
+    def __contains__(self, team_id: int) -> bool:
+        return team_id in self.positions
+
+    def get_parent_id(self, team_id: int) -> Optional[int]:
+        if team_id not in self.positions:
+            return None
+        parent_position = self.parents[self.positions[team_id]]
+        if parent_position == -1:
+            return None
+        return self.order[parent_position]
+
+    def get_ancestor_ids(self, team_id: int) -> list[int]:
+        """Return the pks of the team's ancestors, starting from the root."""
+        if team_id not in self.positions:
+            return []
+        ancestor_ids = []
+        parent_position = self.parents[self.positions[team_id]]
+        while parent_position != -1:
+            ancestor_ids.append(self.order[parent_position])
+            parent_position = self.parents[parent_position]
+        ancestor_ids.reverse()
+        return ancestor_ids
+
+    def get_child_ids(self, team_id: int) -> list[int]:
+        if team_id not in self.positions:
+            return []
+        return [self.order[p] for p in self.children[self.positions[team_id]]]
+
+    def get_sorted_ids(self, key: Callable[[int], Any]) -> list[int]:
+        """Return the team pks depth first, with sibling teams sorted by `key`."""
+        sorted_ids = []
+        stack = sorted(self.root_ids, key=key, reverse=True)
+        while stack:
+            team_id = stack.pop()
+            sorted_ids.append(team_id)
+            stack.extend(sorted(self.get_child_ids(team_id), key=key, reverse=True))
+        return sorted_ids
+
+    def get_descendant_ids(self, team_id: int) -> tuple[int, ...]:
+        if team_id not in self.positions:
+            return ()
+        position = self.positions[team_id]
+        return self.order[position + 1 : self.subtree_ends[position]]
+
+    def is_descendant(self, team_id: int, ancestor_id: int) -> bool:
+        if team_id not in self.positions or ancestor_id not in self.positions:
+            return False
+        position = self.positions[team_id]
+        ancestor_position = self.positions[ancestor_id]
+        return ancestor_position < position < self.subtree_ends[ancestor_position]
+
+
+_local_hierarchy: Optional[TeamHierarchy] = None
+_local_version: Optional[int] = None
+_local_version_checked_at = 0.0
+# The version bumped to by a change that hasn't been committed yet.
+_uncommitted_version: Optional[int] = None
+
+
+def get_team_hierarchy_cache_key(version: int) -> str:
+    return f"team_hierarchy__{version}"
+
+
+def fetch_team_hierarchy_version() -> Optional[int]:
+    global _local_version, _local_version_checked_at
+
+    # Seed with the time so a lost key can't bring back an old version
+    cache.add(TEAM_HIERARCHY_VERSION_CACHE_KEY, time.time_ns(), timeout=None)
+    _local_version = cache.get(TEAM_HIERARCHY_VERSION_CACHE_KEY)
+    _local_version_checked_at = time.monotonic()
+    return _local_version
+
+
+def get_team_hierarchy_version() -> Optional[int]:
+    """Return the team hierarchy version, checking Redis at most once per
+    TEAM_HIERARCHY_VERSION_CHECK_INTERVAL seconds.
+    """
+    if (
+        _local_version is not None
+        and time.monotonic() - _local_version_checked_at
+        < settings.TEAM_HIERARCHY_VERSION_CHECK_INTERVAL
+    ):
+        return _local_version
+    return fetch_team_hierarchy_version()
+
+
+def forget_team_hierarchy_version() -> None:
+    """Make the next read fetch the version from Redis."""
+    global _local_version
+
+    _local_version = None
+
+
+def is_team_hierarchy_uncommitted(version: int) -> bool:
+    """Whether the tree for the version may have uncommitted changes.
+
+    A snapshot built from such a tree isn't cached, as the changes could still
+    be rolled back.
+    """
+    return (
+        version == _uncommitted_version and transaction.get_connection().in_atomic_block
+    )
+
+
+def get_team_hierarchy() -> TeamHierarchy:
+    """Return the current team hierarchy snapshot.
+
+    The snapshot is kept in process memory and in Redis, so only the version
+    has to be fetched unless the tree has changed.
+    """
+    global _local_hierarchy
+
+    version = get_team_hierarchy_version()
+    if version is None or is_team_hierarchy_uncommitted(version):
+        return TeamHierarchy.build()
+
+    local_hierarchy = _local_hierarchy
+    if local_hierarchy is not None and local_hierarchy.version == version:
+        return local_hierarchy
+
+    cache_key = get_team_hierarchy_cache_key(version)
+    hierarchy = cache.get(cache_key)
+    if hierarchy is None:
+        hierarchy = TeamHierarchy.build(version)
+        cache.set(cache_key, hierarchy, timeout=TEAM_HIERARCHY_CACHE_TIMEOUT)
+
+    _local_hierarchy = hierarchy
+    return hierarchy
+
+
+TeamAncestry = tuple[dict[str, str], ...]
+
+_local_ancestry_map: Optional[tuple[int, dict[int, TeamAncestry]]] = None
+
+
+def get_team_ancestry_map_cache_key(version: int) -> str:
+    return f"team_ancestry__{version}"
+
+
+def build_team_ancestry_map(hierarchy: TeamHierarchy) -> dict[int, TeamAncestry]:
+    """Map each team pk to the slug and short name of its ancestors."""
+    labels = {
+        pk: {"slug": slug, "short_name": abbreviation or name}
+        for pk, slug, name, abbreviation in Team.objects.values_list(
+            "pk", "slug", "name", "abbreviation"
+        )
+    }
+
+    ancestry_map: dict[int, TeamAncestry] = {}
+    # Parents come before their children in pre-order.
+    for team_id in hierarchy.order:
+        parent_id = hierarchy.get_parent_id(team_id)
+        # A team deleted since the snapshot was built has no label.
+        if parent_id is None or parent_id not in labels:
+            ancestry_map[team_id] = ()
+        else:
+            ancestry_map[team_id] = ancestry_map[parent_id] + (labels[parent_id],)
+    return ancestry_map
+
+
+def get_team_ancestry_map() -> dict[int, TeamAncestry]:
+    """Return the ancestry of every team, cached like the hierarchy snapshot."""
+    global _local_ancestry_map
+
+    hierarchy = get_team_hierarchy()
+    version = hierarchy.version
+    if version is None:
+        return build_team_ancestry_map(hierarchy)
+
+    local_ancestry_map = _local_ancestry_map
+    if local_ancestry_map is not None and local_ancestry_map[0] == version:
+        return local_ancestry_map[1]
+
+    cache_key = get_team_ancestry_map_cache_key(version)
+    ancestry_map = cache.get(cache_key)
+    if ancestry_map is None:
+        ancestry_map = build_team_ancestry_map(hierarchy)
+        cache.set(cache_key, ancestry_map, timeout=TEAM_HIERARCHY_CACHE_TIMEOUT)
+
+    _local_ancestry_map = (version, ancestry_map)
+    return ancestry_map
+
+
+def get_team_ancestry(team_id: int) -> list[dict[str, str]]:
+    """Return the slug and short name of the team's ancestors, root first."""
+    return list(get_team_ancestry_map().get(team_id, ()))
+
+
+def _bump_team_hierarchy_version() -> None:
+    global _local_version, _local_version_checked_at
+
+    try:
+        _local_version = cache.incr(TEAM_HIERARCHY_VERSION_CACHE_KEY)
+        _local_version_checked_at = time.monotonic()
+    except ValueError:
+        fetch_team_hierarchy_version()
+
+
+def clear_team_hierarchy_cache(*args, **kwargs) -> None:
+    """Invalidate the team hierarchy snapshot, usable as a signal receiver.
+
+    The version is bumped straight away so that reads later in the same
+    transaction see the change, and again on commit so that a snapshot built
+    by another process from the old tree in the meantime is discarded. Other
+    processes pick up the new version within
+    TEAM_HIERARCHY_VERSION_CHECK_INTERVAL seconds.
+
+    Until then, snapshots built in the transaction aren't cached, so a
+    rollback can't leave the changed tree cached under the new version.
+    """
+    global _uncommitted_version
+
+    _bump_team_hierarchy_version()
+    if transaction.get_connection().in_atomic_block:
+        _uncommitted_version = _local_version
+    transaction.on_commit(_bump_team_hierarchy_version)
@@ -1,6 +1,9 @@
 from config.celery import celery_app
+from core.utils import cache_lock
 
 
+# Superseded by `send_profile_change_notifications`, kept to run any tasks that
+# were queued before it.
 @celery_app.task(bind=True)
 def notify_user_about_profile_changes(self, person_pk, personalisation, countdown=None):
     from peoplefinder.services.person import PersonService
@@ -16,3 +19,22 @@ def notify_user_about_profile_changes(self, person_pk, personalisation, countdow
         personalisation=personalisation,
         countdown=countdown,
     )
+
+
+@celery_app.task(bind=True)
+def update_profile_completions(self):
+    from peoplefinder.services.person import PersonService
+
+    updated = PersonService().update_profile_completions()
+
+    print(f"Successfully updated {updated} profile completions")
+
+
+@celery_app.task(bind=True)
+@cache_lock(cache_key="send_profile_change_notifications", cache_time=60 * 10)
+def send_profile_change_notifications(self):
+    from peoplefinder.services.person import PersonService
+
+    sent = PersonService().send_profile_change_notifications()
+
+    print(f"Successfully sent {sent} profile change notifications")
@@ -1,6 +1,8 @@
 import unittest
+from datetime import timedelta
 
 import pytest
+from django.utils import timezone
 
 from peoplefinder.models import AuditLog, Person, Team
 from peoplefinder.services.audit_log import AuditLogService, object_repr_diff
@@ -63,6 +65,31 @@ class TestAuditLogService:
         # Even if there is a difference, a delete log always has an empty diff.
         assert log.diff == []
 
+    def test_get_changes(self, db):
+        person = Person.objects.get(user__email="john.smith@example.com")
+        team = Team.objects.first()
+
+        person_log = AuditLogService.log(AuditLog.Action.UPDATE, person.user, person)
+        team_log = AuditLogService.log(AuditLog.Action.UPDATE, person.user, team)
+        recent_log = AuditLogService.log(AuditLog.Action.UPDATE, person.user, person)
+        AuditLog.objects.filter(pk__in=[person_log.pk, team_log.pk]).update(
+            timestamp=timezone.now() - timedelta(minutes=1)
+        )
+
+        changes = AuditLogService.get_changes(
+            after=person_log.pk - 1, limit=10, model_classes=[Person, Team]
+        )
+        # The recent log is held back until it has settled.
+        assert changes == [person_log, team_log]
+        assert recent_log not in changes
+
+        assert AuditLogService.get_changes(
+            after=person_log.pk, limit=10, model_classes=[Team]
+        ) == [team_log]
+        assert AuditLogService.get_changes(
+            after=person_log.pk - 1, limit=1, model_classes=[Person, Team]
+        ) == [person_log]
+
 
 def test_person_audit_log_serializer(db):
     person = Person.objects.get(user__email="john.smith@example.com")
@@ -1,9 +1,16 @@
 import pytest
 from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.test import RequestFactory
 from django.utils import timezone
 
-from peoplefinder.models import Person
-from peoplefinder.services.person import PersonService
+from peoplefinder.models import Person, TeamMember
+from peoplefinder.services.person import (
+    PersonService,
+    clear_request_profile_cache,
+    defer_profile_completion,
+    get_request_profile,
+)
 
 
 class TestPersonService:
@@ -133,3 +140,88 @@ class TestCreateUserProfile:
         assert hasattr(normal_user, "profile")
         assert normal_user.profile != profile
         assert normal_user.profile == new_profile
+
+
+class TestProfileCompletion:
+    @pytest.fixture(autouse=True)
+    def people(self, normal_user, another_normal_user, software_team):
+        profile = normal_user.profile
+        profile.primary_phone_number = "--placeholder--"
+        profile.do_not_work_for_dit = True
+        profile.save()
+        TeamMember.objects.get_or_create(
+            person=profile, team=software_team, job_title="--placeholder--"
+        )
+
+    def test_with_profile_completion(self):
+        person_service = PersonService()
+
+        people = person_service.with_profile_completion(Person.objects.all())
+
+        assert people
+        for person in people:
+            assert person.computed_profile_completion == (
+                person_service.get_profile_completion(person)
+            )
+
+    def test_update_profile_completions(self, normal_user):
+        Person.objects.update(profile_completion=0)
+
+        updated = PersonService().update_profile_completions(batch_size=1)
+
+        assert updated == Person.objects.exclude(profile_completion=0).count()
+        normal_user.profile.refresh_from_db()
+        assert normal_user.profile.profile_completion == (
+            PersonService().get_profile_completion(normal_user.profile)
+        )
+        assert PersonService().update_profile_completions() == 0
+
+    def test_defer_profile_completion(self, another_normal_user):
+        profile = another_normal_user.profile
+        profile.primary_phone_number = ""
+        profile.save()
+        before = Person.objects.get(pk=profile.pk).profile_completion
+
+        with defer_profile_completion():
+            profile.primary_phone_number = "--placeholder--"
+            profile.save()
+
+            assert Person.objects.get(pk=profile.pk).profile_completion == before
+
+        assert Person.objects.get(pk=profile.pk).profile_completion > before
+
+
+class TestRequestProfile:
+    def get_request(self, user):
+        request = RequestFactory().get("/")
+        request.user = user
+        return request
+
+    def test_get_request_profile(self, normal_user, django_assert_num_queries):
+        clear_request_profile_cache(normal_user.pk)
+        request = self.get_request(normal_user)
+
+        with django_assert_num_queries(1):
+            assert get_request_profile(request) == normal_user.profile
+        with django_assert_num_queries(0):
+            assert get_request_profile(request) is get_request_profile(request)
+            assert request.user.profile is get_request_profile(request)
+
+        # Cached between requests.
+        with django_assert_num_queries(0):
+            assert get_request_profile(self.get_request(normal_user)) == (
+                normal_user.profile
+            )
+
+    def test_save_clears_cache(self, normal_user):
+        get_request_profile(self.get_request(normal_user))
+
+        profile = Person.objects.get(user=normal_user)
+        profile.preferred_first_name = "--placeholder--"
+        profile.save()
+
+        profile = get_request_profile(self.get_request(normal_user))
+        assert profile.preferred_first_name == "--placeholder--"
+
+    def test_anonymous_user(self, db):
+        assert get_request_profile(self.get_request(AnonymousUser())) is None
@@ -0,0 +1,129 @@
+import uuid
+from datetime import timedelta
+
+import pytest
+from django.conf import settings
+from django.utils import timezone
+from notifications_python_client.errors import APIError
+
+from peoplefinder.services import profile_change_notifications
+from peoplefinder.services.person import PersonService
+from peoplefinder.services.profile_change_notifications import (
+    PROFILE_CHANGE_NOTIFICATION_DELAY,
+    acknowledge_profile_changes,
+    get_due_profile_changes,
+    get_pending_profile_changes_key,
+    get_profile_changes_key,
+    get_redis_client,
+    merge_personalisations,
+    queue_profile_change,
+)
+
+
+@pytest.fixture(autouse=True)
+def isolate_profile_changes(monkeypatch):
+    # Use keys of our own, so tests never touch the real buffer.
+    monkeypatch.setattr(
+        profile_change_notifications,
+        "PROFILE_CHANGES_KEY_PREFIX",
+        f"test_profile_changes_{uuid.uuid4().hex}",
+    )
+    yield
+    client = get_redis_client()
+    for pk in client.zrange(get_pending_profile_changes_key(), 0, -1):
+        client.delete(get_profile_changes_key(int(pk)))
+    client.delete(get_pending_profile_changes_key())
+
+
+def personalisation(editor_name):
+    return {
+        "profile_name": "--placeholder--",
+        "editor_name": editor_name,
+        "profile_url": "--placeholder--",
+    }
+
+
+def test_get_due_profile_changes():
+    queue_profile_change(1, personalisation("Jane"), now=0)
+    queue_profile_change(2, personalisation("Jane"), now=0)
+    # A later edit restarts the delay.
+    queue_profile_change(2, personalisation("John"), now=100)
+
+    assert get_due_profile_changes(now=PROFILE_CHANGE_NOTIFICATION_DELAY) == {
+        1: [personalisation("Jane")],
+    }
+    acknowledge_profile_changes(1, 1)
+    assert get_due_profile_changes(now=PROFILE_CHANGE_NOTIFICATION_DELAY) == {}
+    assert get_due_profile_changes(now=PROFILE_CHANGE_NOTIFICATION_DELAY + 100) == {
+        2: [personalisation("Jane"), personalisation("John")],
+    }
+
+
+def test_acknowledge_profile_changes_keeps_newer_changes():
+    queue_profile_change(1, personalisation("Jane"), now=0)
+    changes = get_due_profile_changes(now=PROFILE_CHANGE_NOTIFICATION_DELAY)
+    # Edited again while the notification was being sent.
+    queue_profile_change(1, personalisation("John"), now=100)
+
+    acknowledge_profile_changes(1, len(changes[1]))
+
+    assert get_due_profile_changes(now=PROFILE_CHANGE_NOTIFICATION_DELAY + 100) == {
+        1: [personalisation("John")],
+    }
+
+
+def test_merge_personalisations():
+    assert merge_personalisations(
+        [personalisation("Jane"), personalisation("John"), personalisation("Jane")]
+    ) == personalisation("Jane and John")
+
+
+@pytest.fixture
+def profile(db, normal_user):
+    profile = normal_user.profile
+    profile.edited_or_confirmed_at = timezone.now() - timedelta(days=1)
+    profile.save()
+    return profile
+
+
+def test_send_profile_change_notifications(profile, mocker):
+    mock_send_email_notification = mocker.patch(
+        "peoplefinder.services.person.NotificationsAPIClient.send_email_notification"
+    )
+    queue_profile_change(profile.pk, personalisation("Jane"), now=0)
+    queue_profile_change(profile.pk, personalisation("John"), now=0)
+
+    assert PersonService().send_profile_change_notifications() == 1
+    mock_send_email_notification.assert_called_once_with(
+        email_address=profile.email,
+        template_id=settings.PROFILE_EDITED_EMAIL_TEMPLATE_ID,
+        personalisation=personalisation("Jane and John"),
+    )
+    assert get_due_profile_changes() == {}
+
+
+def test_send_profile_change_notifications_retries_failures(profile, mocker):
+    mock_send_email_notification = mocker.patch(
+        "peoplefinder.services.person.NotificationsAPIClient.send_email_notification",
+        side_effect=APIError,
+    )
+    queue_profile_change(profile.pk, personalisation("Jane"), now=0)
+
+    assert PersonService().send_profile_change_notifications() == 0
+    assert get_due_profile_changes() == {profile.pk: [personalisation("Jane")]}
+
+    mock_send_email_notification.side_effect = None
+    assert PersonService().send_profile_change_notifications() == 1
+
+
+def test_send_profile_change_notifications_after_own_edit(profile, mocker):
+    mock_send_email_notification = mocker.patch(
+        "peoplefinder.services.person.NotificationsAPIClient.send_email_notification"
+    )
+    queue_profile_change(profile.pk, personalisation("Jane"), now=0)
+    profile.edited_or_confirmed_at = timezone.now()
+    profile.save()
+
+    assert PersonService().send_profile_change_notifications() == 0
+    mock_send_email_notification.assert_not_called()
+    assert get_due_profile_changes() == {}
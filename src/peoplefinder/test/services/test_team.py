@@ -2,7 +2,7 @@ import unittest
 
 import pytest
 
-from peoplefinder.models import Team
+from peoplefinder.models import Person, Team
 from peoplefinder.services.team import TeamService, TeamServiceError
 
 
@@ -103,12 +103,6 @@ def test_team_service(db):
             "parent_id": dit.id,
             "parent_name": dit.name,
         },
-        {
-            "team_id": gti.id,
-            "team_name": gti.name,
-            "parent_id": dit.id,
-            "parent_name": dit.name,
-        },
         {
             "team_id": coo_analysis.id,
             "team_name": coo_analysis.name,
@@ -121,6 +115,12 @@ def test_team_service(db):
             "parent_id": coo.id,
             "parent_name": coo.name,
         },
+        {
+            "team_id": gti.id,
+            "team_name": gti.name,
+            "parent_id": dit.id,
+            "parent_name": dit.name,
+        },
         {
             "team_id": gti_defence.id,
             "team_name": gti_defence.name,
@@ -159,3 +159,50 @@ def test_team_service(db):
     assert team_service.generate_team_slug(coo_analysis) == "coo-investment"
 
     coo_analysis.name = "analysis"
+
+
+def test_get_profile_completions(
+    db,
+    normal_user,
+    software_team,
+    django_assert_num_queries,
+    django_capture_on_commit_callbacks,
+):
+    team_service = TeamService()
+    engineering = team_service.get_immediate_parent_team(software_team)
+    with django_capture_on_commit_callbacks(execute=True):
+        empty_team = Team.objects.create(name="Empty", slug="empty")
+        team_service.add_team(team=empty_team, parent=software_team)
+
+    Person.objects.filter(pk=normal_user.profile.pk).update(profile_completion=100)
+    # Clears the parent teams too.
+    team_service.clear_profile_completion_caches([software_team.pk])
+
+    def expected_completion(team):
+        people = Person.objects.filter(
+            id__in=team_service.get_team_members(team).values("person_id")
+        )
+        return people.filter(profile_completion__gte=100).count() / people.count()
+
+    expected = {
+        software_team.pk: expected_completion(software_team),
+        engineering.pk: expected_completion(engineering),
+        empty_team.pk: None,
+    }
+
+    with django_assert_num_queries(1):
+        assert (
+            team_service.get_profile_completions(
+                [software_team, engineering, empty_team]
+            )
+            == expected
+        )
+
+    with django_assert_num_queries(0):
+        assert (
+            team_service.get_profile_completions(
+                [software_team, engineering, empty_team]
+            )
+            == expected
+        )
+    assert team_service.profile_completion(software_team) > 0
@@ -0,0 +1,175 @@
+import pytest
+from django.core.cache import cache
+
+from peoplefinder.models import Team
+from peoplefinder.services.team import TeamService, TeamServiceError
+from peoplefinder.services.team_hierarchy import (
+    TEAM_HIERARCHY_VERSION_CACHE_KEY,
+    TeamHierarchy,
+    clear_team_hierarchy_cache,
+    forget_team_hierarchy_version,
+    get_team_ancestry,
+    get_team_hierarchy,
+    get_team_hierarchy_cache_key,
+    get_team_hierarchy_version,
+)
+
+
+@pytest.fixture
+def teams(db, django_capture_on_commit_callbacks):
+    """
+    .
+    └── DIT
+        ├── COO
+        │   └── Analysis
+        └── GTI
+    """
+    # Run the on commit callbacks, as if the teams were created in an earlier
+    # request.
+    with django_capture_on_commit_callbacks(execute=True):
+        Team.objects.all().delete()
+
+        team_service = TeamService()
+        dit = Team.objects.create(name="DIT", slug="dit")
+        coo = Team.objects.create(name="COO", slug="coo")
+        gti = Team.objects.create(name="GTI", slug="gti")
+        analysis = Team.objects.create(name="Analysis", slug="analysis")
+        team_service.add_team(team=dit, parent=dit)
+        team_service.add_team(team=coo, parent=dit)
+        team_service.add_team(team=gti, parent=dit)
+        team_service.add_team(team=analysis, parent=coo)
+
+    return dit, coo, gti, analysis
+
+
+def test_build(teams):
+    dit, coo, gti, analysis = teams
+    hierarchy = TeamHierarchy.build()
+
+    assert hierarchy.order == (dit.pk, coo.pk, analysis.pk, gti.pk)
+    assert hierarchy.root_ids == (dit.pk,)
+    assert hierarchy.get_parent_id(dit.pk) is None
+    assert hierarchy.get_parent_id(analysis.pk) == coo.pk
+    assert hierarchy.get_ancestor_ids(analysis.pk) == [dit.pk, coo.pk]
+    assert hierarchy.get_child_ids(dit.pk) == [coo.pk, gti.pk]
+    assert hierarchy.get_descendant_ids(dit.pk) == (coo.pk, analysis.pk, gti.pk)
+    assert hierarchy.get_descendant_ids(gti.pk) == ()
+    assert hierarchy.is_descendant(analysis.pk, dit.pk)
+    assert not hierarchy.is_descendant(analysis.pk, gti.pk)
+    assert not hierarchy.is_descendant(dit.pk, dit.pk)
+
+
+def test_unknown_team(teams):
+    hierarchy = TeamHierarchy.build()
+
+    assert -1 not in hierarchy
+    assert hierarchy.get_parent_id(-1) is None
+    assert hierarchy.get_ancestor_ids(-1) == []
+    assert hierarchy.get_descendant_ids(-1) == ()
+    assert not hierarchy.is_descendant(-1, teams[0].pk)
+
+
+def test_get_team_hierarchy_is_cached(teams, django_assert_num_queries):
+    hierarchy = get_team_hierarchy()
+
+    with django_assert_num_queries(0):
+        assert get_team_hierarchy() is hierarchy
+
+    clear_team_hierarchy_cache()
+
+    assert get_team_hierarchy() is not hierarchy
+
+
+def test_get_team_hierarchy_version_is_rechecked_after_interval(db, settings):
+    settings.TEAM_HIERARCHY_VERSION_CHECK_INTERVAL = 60
+    version = get_team_hierarchy_version()
+
+    # Changed by another process
+    cache.set(TEAM_HIERARCHY_VERSION_CACHE_KEY, version + 1, timeout=None)
+    assert get_team_hierarchy_version() == version
+
+    forget_team_hierarchy_version()
+    assert get_team_hierarchy_version() == version + 1
+
+    # Bumped by this process
+    clear_team_hierarchy_cache()
+    assert get_team_hierarchy_version() == version + 2
+
+
+def test_update_team_parent_rebuilds(teams):
+    dit, coo, gti, analysis = teams
+
+    TeamService().update_team_parent(gti, coo)
+
+    assert get_team_hierarchy().get_ancestor_ids(gti.pk) == [dit.pk, coo.pk]
+
+
+def test_rolled_back_update_isnt_cached(teams, mocker):
+    dit, coo, gti, analysis = teams
+    hierarchy = get_team_hierarchy()
+
+    def clear_and_fail():
+        clear_team_hierarchy_cache()
+        # Read later in the same transaction, from the uncommitted tree.
+        assert get_team_hierarchy().get_ancestor_ids(gti.pk) == [dit.pk, coo.pk]
+        raise TeamServiceError("--placeholder--")
+
+    mocker.patch(
+        "peoplefinder.services.team.clear_team_hierarchy_cache",
+        side_effect=clear_and_fail,
+    )
+    with pytest.raises(TeamServiceError):
+        TeamService().update_team_parent(gti, coo)
+
+    version = get_team_hierarchy_version()
+    assert version != hierarchy.version
+    assert cache.get(get_team_hierarchy_cache_key(version)) is None
+    assert get_team_hierarchy().get_ancestor_ids(gti.pk) == [dit.pk]
+
+
+def test_get_sorted_ids(teams):
+    dit, coo, gti, analysis = teams
+    hierarchy = TeamHierarchy.build()
+    names = {team.pk: team.name for team in teams}
+
+    assert hierarchy.get_sorted_ids(key=lambda pk: -pk) == [
+        dit.pk,
+        gti.pk,
+        coo.pk,
+        analysis.pk,
+    ]
+    assert hierarchy.get_sorted_ids(key=names.get) == [
+        dit.pk,
+        coo.pk,
+        analysis.pk,
+        gti.pk,
+    ]
+
+
+def test_get_team_ancestry(
+    teams, django_assert_num_queries, django_capture_on_commit_callbacks
+):
+    dit, coo, gti, analysis = teams
+    coo.abbreviation = "CO"
+    with django_capture_on_commit_callbacks(execute=True):
+        coo.save()
+
+    assert get_team_ancestry(dit.pk) == []
+    assert get_team_ancestry(analysis.pk) == [
+        {"slug": "dit", "short_name": "DIT"},
+        {"slug": "coo", "short_name": "CO"},
+    ]
+    assert analysis.all_parents == get_team_ancestry(analysis.pk)
+
+    with django_assert_num_queries(0):
+        get_team_ancestry(gti.pk)
+
+    # Renaming a team updates the ancestry of its descendants.
+    coo.abbreviation = None
+    coo.slug = "chief-operating-office"
+    coo.save()
+
+    assert get_team_ancestry(analysis.pk)[-1] == {
+        "slug": "chief-operating-office",
+        "short_name": "COO",
+    }
@@ -20,3 +20,46 @@ def test_team_field_count():
         "It looks like you have updated the `Team` model. Please make sure you have"
         " updated `TeamAuditLogSerializer.serialize` to reflect any field changes."
     )
+
+
+def test_person_search_projection(
+    db, normal_user, software_team, django_assert_num_queries
+):
+    Person = peoplefinder.models.Person
+    person = normal_user.profile
+    peoplefinder.models.TeamMember.objects.get_or_create(
+        person=person, team=software_team, job_title="Software Engineer"
+    )
+    building = peoplefinder.models.Building.objects.first()
+    if building:
+        person.buildings.add(building)
+
+    people = Person.objects.all()
+    expected = {
+        p.pk: (
+            set(p.search_teams.split()),
+            set(p.search_job_titles.split()),
+            set(p.search_buildings.split(", ")),
+            p.search_location,
+            p.search_grade,
+        )
+        for p in people
+    }
+
+    with django_assert_num_queries(1):
+        projected_people = list(people.with_search_projection())
+
+    with django_assert_num_queries(0):
+        projected = {
+            p.pk: (
+                set(p.search_teams.split()),
+                set(p.search_job_titles.split()),
+                set(p.search_buildings.split(", ")),
+                p.search_location,
+                p.search_grade,
+            )
+            for p in projected_people
+        }
+
+    assert projected == expected
+    assert {"Software", "Engineer"} <= expected[person.pk][1]
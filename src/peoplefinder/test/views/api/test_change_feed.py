@@ -0,0 +1,69 @@
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from peoplefinder.models import AuditLog, Person
+from peoplefinder.services.audit_log import AuditLogService
+
+from .test_person import hawk_auth_sender
+
+
+@override_settings(
+    DJANGO_HAWK={
+        "HAWK_INCOMING_ACCESS_KEY": "some-id",
+        "HAWK_INCOMING_SECRET_KEY": "some-secret",
+    }
+)
+class ChangeFeedTests(TestCase):
+    def get(self, url_name, after):
+        url = f"http://testserver{reverse(url_name)}?after={after}"
+        sender = hawk_auth_sender(url=url)
+        return APIClient().get(
+            url,
+            content_type="",
+            HTTP_AUTHORIZATION=sender.request_header,
+            HTTP_X_FORWARDED_FOR="1.2.3.4, 123.123.123.123",
+        )
+
+    def setUp(self):
+        person = Person.objects.get(user__username="johnsmith")
+        self.log = AuditLogService.log(AuditLog.Action.UPDATE, person.user, person)
+        AuditLog.objects.filter(pk=self.log.pk).update(
+            timestamp=timezone.now() - timedelta(minutes=1)
+        )
+
+    def test_change_feed(self):
+        response = self.get("change-feed-list", after=self.log.pk - 1)
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["watermark"] == self.log.pk
+        assert not data["has_more"]
+        assert [(x["id"], x["type"], x["action"]) for x in data["results"]] == [
+            (self.log.pk, "person", "update")
+        ]
+
+        response = self.get("change-feed-list", after=self.log.pk)
+        assert response.json()["results"] == []
+        assert response.json()["watermark"] == self.log.pk
+
+    def test_activity_stream(self):
+        response = self.get("activity-stream-people-list", after=self.log.pk - 1)
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["type"] == "Collection"
+        assert [x["type"] for x in data["orderedItems"]] == ["Update"]
+        assert data["orderedItems"][0]["object"]["id"] == (
+            f"dit:PeopleFinder:Person:{self.log.object_id}"
+        )
+        assert "next" not in data
+
+    def test_invalid_watermark(self):
+        response = self.get("change-feed-list", after="yesterday")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
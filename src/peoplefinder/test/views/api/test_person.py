@@ -1,9 +1,23 @@
+import json
+from datetime import timedelta
+from urllib.parse import urlencode
+
 import mohawk
+from django.core.serializers.json import DjangoJSONEncoder
 from django.test import TestCase, override_settings
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.reverse import reverse
 from rest_framework.test import APIClient
 
+from peoplefinder.models import Person
+from peoplefinder.views.api.person import (
+    PersonSerializer,
+    PersonViewSet,
+    person_to_export_dict,
+)
+
+
 url_name = "person-api-people-list"
 test_url = f"http://testserver{reverse(url_name)}"
 
@@ -108,3 +122,81 @@ class PersonTests(TestCase):
 
         # sso_user_id = user.username = new format staff sso id
         assert person_returned["sso_user_id"] == "johnsmith"
+
+
+class PersonExportTests(TestCase):
+    export_url = f"http://testserver{reverse('person-api-people-export')}"
+
+    def get_export(self, url=export_url, **extra):
+        sender = hawk_auth_sender(url=url)
+        return APIClient().get(
+            url,
+            content_type="",
+            HTTP_AUTHORIZATION=sender.request_header,
+            HTTP_X_FORWARDED_FOR="1.2.3.4, 123.123.123.123",
+            **extra,
+        )
+
+    @override_settings(
+        DJANGO_HAWK={
+            "HAWK_INCOMING_ACCESS_KEY": "some-id",
+            "HAWK_INCOMING_SECRET_KEY": "some-secret",
+        }
+    )
+    def test_export_matches_serializer(self):
+        response = self.get_export()
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response["Content-Type"] == "application/x-ndjson"
+        assert "Last-Modified" in response
+
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        exported = [json.loads(line) for line in lines]
+        assert len(exported) == Person.active.count()
+
+        person = Person.active.get(user__username="johnsmith")
+        serialized = json.loads(
+            json.dumps(
+                PersonSerializer(
+                    PersonViewSet().get_full_queryset([person.pk]).get()
+                ).data,
+                cls=DjangoJSONEncoder,
+            )
+        )
+        assert serialized.keys() == person_to_export_dict(person).keys()
+        assert (
+            next(x for x in exported if x["people_finder_id"] == person.pk)
+            == serialized
+        )
+
+    @override_settings(
+        DJANGO_HAWK={
+            "HAWK_INCOMING_ACCESS_KEY": "some-id",
+            "HAWK_INCOMING_SECRET_KEY": "some-secret",
+        }
+    )
+    def test_export_updated_since(self):
+        person = Person.active.get(user__username="johnsmith")
+        Person.objects.exclude(pk=person.pk).update(
+            updated_at=timezone.now() - timedelta(days=2)
+        )
+        Person.objects.filter(pk=person.pk).update(updated_at=timezone.now())
+        updated_since = (timezone.now() - timedelta(days=1)).isoformat()
+
+        response = self.get_export(
+            url=f"{self.export_url}?{urlencode({'updated_since': updated_since})}"
+        )
+
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        assert [json.loads(line)["people_finder_id"] for line in lines] == [person.pk]
+
+    @override_settings(
+        DJANGO_HAWK={
+            "HAWK_INCOMING_ACCESS_KEY": "some-id",
+            "HAWK_INCOMING_SECRET_KEY": "some-secret",
+        }
+    )
+    def test_export_invalid_updated_since(self):
+        response = self.get_export(url=f"{self.export_url}?updated_since=yesterday")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
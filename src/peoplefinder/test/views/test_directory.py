@@ -3,6 +3,8 @@ import datetime as dt
 from waffle.testutils import override_flag
 from core.models.models import FeatureFlag
 from peoplefinder.models import Person
+from peoplefinder.services import directory as directory_service
+from django.core.cache import cache
 from django.test.client import Client
 from django.urls import reverse
 
@@ -64,3 +66,49 @@ def test_discover_with_flag_active(normal_user, another_normal_user):
             f"{jane_profile.preferred_first_name} {jane_profile.last_name}"
             not in response.content.decode()
         )
+
+
+def test_discover_keyset_pagination(normal_user, another_normal_user):
+    cache.delete(
+        directory_service.get_people_count_cache_key(
+            filter_options={}, user=normal_user
+        )
+    )
+    client = Client()
+    url = reverse("people-discover")
+    client.force_login(normal_user)
+
+    with override_flag("pf_discover", active=True), override_flag(
+        "pf_keyset_pagination", active=True
+    ):
+        response = client.get(url, {"sort_by": "first_name"})
+        assert response.status_code == 200
+        assert response.context["keyset_pagination"]
+        assert (
+            response.context["total_count"]
+            == directory_service.get_people(user=normal_user).count()
+        )
+
+        response = client.get(url, {"after": "--placeholder--"})
+        assert response.status_code == 404
+
+
+def test_discover_facets(normal_user, software_team):
+    cache.delete(
+        directory_service.get_facet_counts_cache_key(
+            filter_options={"teams": str(software_team.pk)}, user=normal_user
+        )
+    )
+    client = Client()
+    url = reverse("people-discover-facets")
+    client.force_login(normal_user)
+
+    with override_flag("pf_discover", active=True):
+        response = client.get(url, {"teams": [software_team.pk]})
+
+    assert response.status_code == 200
+    facet_counts = response.json()
+    assert facet_counts["total"] >= 1
+    assert facet_counts["facets"]["teams"][str(software_team.pk)] == (
+        facet_counts["total"]
+    )
@@ -2,9 +2,10 @@ from django.urls import include, path
 from rest_framework import routers
 
 from peoplefinder.views.activity_stream import ActivityStreamViewSet
+from peoplefinder.views.api.change_feed import ChangeFeedViewSet
 from peoplefinder.views.api.person import PersonViewSet
 from peoplefinder.views.api.team import TeamView
-from peoplefinder.views.directory import PeopleDirectory, discover
+from peoplefinder.views.directory import PeopleDirectory, discover, discover_facets
 from peoplefinder.views.home import PeopleHome, TeamHome
 from peoplefinder.views.manager import (
     ManagerCancel,
@@ -42,6 +43,7 @@ people_urlpatterns = [
     path("", PeopleHome.as_view(), name="people-home"),
     path("directory/", PeopleDirectory.as_view(), name="people-directory"),
     path("discover/", discover, name="people-discover"),
+    path("discover/facets/", discover_facets, name="people-discover-facets"),
     path(
         "delete-confirmation/",
         DeleteConfirmationView.as_view(),
@@ -164,6 +166,7 @@ router.register(
 )
 router.register("person-api", PersonViewSet, basename="person-api-people")
 router.register("team-api", TeamView, basename="team-api-teams")
+router.register("change-feed", ChangeFeedViewSet, basename="change-feed")
 
 api_urlpatterns = [
     path("", include(router.urls)),
@@ -4,11 +4,58 @@ from django_hawk.middleware import HawkResponseMiddleware
 from django_hawk_drf.authentication import HawkAuthentication
 from rest_framework.viewsets import ViewSet
 
+from peoplefinder.models import AuditLog
+from peoplefinder.views.api.change_feed import get_change_feed, get_change_type
+
+
+ACTIVITY_TYPES = {
+    AuditLog.Action.CREATE: "Create",
+    AuditLog.Action.UPDATE: "Update",
+    AuditLog.Action.DELETE: "Delete",
+}
+
+
+def audit_log_to_activity(change: AuditLog) -> dict:
+    object_type = f"dit:PeopleFinder:{get_change_type(change).title()}"
+    activity = {
+        "id": f"dit:PeopleFinder:AuditLog:{change.pk}:{ACTIVITY_TYPES[change.action]}",
+        "type": ACTIVITY_TYPES[change.action],
+        "published": change.timestamp,
+        "object": {
+            "id": f"{object_type}:{change.object_id}",
+            "type": object_type,
+            "dit:PeopleFinder:diff": change.diff,
+        },
+    }
+    if change.actor:
+        activity["actor"] = {
+            "id": f"dit:StaffSSO:User:{change.actor.legacy_sso_user_id}",
+            "type": "Person",
+        }
+
+    return activity
+
 
 class ActivityStreamViewSet(ViewSet):
+    """An Activity Streams 2.0 feed of the changes to people and teams."""
+
     authentication_classes = (HawkAuthentication,)
     permission_classes = ()
 
     @decorator_from_middleware(HawkResponseMiddleware)
     def list(self, request):
-        return JsonResponse({"test_data": 1})
+        changes, watermark, has_more = get_change_feed(request)
+
+        feed = {
+            "@context": "https://www.w3.org/ns/activitystreams",
+            "type": "Collection",
+            "orderedItems": [audit_log_to_activity(change) for change in changes],
+        }
+        if has_more:
+            query_params = request.query_params.copy()
+            query_params["after"] = watermark
+            feed["next"] = request.build_absolute_uri(
+                f"{request.path}?{query_params.urlencode()}"
+            )
+
+        return JsonResponse(feed)
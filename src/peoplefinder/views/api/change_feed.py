@@ -0,0 +1,86 @@
+from django.conf import settings
+from django.http import JsonResponse
+from django.utils.decorators import decorator_from_middleware
+from django_hawk.middleware import HawkResponseMiddleware
+from django_hawk_drf.authentication import HawkAuthentication
+from rest_framework.exceptions import ValidationError
+from rest_framework.viewsets import ViewSet
+
+from peoplefinder.models import AuditLog, Person, Team
+from peoplefinder.services.audit_log import AuditLogService
+
+
+# The change feed type of each model included in the feed
+CHANGE_FEED_TYPES = {
+    Person: "person",
+    Team: "team",
+}
+
+
+def get_change_feed_params(request) -> tuple[int, int]:
+    """Return the watermark and page size requested for a change feed."""
+    try:
+        after = int(request.query_params.get("after", 0))
+        page_size = int(
+            request.query_params.get("page_size", settings.PAGINATION_PAGE_SIZE)
+        )
+    except ValueError:
+        raise ValidationError("after and page_size must be integers") from None
+
+    if after < 0 or page_size < 1:
+        raise ValidationError("after and page_size must be positive")
+
+    return after, min(page_size, settings.PAGINATION_MAX_PAGE_SIZE)
+
+
+def get_change_feed(request) -> tuple[list[AuditLog], int, bool]:
+    """Return the changes after the requested watermark.
+
+    Returns:
+        The changes, the watermark to request the next page with and whether
+        there are more changes to request.
+    """
+    after, page_size = get_change_feed_params(request)
+    changes = AuditLogService.get_changes(
+        after=after, limit=page_size, model_classes=CHANGE_FEED_TYPES.keys()
+    )
+    watermark = changes[-1].pk if changes else after
+
+    return changes, watermark, len(changes) == page_size
+
+
+def get_change_type(change: AuditLog) -> str:
+    return CHANGE_FEED_TYPES[change.content_type.model_class()]
+
+
+class ChangeFeedViewSet(ViewSet):
+    """The people and teams that have been created, updated or deleted.
+
+    Pass the `watermark` from the previous response as `after` to get the
+    changes since then. Keep requesting while `has_more` is true.
+    """
+
+    authentication_classes = (HawkAuthentication,)
+    permission_classes = ()
+
+    @decorator_from_middleware(HawkResponseMiddleware)
+    def list(self, request):
+        changes, watermark, has_more = get_change_feed(request)
+
+        return JsonResponse(
+            {
+                "results": [
+                    {
+                        "id": change.pk,
+                        "type": get_change_type(change),
+                        "object_id": change.object_id,
+                        "action": change.action,
+                        "timestamp": change.timestamp,
+                        "diff": change.diff,
+                    }
+                    for change in changes
+                ],
+                "watermark": watermark,
+                "has_more": has_more,
+            }
+        )
@@ -1,8 +1,20 @@
+import datetime
+import json
+from typing import Iterator
+
 from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Prefetch
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from django.utils.decorators import decorator_from_middleware
+from django.utils.http import http_date, parse_http_date_safe
 from django_hawk.middleware import HawkResponseMiddleware
 from django_hawk_drf.authentication import HawkAuthentication
 from rest_framework import serializers
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.viewsets import ReadOnlyModelViewSet
 
 from peoplefinder.models import Person, TeamMember
@@ -214,6 +226,136 @@ class PersonSerializer(serializers.ModelSerializer):
         return settings.WAGTAILADMIN_BASE_URL + obj.get_absolute_url()
 
 
+_to_datetime_representation = serializers.DateTimeField().to_representation
+_to_image_representation = serializers.ImageField().to_representation
+
+
+def _format_names(names: Iterator[str]) -> str | None:
+    # Matches the `StringAgg(..., distinct=True)` annotations.
+    return ", ".join(sorted(set(names))) or None
+
+
+def person_to_export_dict(person: Person) -> dict:
+    """Return the same data as `PersonSerializer`, without the serializer.
+
+    Building the dict directly is much quicker than the serializer for the
+    whole directory, and the aggregated fields are computed from prefetched
+    relations rather than `get_annotated()`. Keep in sync with
+    `PersonSerializer`.
+    """
+    user = person.user
+    roles = person.roles.all()
+    workday_codes = {workday.code for workday in person.workdays.all()}
+    uk_office_location = person.uk_office_location
+    formatted_location_parts = (
+        person.location_in_building,
+        *[building.name for building in person.buildings.all()],
+        person.town_city_or_region,
+    )
+
+    return {
+        "people_finder_id": person.pk,
+        "staff_sso_id": user.legacy_sso_user_id if user else None,
+        "email": person.email,
+        "contact_email": person.contact_email,
+        "full_name": person.full_name,
+        "first_name": person.first_name,
+        "last_name": person.last_name,
+        "profile_url": settings.WAGTAILADMIN_BASE_URL + person.get_absolute_url(),
+        "roles": [
+            {
+                "role": role.job_title,
+                "team_name": role.team.name,
+                "team_id": role.team_id,
+                "leader": role.head_of_team,
+            }
+            for role in roles
+        ],
+        "formatted_roles": sorted(
+            {
+                f"{role.job_title} in {role.team.name}"
+                + (" (head of team)" if role.head_of_team else "")
+                for role in roles
+            }
+        )
+        or None,
+        "manager_people_finder_id": person.manager_id,
+        "completion_score": person.profile_completion,
+        "is_stale": person.is_stale,
+        "works_monday": "mon" in workday_codes,
+        "works_tuesday": "tue" in workday_codes,
+        "works_wednesday": "wed" in workday_codes,
+        "works_thursday": "thu" in workday_codes,
+        "works_friday": "fri" in workday_codes,
+        "works_saturday": "sat" in workday_codes,
+        "works_sunday": "sun" in workday_codes,
+        "primary_phone_number": person.primary_phone_number,
+        "secondary_phone_number": person.secondary_phone_number,
+        "formatted_location": (
+            ", ".join(filter(None, formatted_location_parts))
+            if any(formatted_location_parts)
+            else None
+        ),
+        "city": (
+            uk_office_location.city
+            if uk_office_location
+            else person.town_city_or_region
+        ),
+        "country": person.country.iso_2_code if person.country else None,
+        "country_name": str(person.country) if person.country else None,
+        "grade": person.grade.code if person.grade else None,
+        "formatted_grade": str(person.grade) if person.grade else None,
+        "uk_office_location": uk_office_location.name if uk_office_location else None,
+        "location_in_building": person.location_in_building,
+        "location_other_uk": person.regional_building,
+        "location_other_overseas": person.international_building,
+        "key_skills": [x.code for x in person.key_skills.all()],
+        "other_key_skills": person.other_key_skills,
+        "formatted_key_skills": _format_names(x.name for x in person.key_skills.all()),
+        "learning_and_development": [x.code for x in person.learning_interests.all()],
+        "other_learning_and_development": person.other_learning_interests,
+        "formatted_learning_and_development": _format_names(
+            x.name for x in person.learning_interests.all()
+        ),
+        "networks": [x.code for x in person.networks.all()],
+        "formatted_networks": _format_names(x.name for x in person.networks.all()),
+        "professions": [x.code for x in person.professions.all()],
+        "formatted_professions": _format_names(
+            x.name for x in person.professions.all()
+        ),
+        "additional_responsibilities": [x.code for x in person.additional_roles.all()],
+        "other_additional_responsibilities": person.other_additional_roles,
+        "formatted_additional_responsibilities": _format_names(
+            x.name for x in person.additional_roles.all()
+        ),
+        "language_fluent": person.fluent_languages,
+        "language_intermediate": person.intermediate_languages,
+        "created_at": _to_datetime_representation(person.created_at),
+        "last_edited_or_confirmed_at": _to_datetime_representation(
+            person.edited_or_confirmed_at
+        ),
+        "login_count": person.login_count,
+        "last_login_at": (
+            _to_datetime_representation(user.last_login)
+            if user and user.last_login
+            else None
+        ),
+        "legacy_sso_user_id": person.legacy_sso_user_id,
+        "sso_user_id": user.username if user else None,
+        "slug": str(person.slug),
+        "manager_slug": person.manager.slug if person.manager else None,
+        "legacy_people_finder_slug": person.legacy_slug,
+        "photo": _to_image_representation(person.photo) if person.photo else None,
+        "photo_small": (
+            _to_image_representation(person.photo_small) if person.photo_small else None
+        ),
+    }
+
+
+# Rows fetched from the server-side cursor, and prefetched for, at a time.
+EXPORT_CHUNK_SIZE = 2000
+
+
 # WARNING: We need PersonPagination and PersonViewSet.get_full_queryset to have the same
 # ordering for the performance optimisations to work.
 PERSON_ORDERING = "-pk"
@@ -262,6 +404,91 @@ class PersonViewSet(ReadOnlyModelViewSet):
         # and finally return the modified response
         return response
 
+    # Unlike `list`, the response isn't signed by `HawkResponseMiddleware` as the
+    # body isn't known until it has been streamed.
+    @action(detail=False, url_path="export")
+    def export(self, request):
+        """Stream every active person as newline delimited JSON.
+
+        Pass `updated_since` (ISO 8601) or an `If-Modified-Since` header to
+        only export the people updated since then. People who have left since
+        then are included as `{"people_finder_id": ..., "deleted": true}`.
+
+        The `Last-Modified` header is the time the export started, to be used
+        as the start of the next incremental export.
+        """
+        started_at = timezone.now()
+        updated_since = self.get_export_updated_since(request)
+
+        people = self.get_export_queryset()
+        left = Person.objects.none()
+        if updated_since:
+            people = people.filter(updated_at__gte=updated_since)
+            left = Person.objects.filter(
+                is_active=False, became_inactive__gte=updated_since
+            )
+
+        def export_lines():
+            chunk = []
+            for person in people.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+                chunk.append(
+                    json.dumps(person_to_export_dict(person), cls=DjangoJSONEncoder)
+                )
+                if len(chunk) >= EXPORT_CHUNK_SIZE:
+                    yield "\n".join(chunk) + "\n"
+                    chunk = []
+
+            for pk in left.values_list("pk", flat=True).iterator():
+                chunk.append(json.dumps({"people_finder_id": pk, "deleted": True}))
+
+            if chunk:
+                yield "\n".join(chunk) + "\n"
+
+        response = StreamingHttpResponse(
+            export_lines(), content_type="application/x-ndjson"
+        )
+        response["Last-Modified"] = http_date(started_at.timestamp())
+        return response
+
+    def get_export_updated_since(self, request):
+        if updated_since := request.query_params.get("updated_since"):
+            try:
+                value = parse_datetime(updated_since)
+            except ValueError:
+                value = None
+            if value is None:
+                raise ValidationError({"updated_since": "Invalid ISO 8601 datetime"})
+            if timezone.is_naive(value):
+                value = timezone.make_aware(value, datetime.timezone.utc)
+            return value
+
+        if if_modified_since := request.headers.get("If-Modified-Since"):
+            if timestamp := parse_http_date_safe(if_modified_since):
+                return datetime.datetime.fromtimestamp(
+                    timestamp, tz=datetime.timezone.utc
+                )
+
+        return None
+
+    def get_export_queryset(self):
+        return (
+            Person.active.select_related(
+                "country", "grade", "user", "manager", "uk_office_location"
+            )
+            .prefetch_related(
+                Prefetch("roles", queryset=TeamMember.objects.select_related("team")),
+                "key_skills",
+                "workdays",
+                "learning_interests",
+                "networks",
+                "professions",
+                "additional_roles",
+                "buildings",
+            )
+            .defer("do_not_work_for_dit")
+            .order_by("pk")
+        )
+
     def get_full_queryset(self, pks):
         return (
             Person.active.get_annotated()
@@ -5,6 +5,7 @@ from rest_framework import serializers
 from rest_framework.viewsets import ReadOnlyModelViewSet
 
 from peoplefinder.models import Team
+from peoplefinder.services.team_hierarchy import get_team_hierarchy
 
 from .base import ApiPagination
 
@@ -19,13 +20,17 @@ class TeamSerializer(serializers.ModelSerializer):
         model = Team
         fields = ["team_id", "team_name", "parent_id", "ancestry"]
 
-    def get_parent_id(self, obj):
-        parents = obj.ancestry[:-1]
+    @property
+    def team_hierarchy(self):
+        if "team_hierarchy" not in self.context:
+            self.context["team_hierarchy"] = get_team_hierarchy()
+        return self.context["team_hierarchy"]
 
-        return parents[-1] if parents else None
+    def get_parent_id(self, obj):
+        return self.team_hierarchy.get_parent_id(obj.pk)
 
     def get_ancestry(self, obj):
-        return "/".join(map(str, obj.ancestry[:-1]))
+        return "/".join(map(str, self.team_hierarchy.get_ancestor_ids(obj.pk)))
 
 
 class TeamPagination(ApiPagination):
@@ -41,4 +46,10 @@ class TeamView(ReadOnlyModelViewSet):
     pagination_class = TeamPagination
 
     def get_queryset(self):
-        return Team.objects.with_parents()
+        return Team.objects.all()
+
+    def get_serializer_context(self):
+        # Share one hierarchy snapshot between all the teams on the page.
+        return super().get_serializer_context() | {
+            "team_hierarchy": get_team_hierarchy()
+        }
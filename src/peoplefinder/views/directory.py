@@ -5,13 +5,21 @@ from django.core import paginator
 from django.db.models import OuterRef, Subquery
 from django.db.models.query import QuerySet
 from django.forms import Field
-from django.http import HttpRequest, HttpResponse, HttpResponseRedirect, QueryDict
+from django.http import (
+    Http404,
+    HttpRequest,
+    HttpResponse,
+    HttpResponseRedirect,
+    JsonResponse,
+    QueryDict,
+)
 from django.shortcuts import redirect
 from django.template.response import TemplateResponse
 from django.urls import reverse
 from django.views.generic import ListView
 
 from core import flags
+from core.pagination import InvalidCursor, KeysetPaginator
 from core.utils import flag_is_active
 from peoplefinder.models import Person, Team, TeamMember
 from peoplefinder.services import directory as directory_service
@@ -51,6 +59,20 @@ class PeopleDirectory(ListView):
 
         return queryset.order_by("first_name", "last_name")
 
+    def paginate_queryset(self, queryset, page_size):
+        if not flag_is_active(self.request, flags.PF_KEYSET_PAGINATION):
+            return super().paginate_queryset(queryset, page_size)
+
+        keyset_paginator = KeysetPaginator(
+            queryset, ordering=("first_name", "last_name"), per_page=page_size
+        )
+        try:
+            page = keyset_paginator.page(self.request.GET.get("after"))
+        except InvalidCursor:
+            raise Http404("Invalid page") from None
+
+        return (keyset_paginator, page, page.object_list, page.has_other_pages())
+
     def get_context_data(self, **kwargs: Any) -> dict[str, Any]:
         context = super().get_context_data(**kwargs)
         page_title = "All people"
@@ -71,6 +93,7 @@ class PeopleDirectory(ListView):
             search_query=self.request.GET.get("query", ""),
             root_team=root_team,
             is_root_team=self.team == root_team,
+            keyset_pagination=isinstance(context["paginator"], KeysetPaginator),
         )
         return context
 
@@ -84,8 +107,9 @@ def get_url_for_removed_filter(
     get_vars: QueryDict = request.GET.copy()
 
     # changing filters always means going back to page 1
-    if "page" in get_vars.keys():
-        get_vars.pop("page")
+    for pagination_key in ["page", "after"]:
+        if pagination_key in get_vars.keys():
+            get_vars.pop(pagination_key)
 
     if field is not None:
         current_field_values: list = get_vars.pop(field)
@@ -129,12 +153,29 @@ def discover(request: HttpRequest) -> HttpResponse | HttpResponseRedirect:
         filter_options=request.GET, user=request.user
     )
 
-    pr = paginator.Paginator(discover_filters.qs, per_page=30)
-    page: int = int(request.GET.get("page", default=1))
-    try:
-        paginator_page = pr.page(page)
-    except paginator.EmptyPage:
-        paginator_page = None
+    keyset_pagination = flag_is_active(request, flags.PF_KEYSET_PAGINATION)
+    total_count = None
+    if keyset_pagination:
+        try:
+            paginator_page = directory_service.get_keyset_page(
+                discover_filters=discover_filters,
+                cursor=request.GET.get("after"),
+                per_page=30,
+            )
+        except InvalidCursor:
+            raise Http404("Invalid page") from None
+        total_count = directory_service.get_people_count(
+            filter_options=request.GET,
+            user=request.user,
+            discover_filters=discover_filters,
+        )
+    else:
+        pr = paginator.Paginator(discover_filters.qs, per_page=30)
+        page: int = int(request.GET.get("page", default=1))
+        try:
+            paginator_page = pr.page(page)
+        except paginator.EmptyPage:
+            paginator_page = None
 
     selected_filters = {
         field_name: {
@@ -158,6 +199,8 @@ def discover(request: HttpRequest) -> HttpResponse | HttpResponseRedirect:
     context = {
         "page_title": "Find colleagues",
         "pages": paginator_page,
+        "keyset_pagination": keyset_pagination,
+        "total_count": total_count,
         "extra_breadcrumbs": [
             (None, "Discover"),
         ],
@@ -172,3 +215,18 @@ def discover(request: HttpRequest) -> HttpResponse | HttpResponseRedirect:
     return TemplateResponse(
         request=request, template="peoplefinder/discover.html", context=context
     )
+
+
+def discover_facets(request: HttpRequest) -> JsonResponse:
+    """
+    Returns how many people match each option of the discover filters, given
+    the currently selected filters.
+    """
+    if not flag_is_active(request, flags.PF_DISCOVER):
+        raise Http404
+
+    return JsonResponse(
+        directory_service.get_facet_counts(
+            filter_options=request.GET, user=request.user
+        )
+    )
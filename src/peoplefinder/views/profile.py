@@ -43,7 +43,6 @@ from peoplefinder.models import Person
 from peoplefinder.services.audit_log import AuditLogService
 from peoplefinder.services.image import ImageService
 from peoplefinder.services.person import PersonService
-from peoplefinder.services.team import TeamService
 from peoplefinder.types import EditSections, ProfileSections
 
 from .base import HtmxFormView, PeoplefinderView
@@ -126,9 +125,7 @@ class ProfileDetailView(ProfileView, DetailView):
             context["team"] = team
             # TODO: `parent_teams` is common to all views. Perhaps we should
             # refactor this into a common base view or mixin?
-            context["parent_teams"] = list(TeamService().get_all_parent_teams(team)) + [
-                team
-            ]
+            context["parent_teams"] = team.all_parents + [team]
 
         if self.request.user == profile.user or self.request.user.has_perm(
             "peoplefinder.view_auditlog"
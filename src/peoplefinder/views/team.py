@@ -1,7 +1,6 @@
 from django.contrib.auth.mixins import PermissionRequiredMixin
 from django.core.exceptions import SuspiciousOperation
 from django.db import models, transaction
-from django.db.models import QuerySet
 from django.http import HttpRequest
 from django.http.response import HttpResponse as HttpResponse
 from django.shortcuts import redirect
@@ -50,16 +49,22 @@ class TeamDetailView(DetailView, PeoplefinderView):
         return response
 
     @cached_property
-    def parent_teams(self) -> QuerySet[Team]:
-        return TeamService().get_all_parent_teams(self.object)
+    def parent_teams(self) -> list[dict[str, str]]:
+        return self.object.all_parents
 
     @cached_property
     def sub_teams(self) -> list[Team]:
         sub_teams = []
 
         team_service = TeamService()
-        for sub_team in team_service.get_immediate_child_teams(self.object):
-            profile_completion = team_service.profile_completion(sub_team)
+        immediate_child_teams = list(
+            team_service.get_immediate_child_teams(self.object)
+        )
+        profile_completions = team_service.get_profile_completions(
+            immediate_child_teams
+        )
+        for sub_team in immediate_child_teams:
+            profile_completion = profile_completions[sub_team.pk]
             if profile_completion:
                 profile_completion_percentage = round(
                     float(profile_completion * 100), 2
@@ -207,11 +212,10 @@ class TeamTreeView(DetailView, PeoplefinderView):
         context = super().get_context_data(**kwargs)
 
         team = context["team"]
-        team_service = TeamService()
         page_title = f"All sub-teams ({team.short_name})"
 
         context.update(
-            parent_teams=team_service.get_all_parent_teams(team),
+            parent_teams=team.all_parents,
             team_breadcrumbs=True,
             extra_breadcrumbs=[(None, page_title)],
             page_title=page_title,
@@ -0,0 +1,25 @@
+from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save
+from wagtail.signals import page_published, page_unpublished
+
+
+def clear_search_results_cache(sender, **kwargs):
+    from search.cache import bump_results_generation
+
+    bump_results_generation()
+
+
+class SearchConfig(AppConfig):
+    name = "search"
+
+    def ready(self):
+        page_published.connect(clear_search_results_cache)
+        page_unpublished.connect(clear_search_results_cache)
+        for sender in [
+            "content.SearchPinPageLookUp",
+            "content.SearchExclusionPageLookUp",
+            "wagtailcore.PageViewRestriction",
+            "extended_search.Setting",
+        ]:
+            post_save.connect(clear_search_results_cache, sender=sender)
+            post_delete.connect(clear_search_results_cache, sender=sender)
@@ -0,0 +1,64 @@
+import hashlib
+import time
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+from search.utils import clean_search_query, normalize_query
+
+
+# Part of every results cache key, bumped to invalidate all cached results at
+# once whenever pages, pins, exclusions or search settings change
+RESULTS_GENERATION_CACHE_KEY = "search__results_generation"
+
+
+def get_results_generation() -> int:
+    # Seed with the time so a lost key can't bring back an old generation
+    cache.add(RESULTS_GENERATION_CACHE_KEY, int(time.time()), timeout=None)
+    return cache.get(RESULTS_GENERATION_CACHE_KEY)
+
+
+def bump_results_generation(*args, **kwargs):
+    """
+    Invalidate every cached search result, usable as a signal receiver.
+    """
+    try:
+        cache.incr(RESULTS_GENERATION_CACHE_KEY)
+    except ValueError:
+        get_results_generation()
+
+
+def get_results_cache_key(
+    generation: int, query_str: str, key: str, start: int, stop: int
+) -> str:
+    """
+    Return the cache key for one window of a category's results.
+
+    Queries that only differ in whitespace ("pay", " pay ") share an entry.
+    Any other cleaning would change what is searched for, e.g. the "@" in an
+    email address, so those queries are keyed as they are.
+    """
+    query = clean_search_query(query_str)
+    if query != normalize_query(query_str):
+        query = query_str
+    query_hash = hashlib.md5(query.encode(), usedforsecurity=False).hexdigest()
+    return f"search__results__{generation}__{key}__{start}_{stop}__{query_hash}"
+
+
+def get_cached_results(cache_keys: list[str]) -> dict[str, dict]:
+    """
+    Return the cached `{"hits": [(pk, score), ...], "total": int}` entries for
+    the given keys, skipping any that aren't cached.
+    """
+    if not cache_keys:
+        return {}
+    return cache.get_many(cache_keys)
+
+
+def set_cached_results(entries: dict[str, dict], timeout: Optional[int] = None):
+    if not entries:
+        return
+    if timeout is None:
+        timeout = settings.SEARCH_RESULTS_CACHE_TIMEOUT
+    cache.set_many(entries, timeout=timeout)
@@ -1,15 +1,103 @@
+import contextvars
+import logging
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Optional
+
 from django.conf import settings
-from wagtail.search.query import Phrase
+from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models.query import ModelIterable
+from wagtail.search.backends import get_search_backend
+from wagtail.search.backends.base import EmptySearchResults
+from wagtail.search.query import MATCH_ALL, Phrase
 
 from content.models import BasePage
+from extended_search.index import FilterField
+from extended_search.metrics import timed
+from extended_search.query import Filtered, Templated
 from extended_search.query_builder import CustomQueryBuilder
 from news.models import NewsPage
 from peoplefinder.models import Person, Team
+from search import cache as results_cache
+from search.utils import split_query
 from tools.models import Tool
 from working_at_dit.models import PoliciesAndGuidanceHome
 
 
+logger = logging.getLogger(__name__)
+
+# Shared by all requests in the process, this only runs OpenSearch requests
+autocomplete_executor = ThreadPoolExecutor(
+    max_workers=8, thread_name_prefix="search-autocomplete"
+)
+
+# Relations used when rendering or exporting page results, loaded along with
+# the page types that have them
+PAGE_RESULT_SELECT_RELATED = [
+    "page_author",
+    "content_owner",
+    "preview_image",
+    "owner__profile",
+    "latest_revision__user",
+]
+
+
+def has_field_path(model, lookup: str) -> bool:
+    for field_name in lookup.split("__"):
+        try:
+            field = model._meta.get_field(field_name)
+        except FieldDoesNotExist:
+            return False
+        model = field.related_model
+    return True
+
+
+class PageSearchResultsIterable(ModelIterable):
+    """
+    Yields the specific pages of a queryset in order, like `.specific()`, but
+    loads each page type with the relations its results are rendered with
+    instead of leaving them to be loaded one row at a time.
+
+    This runs one query for the page ids and types, then one per page type
+    present, however many results there are.
+    """
+
+    def __iter__(self):
+        pks_and_types = list(self.queryset.values_list("pk", "content_type"))
+
+        pks_by_type = defaultdict(list)
+        for pk, content_type in pks_and_types:
+            pks_by_type[content_type].append(pk)
+
+        pages_by_pk = {}
+        for content_type, pks in pks_by_type.items():
+            model = (
+                ContentType.objects.get_for_id(content_type).model_class()
+                or self.queryset.model
+            )
+            select_related = [
+                lookup
+                for lookup in PAGE_RESULT_SELECT_RELATED
+                if has_field_path(model, lookup)
+            ]
+            pages = model._default_manager.filter(pk__in=pks).select_related(
+                *select_related
+            )
+            pages_by_pk.update({page.pk: page for page in pages})
+
+        for pk, _ in pks_and_types:
+            if page := pages_by_pk.get(pk):
+                yield page
+
+
 class SearchVector:
+    # Whether the results are the same for every user, so can be shared
+    # through the results cache
+    cache_results = False
+    # Whether `search_pinned` can find the pinned results in the index
+    has_indexed_pinned_results = False
+
     def __init__(self, request):
         self.request = request
 
@@ -25,6 +113,7 @@ class SearchVector:
     def get_queryset(self):
         raise NotImplementedError
 
+    @timed("prepare")
     def search(self, query_str, *args, **kwargs):
         queryset = self.get_queryset()
         return self._wagtail_search(queryset, query_str, *args, **kwargs)
@@ -36,6 +125,26 @@ class SearchVector:
     def pinned(self, query):
         return []
 
+    def search_pinned(self, query_str):
+        return EmptySearchResults()
+
+    @timed("hydrate")
+    def get_results_from_hits(self, hits: list[tuple[int, float]]) -> list:
+        """
+        Load the objects for cached `(pk, score)` hits in a single query,
+        keeping their order and dropping any no longer in the queryset.
+        """
+        objects_by_pk = {
+            obj.pk: obj
+            for obj in self.get_queryset().filter(pk__in=[pk for pk, _ in hits])
+        }
+        results = []
+        for pk, score in hits:
+            if obj := objects_by_pk.get(pk):
+                obj._score = score
+                results.append(obj)
+        return results
+
 
 class ModelSearchVector(SearchVector):
     model = None
@@ -48,8 +157,11 @@ class ModelSearchVector(SearchVector):
             if new_query_str := query_str[13:]:
                 # A query beginning with `EXACT_SEARCH ` we search for an exact match.
                 return Phrase(new_query_str)
+        if settings.SEARCH_ENABLE_COMPILED_QUERY_CACHE:
+            return Templated(self.model, query_str)
         return CustomQueryBuilder.get_search_query(self.model, query_str)
 
+    @timed("prepare")
     def search(self, query_str, *args, **kwargs):
         queryset = self.get_queryset()
         built_query = self.build_query(query_str, *args, **kwargs)
@@ -57,19 +169,58 @@ class ModelSearchVector(SearchVector):
 
 
 class PagesSearchVector(ModelSearchVector):
+    cache_results = True
+
     def get_queryset(self):
-        return super().get_queryset().public_or_login().live().specific()
+        queryset = super().get_queryset().public_or_login().live()
+        # Hydrate the specific pages in bulk, see `PageSearchResultsIterable`
+        queryset = queryset._chain()
+        queryset._iterable_class = PageSearchResultsIterable
+        return queryset
+
+    @property
+    def has_indexed_pinned_results(self):
+        return settings.SEARCH_FILTER_PHRASES_IN_INDEX
 
     def pinned(self, query_str):
         return self.get_queryset().pinned(query_str)
 
+    @timed("prepare")
+    def search_pinned(self, query_str):
+        """
+        Search the index for the pages pinned to the query, so they can be
+        fetched in the same `SearchBatch` as the results.
+        """
+        if not (query_parts := split_query(query_str)):
+            return EmptySearchResults()
+
+        built_query = Filtered(
+            subquery=MATCH_ALL,
+            filters=[(FilterField("search_pinned_phrases"), "includes", query_parts)],
+        )
+        return self._wagtail_search(self.get_queryset(), built_query)
+
     def autocomplete(self, query_str, *args, **kwargs):
         queryset = self.get_queryset().not_pinned(query_str)
         return self._wagtail_autocomplete(queryset, query_str, *args, **kwargs)
 
+    @timed("prepare")
     def search(self, query_str, *args, **kwargs):
-        queryset = self.get_queryset().not_pinned(query_str)
+        queryset = self.get_queryset()
         built_query = self.build_query(query_str, *args, **kwargs)
+
+        if not settings.SEARCH_FILTER_PHRASES_IN_INDEX:
+            queryset = queryset.not_pinned(query_str)
+        elif query_parts := split_query(query_str):
+            # Pinned pages are shown separately and excluded pages not at all
+            built_query = Filtered(
+                subquery=built_query,
+                filters=[
+                    (FilterField("search_pinned_phrases"), "excludes", query_parts),
+                    (FilterField("search_excluded_phrases"), "excludes", query_parts),
+                ],
+            )
+
         return self._wagtail_search(queryset, built_query, *args, **kwargs)
 
 
@@ -115,5 +266,232 @@ class PeopleSearchVector(ModelSearchVector):
 class TeamsSearchVector(ModelSearchVector):
     model = Team
 
+
+class PinnedSearchVector(SearchVector):
+    """
+    The pinned results of another search vector, so they can be added to a
+    `SearchBatch` like any other search.
+    """
+
+    def __init__(self, search_vector: SearchVector):
+        super().__init__(search_vector.request)
+        self.search_vector = search_vector
+        self.cache_results = search_vector.cache_results
+
     def get_queryset(self):
-        return super().get_queryset().with_all_parents()
+        return self.search_vector.get_queryset()
+
+    def search(self, query_str, *args, **kwargs):
+        return self.search_vector.search_pinned(query_str)
+
+
+class BatchedSearchResults:
+    """
+    A list-like window onto one category's results from a `SearchBatch`,
+    usable with Django's `Paginator` and with slicing in the template tags.
+    """
+
+    def __init__(self, results: list, total: int, start: int, stop: int):
+        self.results = results
+        self.total = total
+        self.start = start
+        self.stop = stop
+
+    def covers(self, start: int, stop: int) -> bool:
+        return self.start <= start and stop <= self.stop
+
+    def count(self) -> int:
+        return self.total
+
+    def __len__(self) -> int:
+        return self.total
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start = (key.start or 0) - self.start
+            stop = None if key.stop is None else key.stop - self.start
+            return self.results[max(start, 0) : stop]
+        return self.results[key - self.start]
+
+
+class SearchBatch:
+    """
+    Collects the searches needed to render a search page and runs them in a
+    single OpenSearch `_msearch` round trip, so the results and totals for
+    every category can be shared between the template tags.
+    """
+
+    def __init__(self, query_str: str):
+        self.query_str = query_str
+        self.searches: dict[str, tuple[SearchVector, int, int]] = {}
+        self.batched_results: dict[str, BatchedSearchResults] = {}
+        self.executed = False
+
+    def add(self, key: str, search_vector: SearchVector, start: int, stop: int):
+        """
+        Add a search vector to the batch, fetching hits between `start` and
+        `stop`. Use `start=0, stop=0` to only fetch the total.
+        """
+        self.searches[key] = (search_vector, start, stop)
+
+    def execute(self):
+        search_backend = get_search_backend()
+        keys = []
+        search_results = []
+
+        cache_keys = self._get_results_cache_keys()
+        cached_results = results_cache.get_cached_results(list(cache_keys.values()))
+
+        for key, (search_vector, start, stop) in self.searches.items():
+            if cached := cached_results.get(cache_keys.get(key)):
+                self.batched_results[key] = BatchedSearchResults(
+                    search_vector.get_results_from_hits(cached["hits"]),
+                    cached["total"],
+                    start,
+                    stop,
+                )
+                continue
+
+            results = search_vector.search(self.query_str)
+            if results.backend is None:
+                # EmptySearchResults, e.g. there was nothing left to query for
+                self.batched_results[key] = BatchedSearchResults([], 0, start, stop)
+                continue
+            keys.append(key)
+            search_results.append(results[start:stop])
+
+        totals = search_backend.msearch(search_results) if search_results else []
+
+        entries_to_cache = {}
+        for key, results, total in zip(keys, search_results, totals, strict=True):
+            _, start, stop = self.searches[key]
+            if total is None:
+                # This part of the msearch failed, fall back to a separate count
+                total = self.searches[key][0].search(self.query_str).count()
+            results = list(results)
+            self.batched_results[key] = BatchedSearchResults(
+                results, total, start, stop
+            )
+            if key in cache_keys:
+                entries_to_cache[cache_keys[key]] = {
+                    "hits": [
+                        (result.pk, getattr(result, "_score", None))
+                        for result in results
+                    ],
+                    "total": total,
+                }
+
+        results_cache.set_cached_results(entries_to_cache)
+        self.executed = True
+
+    def _get_results_cache_keys(self) -> dict[str, str]:
+        """
+        Return the results cache key for each search in the batch whose
+        results can be shared between users.
+        """
+        if not settings.SEARCH_ENABLE_RESULTS_CACHE:
+            return {}
+
+        cacheable_searches = {
+            key: (start, stop)
+            for key, (search_vector, start, stop) in self.searches.items()
+            if search_vector.cache_results
+        }
+        if not cacheable_searches:
+            return {}
+
+        generation = results_cache.get_results_generation()
+        return {
+            key: results_cache.get_results_cache_key(
+                generation, self.query_str, key, start, stop
+            )
+            for key, (start, stop) in cacheable_searches.items()
+        }
+
+    def get_results(
+        self, key: str, start: int, stop: int
+    ) -> Optional[BatchedSearchResults]:
+        """
+        Return the batched results for `key` if they cover the requested
+        window, otherwise None so the caller can run its own search.
+        """
+        batched_results = self.batched_results.get(key)
+        if batched_results and batched_results.covers(start, stop):
+            return batched_results
+        return None
+
+    def get_count(self, key: str) -> Optional[int]:
+        if batched_results := self.batched_results.get(key):
+            return batched_results.total
+        return None
+
+
+def iter_result_chunks(search_results, chunk_size: int = 100):
+    """
+    Yield the whole of a search's results as lists of up to `chunk_size`
+    results, without holding more than one chunk in memory.
+    """
+    if hasattr(search_results, "iter_chunks"):
+        yield from search_results.iter_chunks(chunk_size)
+    elif results := list(search_results):
+        # e.g. EmptySearchResults
+        yield results
+
+
+def autocomplete_fan_out(
+    search_vectors: dict[str, SearchVector],
+    query_str: str,
+    limit: int,
+    timeout: float,
+) -> dict[str, list]:
+    """
+    Run the autocomplete query for each search vector concurrently, returning
+    the (limited) results for each key.
+
+    Queries are compiled and results hydrated in the calling thread; only the
+    OpenSearch round trips run in the executor. A vector that errors or takes
+    longer than `timeout` seconds returns no results rather than failing the
+    whole response.
+    """
+    search_backend = get_search_backend()
+    search_results = {}
+    futures = {}
+
+    for key, search_vector in search_vectors.items():
+        results = search_vector.autocomplete(query_str)[:limit]
+        search_results[key] = results
+        if results.backend is not None and hasattr(results, "get_msearch_request"):
+            futures[key] = autocomplete_executor.submit(
+                # Keep the search category for the timings taken in the thread
+                contextvars.copy_context().run,
+                search_backend.search_from_request,
+                *results.get_msearch_request(),
+                timeout=timeout,
+            )
+
+    done, _ = wait(futures.values(), timeout=timeout)
+
+    output = {}
+    for key, results in search_results.items():
+        future = futures.get(key)
+        if future is None:
+            output[key] = list(results)
+            continue
+
+        if future not in done:
+            future.cancel()
+            logger.warning("Autocomplete for '%s' timed out after %ss", key, timeout)
+            output[key] = []
+            continue
+
+        try:
+            response = future.result()
+        except Exception:
+            logger.exception("Autocomplete for '%s' failed", key)
+            output[key] = []
+            continue
+
+        results.set_msearch_response(response)
+        output[key] = list(results)
+
+    return output
@@ -4,6 +4,7 @@ from django import template
 from django.conf import settings
 from django.core.paginator import Paginator
 
+from extended_search.metrics import timed
 from search import search as search_vectors
 
 
@@ -32,12 +33,15 @@ SEARCH_VECTORS: dict[str, search_vectors.ModelSearchVector] = {
     "news": search_vectors.NewsSearchVector,
 }
 PAGE_SIZE = 20
+# The number of people and teams shown on the "all" tab
+ALL_TAB_LIMIT = 3
 
 
 @register.inclusion_tag(
     "search/partials/search_results_category.html", takes_context=True
 )
 # @silk_profile(name="Search.TemplateTag.category")
+@timed("template_tag")
 def search_category(
     context,
     *,
@@ -48,12 +52,20 @@ def search_category(
     show_bad_results_message=True,
 ):
     request = context["request"]
-    query = context["search_query"]
+    search_batch = get_search_batch(context)
+    query = search_batch.query_str
     page = int(context["page"])
 
     search_vector = SEARCH_VECTORS[category](request)
-    search_results = search_vector.search(query)
-    search_results_count = get_count(context, category, query)
+    if limit:
+        start, stop = 0, int(limit)
+    else:
+        start, stop = (page - 1) * PAGE_SIZE, page * PAGE_SIZE
+
+    search_results = search_batch.get_results(category, start, stop)
+    if search_results is None:
+        search_results = search_vector.search(query)
+    search_results_count = get_count(context, category)
 
     if limit:
         search_results = search_results[: int(limit)]
@@ -71,7 +83,7 @@ def search_category(
 
     pinned_results = []
     if page == 1:
-        pinned_results = search_vector.pinned(query)
+        pinned_results = get_pinned(context, category, search_vector)
 
     total_count = search_results_count + len(pinned_results)
 
@@ -87,7 +99,7 @@ def search_category(
         "search_results": search_results,
         "tab_name": tab_name,
         "tab_override": context["tab_override"],
-        "search_query": query,
+        "search_query": context["search_query"],
         "count": total_count,
         "is_results_count_low": total_count < settings.CUTOFF_SEARCH_RESULTS_VALUE,
         "show_bad_results_message": False,  # (
@@ -109,59 +121,119 @@ def search_category(
 #
 def autocomplete(request, query):
     limit = 3
-    search_results = {}
+    autocomplete_vectors = {
+        "tools": SEARCH_VECTORS["tools"](request),
+        "pages": SEARCH_VECTORS["all_pages"](request),
+        "people": SEARCH_VECTORS["people"](request),
+        "teams": SEARCH_VECTORS["teams"](request),
+    }
 
-    search_results.update(
-        {"tools": list(SEARCH_VECTORS["tools"](request).autocomplete(query)[:limit])}
-    )
-    search_results.update(
-        {
-            "pages": list(
-                SEARCH_VECTORS["all_pages"](request).autocomplete(query)[:limit]
-            )
-        }
-    )
-    search_results.update(
-        {"people": list(SEARCH_VECTORS["people"](request).autocomplete(query)[:limit])}
-    )
-    search_results.update(
-        {"teams": list(SEARCH_VECTORS["teams"](request).autocomplete(query)[:limit])}
-    )
+    if settings.SEARCH_AUTOCOMPLETE_FAN_OUT:
+        return search_vectors.autocomplete_fan_out(
+            autocomplete_vectors,
+            query,
+            limit,
+            timeout=settings.SEARCH_AUTOCOMPLETE_TIMEOUT,
+        )
 
-    return search_results
+    return {
+        key: list(search_vector.autocomplete(query)[:limit])
+        for key, search_vector in autocomplete_vectors.items()
+    }
 
 
-def get_count(context, category, query):
-    request = context["request"]
+def get_search_batch(context) -> search_vectors.SearchBatch:
+    """
+    Return the request's SearchBatch, creating and executing it on first use.
 
-    if not hasattr(request, "extended_search_count_cache"):
-        request.extended_search_count_cache = {}
+    The batch fetches the total for every category (for the tab counts), the
+    hits for the categories displayed on the current tab and, on the first
+    page, their pinned results, all in a single OpenSearch round trip.
+    """
+    request = context["request"]
 
-    cached_count = request.extended_search_count_cache.get(category, None)
-    if cached_count is not None:
-        return cached_count
+    if not hasattr(request, "extended_search_batch"):
+        query = context["search_query"]
+        page = int(context.get("page", 1))
+        displayed_windows = _get_displayed_windows(context.get("search_category"), page)
+
+        search_batch = search_vectors.SearchBatch(query)
+        for category, search_vector_class in SEARCH_VECTORS.items():
+            search_vector = search_vector_class(request)
+            start, stop = displayed_windows.get(category, (0, 0))
+            search_batch.add(category, search_vector, start, stop)
+
+            if (
+                page == 1
+                and category in displayed_windows
+                and search_vector.has_indexed_pinned_results
+            ):
+                search_batch.add(
+                    f"{category}__pinned",
+                    search_vectors.PinnedSearchVector(search_vector),
+                    0,
+                    PAGE_SIZE,
+                )
+        search_batch.execute()
+
+        request.extended_search_batch = search_batch
+
+    return request.extended_search_batch
+
+
+def get_count(context, category):
+    hits = get_search_batch(context).get_count(category)
+    if hits is None:
+        search_vector = SEARCH_VECTORS[category](context["request"])
+        hits = search_vector.search(get_search_batch(context).query_str).count()
+    return hits
 
-    search_vector = SEARCH_VECTORS[category](request)
-    hits = search_vector.search(query).count()
 
-    request.extended_search_count_cache[category] = hits
-    return hits
+def get_pinned(context, category, search_vector) -> list:
+    pinned_results = get_search_batch(context).get_results(
+        f"{category}__pinned", 0, PAGE_SIZE
+    )
+    if pinned_results is None:
+        return list(search_vector.pinned(get_search_batch(context).query_str))
+    return list(pinned_results[0:PAGE_SIZE])
 
 
 @register.simple_tag(takes_context=True)
 # @silk_profile(name="Search.TemplateTag.count")
 def search_count(context, *, category):
-    query = context["search_query"]
-    hits = get_count(context, category, query)
+    hits = get_count(context, category)
 
     # combined total for not just pages but people and teams
     if category == "all_pages":
-        hits += get_count(context, "people", query)
-        hits += get_count(context, "teams", query)
+        hits += get_count(context, "people")
+        hits += get_count(context, "teams")
 
     return hits
 
 
+def _get_displayed_windows(
+    search_category: SearchCategory | None, page: int
+) -> dict[str, tuple[int, int]]:
+    """
+    Return the (start, stop) window of hits each category displays on the
+    given tab, so they can be fetched up front as part of the SearchBatch.
+    """
+    if page < 1:
+        return {}
+
+    page_window = ((page - 1) * PAGE_SIZE, page * PAGE_SIZE)
+
+    if search_category == "all":
+        return {
+            "all_pages": page_window,
+            "people": (0, ALL_TAB_LIMIT),
+            "teams": (0, ALL_TAB_LIMIT),
+        }
+    if search_category in SEARCH_VECTORS:
+        return {search_category: page_window}
+    return {}
+
+
 def _get_result_template(category: SearchCategory) -> str:
     page_categories = ("all_pages", "guidance", "tools", "news")
 
@@ -1,5 +1,22 @@
+import time
+
 import pytest
+from django.core.paginator import Paginator
 
+from content.models import BasePage, ContentPage
+from content.test.factories import ContentPageFactory
+from networks.models import Network
+from news.factories import NewsPageFactory
+from news.models import NewsPage
+from search.cache import get_results_cache_key
+from search.search import (
+    BatchedSearchResults,
+    PageSearchResultsIterable,
+    PinnedSearchVector,
+    SearchBatch,
+    autocomplete_fan_out,
+    has_field_path,
+)
 from search.utils import sanitize_search_query
 
 
@@ -74,3 +91,196 @@ def test_sanitize_preserves_query_terms_and_phrases(query, result):
 )
 def test_sanitize_rationalises_valid_quotes(query, result):
     assert sanitize_search_query(query) == result
+
+
+def test_batched_search_results_window():
+    batched_results = BatchedSearchResults(
+        ["--result-20--", "--result-21--", "--result-22--"], 45, 20, 40
+    )
+    assert batched_results.count() == 45
+    assert len(batched_results) == 45
+    assert batched_results.covers(20, 40)
+    assert not batched_results.covers(0, 20)
+    assert batched_results[20:40] == [
+        "--result-20--",
+        "--result-21--",
+        "--result-22--",
+    ]
+    assert batched_results[21:22] == ["--result-21--"]
+    assert batched_results[22] == "--result-22--"
+
+
+def test_batched_search_results_paginate():
+    batched_results = BatchedSearchResults(["--result-20--"], 21, 20, 40)
+    page = Paginator(batched_results, 20).page(2)
+    assert list(page) == ["--result-20--"]
+    assert page.paginator.num_pages == 2
+
+
+def test_autocomplete_fan_out_returns_partial_results(mocker):
+    def search_from_request(header, body, timeout):
+        if header == "--slow--":
+            time.sleep(0.5)
+        if header == "--broken--":
+            raise ConnectionError
+        return "--response--"
+
+    mock_backend = mocker.Mock(search_from_request=search_from_request)
+    mocker.patch("search.search.get_search_backend", return_value=mock_backend)
+
+    def get_search_vector(header):
+        results = mocker.MagicMock()
+        results.get_msearch_request.return_value = (header, "--body--")
+        results.__iter__.return_value = iter([f"{header}-result"])
+        search_vector = mocker.MagicMock()
+        search_vector.autocomplete.return_value.__getitem__.return_value = results
+        return search_vector
+
+    output = autocomplete_fan_out(
+        {
+            "fast": get_search_vector("--fast--"),
+            "slow": get_search_vector("--slow--"),
+            "broken": get_search_vector("--broken--"),
+        },
+        "query",
+        limit=3,
+        timeout=0.1,
+    )
+
+    assert output == {"fast": ["--fast---result"], "slow": [], "broken": []}
+
+
+@pytest.mark.parametrize("query", ["jane.doe@trade.gov.uk", "O'Brien", "+44 20"])
+def test_search_batch_searches_raw_query(mocker, query):
+    mock_backend = mocker.Mock()
+    mocker.patch("search.search.get_search_backend", return_value=mock_backend)
+    people_vector = mocker.Mock(cache_results=False)
+    people_vector.search.return_value.__getitem__ = mocker.Mock(return_value=[])
+    mock_backend.msearch.return_value = [0]
+
+    search_batch = SearchBatch(query)
+    search_batch.add("people", people_vector, 0, 20)
+    search_batch.execute()
+
+    people_vector.search.assert_called_once_with(query)
+
+
+def test_results_cache_key():
+    assert get_results_cache_key(1, "pay", "news", 0, 20) == get_results_cache_key(
+        1, "  pay  ", "news", 0, 20
+    )
+    # Sanitizing would change what is searched for
+    assert get_results_cache_key(1, "pay", "news", 0, 20) != get_results_cache_key(
+        1, "pay!", "news", 0, 20
+    )
+    assert get_results_cache_key(
+        1, "jane.doe@trade.gov.uk", "people", 0, 20
+    ) != get_results_cache_key(1, "jane.doetrade.gov.uk", "people", 0, 20)
+    assert get_results_cache_key(1, "pay", "news", 0, 20) != get_results_cache_key(
+        2, "pay", "news", 0, 20
+    )
+    assert get_results_cache_key(1, "pay", "news", 0, 20) != get_results_cache_key(
+        1, "pay", "news", 20, 40
+    )
+
+
+def test_search_batch_uses_results_cache(mocker, settings):
+    settings.SEARCH_ENABLE_RESULTS_CACHE = True
+    mocker.patch("search.cache.get_results_generation", return_value=1)
+    mock_get_cached = mocker.patch("search.cache.get_cached_results")
+    mock_set_cached = mocker.patch("search.cache.set_cached_results")
+    mock_backend = mocker.Mock()
+    mocker.patch("search.search.get_search_backend", return_value=mock_backend)
+
+    pages_vector = mocker.Mock(cache_results=True)
+    people_vector = mocker.Mock(cache_results=False)
+    people_result = mocker.Mock(pk=7, _score=1.5)
+    people_vector.search.return_value.__getitem__ = mocker.Mock(
+        return_value=[people_result]
+    )
+    mock_backend.msearch.return_value = [1]
+
+    pages_key = get_results_cache_key(1, "pay", "all_pages", 0, 20)
+    mock_get_cached.return_value = {
+        pages_key: {"hits": [(3, 2.0)], "total": 12},
+    }
+
+    search_batch = SearchBatch("pay")
+    search_batch.add("all_pages", pages_vector, 0, 20)
+    search_batch.add("people", people_vector, 0, 3)
+    search_batch.execute()
+
+    mock_get_cached.assert_called_once_with([pages_key])
+    pages_vector.search.assert_not_called()
+    pages_vector.get_results_from_hits.assert_called_once_with([(3, 2.0)])
+    assert search_batch.get_count("all_pages") == 12
+    assert search_batch.get_count("people") == 1
+    mock_set_cached.assert_called_once_with({})
+
+    # On a miss the page results are searched for and cached
+    mock_get_cached.return_value = {}
+    pages_result = mocker.Mock(pk=3, _score=2.0)
+    pages_vector.search.return_value.__getitem__ = mocker.Mock(
+        return_value=[pages_result]
+    )
+    mock_backend.msearch.return_value = [12, 1]
+
+    search_batch = SearchBatch("pay")
+    search_batch.add("all_pages", pages_vector, 0, 20)
+    search_batch.add("people", people_vector, 0, 3)
+    search_batch.execute()
+
+    assert search_batch.get_results("all_pages", 0, 20)[0:20] == [pages_result]
+    mock_set_cached.assert_called_with({pages_key: {"hits": [(3, 2.0)], "total": 12}})
+
+
+def test_search_batch_fetches_pinned_results(mocker):
+    mock_backend = mocker.Mock()
+    mocker.patch("search.search.get_search_backend", return_value=mock_backend)
+    pages_vector = mocker.Mock(cache_results=False)
+    pages_vector.search.return_value.__getitem__ = mocker.Mock(return_value=[])
+    pinned_result = mocker.Mock(pk=5)
+    pages_vector.search_pinned.return_value.__getitem__ = mocker.Mock(
+        return_value=[pinned_result]
+    )
+    mock_backend.msearch.return_value = [0, 1]
+
+    search_batch = SearchBatch("pay")
+    search_batch.add("all_pages", pages_vector, 0, 20)
+    search_batch.add("all_pages__pinned", PinnedSearchVector(pages_vector), 0, 20)
+    search_batch.execute()
+
+    # Both searches run in the same msearch round trip
+    mock_backend.msearch.assert_called_once()
+    pages_vector.search_pinned.assert_called_once_with("pay")
+    assert search_batch.get_results("all_pages__pinned", 0, 20)[0:20] == [pinned_result]
+
+
+def test_has_field_path():
+    assert has_field_path(ContentPage, "page_author")
+    assert has_field_path(ContentPage, "owner__profile")
+    assert not has_field_path(ContentPage, "content_owner")
+    assert has_field_path(Network, "content_owner")
+    assert not has_field_path(Network, "content_owner__not_a_field")
+
+
+@pytest.mark.django_db
+def test_page_search_results_iterable(django_assert_num_queries):
+    pages = [
+        ContentPageFactory.create(title="first"),
+        NewsPageFactory.create(title="second"),
+        ContentPageFactory.create(title="third"),
+    ]
+    queryset = BasePage.objects.filter(pk__in=[page.pk for page in pages])
+    queryset._iterable_class = PageSearchResultsIterable
+
+    # One query for the page types and one for each of the two types
+    with django_assert_num_queries(3):
+        results = list(queryset)
+        assert [type(result) for result in results] == [
+            ContentPage,
+            NewsPage,
+            ContentPage,
+        ]
+        assert [result.title for result in results] == ["first", "second", "third"]
+        assert all(result.page_author is None for result in results)
@@ -97,6 +97,16 @@ RE_KEYWORDS_AND_PHRASES = re.compile(
 )
 
 
+def clean_search_query(query: Optional[str] = None) -> str:
+    """Return the query sanitized and normalized.
+
+    Examples:
+        >>> clean_search_query('  pay!  "pay scales" ')
+        "pay 'pay scales'"
+    """
+    return normalize_query(sanitize_search_query(query))
+
+
 def split_query(query: str) -> list[str]:
     """Split the query into a list of keyword and phrases.
 
@@ -287,6 +297,40 @@ def get_content_author(page) -> dict:
     return content_author
 
 
+def prefetch_first_publishers(pages: list["BasePage"]) -> None:
+    """
+    Load the first publisher of each page in one query, for
+    `BasePage.get_first_publisher` to return.
+    """
+    from wagtail.models import Revision
+
+    if not pages:
+        return
+
+    first_publishers = {
+        revision.object_id: revision.user
+        for revision in Revision.page_revisions.filter(
+            object_id__in=[str(page.pk) for page in pages]
+        )
+        .exclude(user=None)
+        .select_related("user")
+        .order_by("object_id", "created_at", "id")
+        .distinct("object_id")
+    }
+    for page in pages:
+        page._first_publisher = first_publishers.get(str(page.pk))
+
+
+def prefetch_page_export_data(pages: list["BasePage"]) -> None:
+    # The owners, authors and latest revisions are loaded with the pages, see
+    # `search.search.PageSearchResultsIterable`
+    prefetch_first_publishers([page for page in pages if isinstance(page, NewsPage)])
+
+
+def prefetch_person_export_data(people: list["Person"]) -> None:
+    models.prefetch_related_objects(people, "roles__team")
+
+
 def get_page_export_row(page_result: "BasePage", request: HttpRequest) -> list[str]:
     content_owner = get_content_owner(page_result)
     content_author = get_content_author(page_result)
@@ -340,6 +384,7 @@ SEARCH_EXPORT_MAPPINGS: dict[models.Model, dict] = {
             "Page Type",
         ],
         "item_to_row_function": get_page_export_row,
+        "prefetch_function": prefetch_page_export_data,
     },
     Person: {
         "header": [
@@ -351,9 +396,11 @@ SEARCH_EXPORT_MAPPINGS: dict[models.Model, dict] = {
             "Roles {'Job Title': 'Team Name'}",
         ],
         "item_to_row_function": get_person_export_row,
+        "prefetch_function": prefetch_person_export_data,
     },
     Team: {
         "header": ["Title", "URL", "Edit URL"],
         "item_to_row_function": get_team_export_row,
+        "prefetch_function": None,
     },
 }
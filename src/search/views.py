@@ -1,24 +1,60 @@
 import csv
+import hmac
 import logging
 
 import sentry_sdk
+from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.decorators import user_passes_test
-from django.http import HttpRequest, HttpResponse
+from django.http import Http404, HttpRequest, HttpResponse, StreamingHttpResponse
 from django.shortcuts import redirect
 from django.template.response import TemplateResponse
 from django.urls import reverse
 from django.views.decorators.http import require_http_methods
 
 from content.models import ContentPage
+from extended_search.metrics import category_context, search_phase_duration, timed
 from extended_search.models import Setting as SearchSetting
 from extended_search.settings import settings_singleton
 from peoplefinder.models import Person, Team
+from search.search import iter_result_chunks
 from search.templatetags import search as search_template_tag
 
 
 logger = logging.getLogger(__name__)
 
+# The number of results loaded from the search index and database at a time
+EXPORT_CHUNK_SIZE = 500
+
+
+class Echo:
+    """
+    A file-like object that hands back what is written to it, so csv rows can
+    be streamed rather than written into the response.
+    """
+
+    def write(self, value):
+        return value
+
+
+class SearchTemplateResponse(TemplateResponse):
+    """
+    A template response that times its rendering, which is when the searches
+    run, labelled with the search category.
+
+    The response is rendered lazily so that middleware can still add to its
+    context.
+    """
+
+    def __init__(self, *args, search_category: str, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.search_category = search_category
+
+    @property
+    def rendered_content(self):
+        with category_context(self.search_category), timed("render"):
+            return super().rendered_content
+
 
 def can_view_explore():
     return user_passes_test(lambda u: u.has_perm("extended_search.view_explore"))
@@ -34,7 +70,8 @@ def autocomplete(request: HttpRequest) -> HttpResponse:
     query = request.GET.get("query", "")
     page = "1"
 
-    search_results = search_template_tag.autocomplete(request, query)
+    with category_context(_category), timed("autocomplete"):
+        search_results = search_template_tag.autocomplete(request, query)
 
     context = {
         "search_url": reverse("search:autocomplete"),
@@ -93,7 +130,29 @@ def search(request: HttpRequest, category: str | None = None) -> HttpResponse:
         transaction.set_tag("search.query", query)
         transaction.set_tag("search.page", page)
 
-    return TemplateResponse(request, "search/search.html", context=context)
+    return SearchTemplateResponse(
+        request, "search/search.html", context=context, search_category=category
+    )
+
+
+@require_http_methods(["GET"])
+def metrics(request: HttpRequest) -> HttpResponse:
+    """
+    Search phase timings for this process, in the Prometheus text format
+    """
+    token = settings.SEARCH_METRICS_TOKEN
+    if not token:
+        raise Http404
+
+    if not hmac.compare_digest(
+        request.headers.get("Authorization", ""), f"Bearer {token}"
+    ):
+        return HttpResponse(status=401)
+
+    return HttpResponse(
+        search_phase_duration.expose(),
+        content_type="text/plain; version=0.0.4; charset=utf-8",
+    )
 
 
 @can_view_explore()
@@ -141,7 +200,7 @@ def explore(request: HttpRequest) -> HttpResponse:
 
 
 @can_export_search()
-def export_search(request: HttpRequest, category: str) -> HttpResponse:
+def export_search(request: HttpRequest, category: str) -> StreamingHttpResponse:
     """
     Administrative view for exporting search results as csv
     """
@@ -167,17 +226,18 @@ def export_search(request: HttpRequest, category: str) -> HttpResponse:
             f"'{search_model}' is not a model that is configured for export"
         )
 
+    def get_rows():
+        yield export_mapping["header"]
+        for results in iter_result_chunks(search_results, EXPORT_CHUNK_SIZE):
+            if export_mapping["prefetch_function"]:
+                export_mapping["prefetch_function"](results)
+            for result in results:
+                yield export_mapping["item_to_row_function"](result, request)
+
+    writer = csv.writer(Echo())
     filename = f"search_export_{category}.csv"
-    response = HttpResponse(
+    return StreamingHttpResponse(
+        (writer.writerow(row) for row in get_rows()),
         content_type="text/csv",
         headers={"Content-Disposition": f'attachment; filename="{filename}"'},
     )
-
-    writer = csv.writer(response)
-    writer.writerow(export_mapping["header"])
-
-    for result in search_results:
-        row = export_mapping["item_to_row_function"](result, request)
-        writer.writerow(row)
-
-    return response